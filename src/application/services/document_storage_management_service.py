@@ -65,6 +65,12 @@ class DocumentStorageManagementService:
         self._logger.info("Delete document [%s]: %s", document_id, ok)
         return ok
 
+    async def delete_documents(self, document_ids: List[str]) -> int:
+        """批量删除文档"""
+        deleted = await self._repo.delete_documents(document_ids)
+        self._logger.info("Delete documents: %d/%d", deleted, len(document_ids))
+        return deleted
+
     async def search_documents(self, query: str, category: Optional[str] = None, limit: int = 10) -> List[Document]:
         """搜索文档"""
         results = await self._repo.search_documents(query=query, category=category, limit=limit)
@@ -119,11 +119,14 @@ class IndexingService:
         """
         documents = []
         
-        for file_path in file_paths:
+        # 使用DocumentLoaderService并发加载，各文件的结果与路径一一对应
+        results = await self.document_loader_service.load_documents(file_paths)
+        
+        for file_path, loaded_docs in zip(file_paths, results):
+            if isinstance(loaded_docs, Exception):
+                self.logger.error(f"加载文件失败 {file_path}: {str(loaded_docs)}")
+                continue
             try:
-                # 使用DocumentLoaderService加载文档
-                loaded_docs = self.document_loader_service.load_document(file_path)
-               
                 for doc in loaded_docs:
                     # 转换为字典格式以保持与现有代码的兼容性
                     document = {
@@ -65,7 +65,7 @@ class DocumentChunk:
         Returns:
             是否为空
         """
-        return not self.content or not self.content.strip()
+        return not self.content or self.content.isspace()
     
     def get_text_length(self) -> int:
         """获取文本长度
@@ -280,7 +280,7 @@ class QAContext:
         Returns:
             活跃会话数量
         """
-        return len([s for s in self.sessions.values() if s.is_active()])
+        return sum(1 for s in self.sessions.values() if s.is_active())
     
     def add_message(self, session_id: str, role: MessageRole, content: str, 
                    user_profile: Optional[UserProfile] = None, 
@@ -1,7 +1,47 @@
+import sys
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from itertools import islice
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+# 每个会话保留的最大查询条数
+_MAX_SESSION_QUERIES = 50
+
+# 未指定会话时使用的默认会话ID
+_DEFAULT_SID = sys.intern("default")
+
+# 已释放会话的空闲池（复用其列 deque），上限避免无界增长
+_SESSION_POOL: List[Dict[str, Any]] = []
+_SESSION_POOL_MAX = 1024
+
+
+def _acquire_session() -> Dict[str, Any]:
+    # 优先从空闲池取出会话并清空各列，否则新建
+    try:
+        session = _SESSION_POOL.pop()
+    except IndexError:
+        return {
+            "q_question": deque(maxlen=_MAX_SESSION_QUERIES),
+            "q_result": deque(maxlen=_MAX_SESSION_QUERIES),
+            "q_meta": deque(maxlen=_MAX_SESSION_QUERIES),
+            "q_time": deque(maxlen=_MAX_SESSION_QUERIES),
+            "context_data": {},
+        }
+    session["q_question"].clear()
+    session["q_result"].clear()
+    session["q_meta"].clear()
+    session["q_time"].clear()
+    session["context_data"].clear()
+    return session
+
+
+def _release_session(session: Dict[str, Any]) -> None:
+    # 归还会话到空闲池；池满时交给 GC
+    if len(_SESSION_POOL) < _SESSION_POOL_MAX:
+        _SESSION_POOL.append(session)
+
 
 @dataclass
 class UserQuery:
@@ -73,7 +113,7 @@ class UserQuery:
         # 统一入口：保存到当前会话（或 default）并维护活跃与修剪
         if result is not None:
             self.result_snapshot = self._filter_result_for_snapshot(result)
-        self.save_in_session(self.session_id or "default", self.result_snapshot, self.user_id)
+        self.save_in_session(self.session_id or _DEFAULT_SID, self.result_snapshot, self.user_id)
 
     def store_in_memory(self) -> None:
         # 兼容旧方法：无结果时也可保存，仅记录问题与元数据
@@ -89,32 +129,37 @@ class UserQuery:
         self.save_in_session(session_id, self.result_snapshot, user_id)
 
     def save_in_session(self, session_id: str, result_snapshot: Optional[Dict[str, Any]], user_id: Optional[str]) -> None:
-        from datetime import datetime
         cls = self.__class__
         if not hasattr(cls, "_sessions"):
             cls._sessions = {}
+        # 驻留会话ID，使会话字典查找可走指针相等的快速路径
+        if isinstance(session_id, str):
+            session_id = sys.intern(session_id)
         session = cls._sessions.get(session_id)
+        # datetime 仅用于展示字段；活跃度使用单调时钟浮点数比较
         now = datetime.now()
+        now_mono = time.monotonic()
         if session is None:
-            session = {
-                "user_id": user_id or getattr(self, "user_id", None) or f"user_{session_id}",
-                "queries": [],
-                "context_data": {},
-                "created_at": now,
-                "last_activity": now,
-            }
+            # 列式存储（SoA）：每个字段一个定长 deque，避免为每条记录分配字典
+            session = _acquire_session()
+            session["user_id"] = user_id or getattr(self, "user_id", None) or f"user_{session_id}"
+            session["created_at"] = now
+            session["last_activity_mono"] = now_mono
             cls._sessions[session_id] = session
-        # 记录条目：原始问题 + 结果快照 + 元数据
-        entry = {
-            "question": self.question,
-            "result": result_snapshot,
-            "metadata": self.metadata,
-            "created_at": now
-        }
-        session["queries"].append(entry)
-        session["last_activity"] = now
-        if len(session["queries"]) > 50:
-            session["queries"] = session["queries"][-50:]
+        # 记录条目：原始问题 + 结果快照 + 元数据（deque 满时自动淘汰最旧条目）
+        session["q_question"].append(self.question)
+        session["q_result"].append(result_snapshot)
+        session["q_meta"].append(self.metadata)
+        session["q_time"].append(now)
+        session["last_activity_mono"] = now_mono
+
+    @staticmethod
+    def _tail(column: deque, limit: int) -> List[Any]:
+        # 取列的最后 limit 个元素（limit <= 0 时返回全部）
+        size = len(column)
+        if limit <= 0 or limit >= size:
+            return list(column)
+        return list(islice(column, size - limit, size))
 
     @classmethod
     def get_recent_queries(cls, session_id, limit=10):
@@ -122,37 +167,49 @@ class UserQuery:
         session = sessions.get(session_id)
         if not session:
             return []
-        records = session["queries"]
-        return records[-limit:] if limit > 0 else records
+        # 仅在调用方需要时按行重建记录字典
+        return [
+            {"question": q, "result": r, "metadata": m, "created_at": t}
+            for q, r, m, t in zip(
+                cls._tail(session["q_question"], limit),
+                cls._tail(session["q_result"], limit),
+                cls._tail(session["q_meta"], limit),
+                cls._tail(session["q_time"], limit),
+            )
+        ]
+
+    @classmethod
+    def get_recent_questions(cls, session_id, limit=10) -> List[str]:
+        # 投影查询：只返回问题列，不构造记录字典
+        sessions = getattr(cls, "_sessions", {})
+        session = sessions.get(session_id)
+        if not session:
+            return []
+        return cls._tail(session["q_question"], limit)
 
     @classmethod
     def clear_session(cls, session_id) -> bool:
         sessions = getattr(cls, "_sessions", {})
-        if session_id in sessions:
-            del sessions[session_id]
+        session = sessions.pop(session_id, None)
+        if session is not None:
+            _release_session(session)
             return True
         return False
 
     @classmethod
     def get_active_sessions_count(cls, timeout_minutes=30) -> int:
-        from datetime import datetime
         sessions = getattr(cls, "_sessions", {})
-        now = datetime.now()
-        def is_active(session):
-            diff = now - session.get("last_activity", now)
-            return diff.total_seconds() < timeout_minutes * 60
-        return len([s for s in sessions.values() if is_active(s)])
+        threshold = time.monotonic() - timeout_minutes * 60
+        return sum(1 for s in sessions.values() if s["last_activity_mono"] > threshold)
 
     @classmethod
     def cleanup_inactive_sessions(cls, timeout_minutes=30) -> int:
-        from datetime import datetime
         sessions = getattr(cls, "_sessions", {})
-        now = datetime.now()
+        threshold = time.monotonic() - timeout_minutes * 60
         inactive = []
         for sid, session in sessions.items():
-            diff = now - session.get("last_activity", now)
-            if diff.total_seconds() >= timeout_minutes * 60:
+            if session["last_activity_mono"] <= threshold:
                 inactive.append(sid)
         for sid in inactive:
-            del sessions[sid]
+            _release_session(sessions.pop(sid))
         return len(inactive)
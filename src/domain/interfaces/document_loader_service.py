@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Union
 
 from ..entities.document import Document
 
@@ -25,6 +25,23 @@ class DocumentLoaderService(ABC):
             ValueError: 文件格式不支持或内容无效
         """
         pass
+    
+    async def load_documents(self, file_paths: List[str]) -> List[Union[List[Document], Exception]]:
+        """批量加载文档（默认逐个加载，支持并发的实现可覆盖）
+        
+        Args:
+            file_paths: 文件路径列表
+            
+        Returns:
+            与 file_paths 一一对应的结果：加载成功为文档列表，失败为对应的异常
+        """
+        results = []
+        for file_path in file_paths:
+            try:
+                results.append(self.load_document(file_path))
+            except Exception as e:
+                results.append(e)
+        return results
 
 
 class DocumentLoader(ABC):
@@ -92,8 +92,19 @@ class DocumentSplitter(ABC):
         
         Args:
             config: 切分器配置
+
+        Raises:
+            ValueError: 配置无效时
         """
-        pass
+        self.config = config or SplitterConfig()
+        self.logger = logger
+        # 构造时校验一次并缓存，切分调用无需重复校验
+        self._valid = self._check_config(self.config)
+        if not self._valid:
+            raise ValueError(
+                f"无效的切分器配置: chunk_size={self.config.chunk_size}, "
+                f"chunk_overlap={self.config.chunk_overlap}"
+            )
     
     @abstractmethod
     def split_document(self, document: Document) -> List[DocumentChunk]:
@@ -144,22 +155,18 @@ class DocumentSplitter(ABC):
             all_chunks.extend(chunks)
         return all_chunks
     
+    @staticmethod
+    def _check_config(config: SplitterConfig) -> bool:
+        """检查配置的块大小与重叠是否合法"""
+        return 0 <= config.chunk_overlap < config.chunk_size
+
     def validate_config(self) -> bool:
         """验证配置
         
         Returns:
-            配置是否有效
+            配置是否有效（构造及更新配置时计算的缓存结果）
         """
-        if self.config.chunk_size <= 0:
-            return False
-        
-        if self.config.chunk_overlap < 0:
-            return False
-        
-        if self.config.chunk_overlap >= self.config.chunk_size:
-            return False
-        
-        return True
+        return self._valid
     
     def get_config(self) -> SplitterConfig:
         """获取配置
@@ -178,6 +185,7 @@ class DocumentSplitter(ABC):
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+        self._valid = self._check_config(self.config)
     
     def _create_chunk(
         self,
@@ -292,12 +300,24 @@ class DocumentSplitterServiceAdapter(DocumentSplitterService):
     `infrastructure.splitters.types` 中的同构类型。
     """
 
+    # 基础设施层类型缓存（首次使用时解析，避免每次转换都执行 import 语句）
+    _InfraDocument = None
+    _InfraSplitterConfig = None
+
     def __init__(self, long_document_threshold: int = 10, logger: Optional[LoggerService] = None):
         # 延迟导入避免循环依赖
         from ...infrastructure.splitters.document_splitter_service_impl import DocumentSplitterServiceImpl
 
         self.logger = logger
         self._impl = DocumentSplitterServiceImpl(long_document_threshold, logger)
+        self._resolve_types()
+
+    @classmethod
+    def _resolve_types(cls) -> None:
+        """解析并缓存基础设施层类型（延迟导入避免循环依赖）"""
+        if cls._InfraDocument is None:
+            from ...infrastructure.splitters.types import InfraDocument, InfraSplitterConfig
+            cls._InfraDocument, cls._InfraSplitterConfig = InfraDocument, InfraSplitterConfig
 
     async def should_split_document(self, document: Document) -> bool:
         # 直接委托基础设施层实现（其内部基于长度与结构判断）
@@ -311,11 +331,12 @@ class DocumentSplitterServiceAdapter(DocumentSplitterService):
         return await self._impl.split_document(document)
 
     # ---------- 参数转换工具（供需要在调用前进行类型映射的场景使用） ----------
-    @staticmethod
-    def to_infra_document(doc: Document):
+    @classmethod
+    def to_infra_document(cls, doc: Document):
         """将领域层 Document 转为基础设施层 InfraDocument"""
-        from ...infrastructure.splitters.types import InfraDocument
-        return InfraDocument(
+        if cls._InfraDocument is None:
+            cls._resolve_types()
+        return cls._InfraDocument(
             content=doc.content,
             metadata=doc.metadata,
             doc_id=doc.doc_id,
@@ -324,11 +345,12 @@ class DocumentSplitterServiceAdapter(DocumentSplitterService):
             created_at=doc.created_at,
         )
 
-    @staticmethod
-    def to_infra_config(config: SplitterConfig):
+    @classmethod
+    def to_infra_config(cls, config: SplitterConfig):
         """将领域层 SplitterConfig 转为基础设施层 InfraSplitterConfig"""
-        from ...infrastructure.splitters.types import InfraSplitterConfig
-        return InfraSplitterConfig.from_dict(config.to_dict())
+        if cls._InfraSplitterConfig is None:
+            cls._resolve_types()
+        return cls._InfraSplitterConfig.from_dict(config.to_dict())
     
     @abstractmethod
     def split_document(
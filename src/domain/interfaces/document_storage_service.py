@@ -69,6 +69,21 @@ class DocumentStorageService(ABC):
         """
         pass
     
+    async def delete_documents(self, document_ids: List[str]) -> int:
+        """批量删除文档（默认逐个删除，支持批量接口的实现可覆盖）
+        
+        Args:
+            document_ids: 文档ID列表
+            
+        Returns:
+            成功删除的文档数量
+        """
+        deleted_count = 0
+        for doc_id in document_ids:
+            if await self.delete_document(doc_id):
+                deleted_count += 1
+        return deleted_count
+    
     @abstractmethod
     async def search_documents(self, query: str, category: Optional[str] = None, limit: int = 10) -> List[Document]:
         """搜索文档
@@ -24,6 +24,7 @@ class InfraDocumentSplitterAdapter(DocumentSplitter):
         self.logger = logger
         # 将基础设施配置映射为领域层配置（保持一致字段）
         self.config = SplitterConfig.from_dict(self.infra_splitter.get_config().to_dict())
+        self._valid = self.infra_splitter.validate_config()
 
     def get_splitter_type(self) -> SplitterType:
         # 通过枚举值映射为领域层类型
@@ -1,19 +1,84 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Literal, Optional, Tuple, Sequence, Union
+
+import numpy as np
+
 from ..entities.document import Document
 from ..entities.search_result import SearchResult
 
+# 向量入参类型：首选连续的 float32 ndarray（或其原始字节），List[float] 形式仅为兼容保留
+EmbeddingVector = Union[np.ndarray, bytes, memoryview, Sequence[float]]
+EmbeddingMatrix = Union[np.ndarray, bytes, memoryview, Sequence[Sequence[float]]]
+
+# 批量检索时每个并发分片包含的查询数
+SEARCH_BATCH_CHUNK_SIZE = 64
+
+# 向量存储精度：float16/int8 分别将常驻索引缩小到 1/2 与 1/4
+EmbeddingDType = Literal["float32", "float16", "int8"]
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
 
 class VectorStoreService(ABC):
     """向量存储服务接口 - 定义向量存储和检索的抽象方法"""
     
+    @staticmethod
+    def _check_dtype(dtype: Optional[str]) -> None:
+        """校验存储精度参数"""
+        if dtype is not None and dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"不支持的向量存储精度: {dtype}，可选值: {', '.join(EMBEDDING_DTYPES)}")
+    
+    @staticmethod
+    def _as_f32_matrix(embeddings: EmbeddingMatrix, dimension: Optional[int] = None) -> np.ndarray:
+        """将向量批量转换为 (n, d) 的连续 float32 矩阵
+        
+        已是 C 连续 float32 ndarray 时零拷贝返回；bytes/memoryview 按 float32 解释，
+        需提供 dimension 才能还原为矩阵。
+        
+        Args:
+            embeddings: 向量矩阵、原始字节或嵌套列表
+            dimension: 向量维度（原始字节输入时必需）
+            
+        Returns:
+            形状为 (n, d) 的 float32 矩阵
+        """
+        if isinstance(embeddings, np.ndarray) and embeddings.dtype == np.float32 and embeddings.flags.c_contiguous:
+            matrix = embeddings
+        elif isinstance(embeddings, (bytes, bytearray, memoryview)):
+            matrix = np.frombuffer(embeddings, dtype=np.float32)
+            if dimension:
+                return matrix.reshape(-1, dimension)
+        else:
+            matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            if matrix.size == 0:
+                return matrix.reshape(0, dimension or 0)
+            return matrix.reshape(1, -1)
+        return matrix
+    
+    @staticmethod
+    def _as_f32_vector(embedding: EmbeddingVector) -> np.ndarray:
+        """将单个向量转换为一维连续 float32 数组（已满足时零拷贝）
+        
+        Args:
+            embedding: 向量、原始字节或浮点列表
+            
+        Returns:
+            一维 float32 数组
+        """
+        if isinstance(embedding, np.ndarray) and embedding.dtype == np.float32 and embedding.flags.c_contiguous:
+            return embedding.reshape(-1)
+        if isinstance(embedding, (bytes, bytearray, memoryview)):
+            return np.frombuffer(embedding, dtype=np.float32)
+        return np.ascontiguousarray(embedding, dtype=np.float32).reshape(-1)
+    
     @abstractmethod
-    async def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> bool:
+    async def add_documents(self, documents: List[Document], embeddings: EmbeddingMatrix) -> bool:
         """添加文档和对应的向量
         
         Args:
             documents: 文档列表
-            embeddings: 对应的向量列表
+            embeddings: 对应的向量矩阵 (n, d)，推荐 float32 ndarray
             
         Returns:
             添加是否成功
@@ -21,20 +86,59 @@ class VectorStoreService(ABC):
         pass
     
     @abstractmethod
-    async def add_documents_with_vectors(self, documents: List[Document], embeddings: List[List[float]]) -> bool:
+    async def add_documents_with_vectors(self, documents: List[Document], embeddings: EmbeddingMatrix) -> bool:
         """添加文档和对应的向量（别名方法）
         
         Args:
             documents: 文档列表
-            embeddings: 对应的向量列表
+            embeddings: 对应的向量矩阵 (n, d)，推荐 float32 ndarray
             
         Returns:
             添加是否成功
         """
         pass
     
+    async def add_matrix(
+        self,
+        documents: Sequence[Document],
+        embeddings: EmbeddingMatrix,
+        dtype: Optional[EmbeddingDType] = None,
+    ) -> bool:
+        """以整块向量矩阵添加文档
+        
+        默认实现统一转换为 (n, d) float32 矩阵后委托 add_documents_with_vectors；
+        后端可覆盖此方法直接消费连续矩阵，并按 dtype 一次性转换为低精度存储。
+        不支持低精度存储的后端按 float32 保存。
+        
+        Args:
+            documents: 文档列表
+            embeddings: 形状为 (len(documents), d) 的向量矩阵
+            dtype: 存储精度，None 表示使用后端配置的精度
+            
+        Returns:
+            添加是否成功
+        
+        Raises:
+            ValueError: 矩阵行数与文档数量不一致或 dtype 不受支持时
+        """
+        self._check_dtype(dtype)
+        matrix = self._as_f32_matrix(embeddings, self.get_dimension())
+        if matrix.shape[0] != len(documents):
+            raise ValueError(f"向量矩阵行数 {matrix.shape[0]} 与文档数量 {len(documents)} 不一致")
+        return await self.add_documents_with_vectors(list(documents), matrix)
+    
+    def get_vectors_view(self) -> Optional[np.ndarray]:
+        """获取存储内全部向量的只读矩阵视图 (n, d)
+        
+        便于重排序等场景一次性做批量点积（xq @ X.T）。默认实现不支持，返回 None。
+        
+        Returns:
+            只读向量矩阵，不支持时返回None
+        """
+        return None
+    
     @abstractmethod
-    async def add_document(self, document: Document, embedding: List[float]) -> bool:
+    async def add_document(self, document: Document, embedding: EmbeddingVector) -> bool:
         """添加单个文档和向量
         
         Args:
@@ -47,7 +151,7 @@ class VectorStoreService(ABC):
         pass
     
     @abstractmethod
-    async def search(self, query_embedding: List[float], top_k: int = 10, 
+    async def search(self, query_embedding: EmbeddingVector, top_k: int = 10, 
                     filter_criteria: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
         """向量搜索
         
@@ -62,7 +166,7 @@ class VectorStoreService(ABC):
         pass
     
     @abstractmethod
-    async def search_similar(self, query_embedding: List[float], top_k: int = 5,
+    async def search_similar(self, query_embedding: EmbeddingVector, top_k: int = 5,
                                filter_criteria: Optional[Dict[str, Any]] = None) -> List[SearchResult]:
         """相似度搜索（返回前 top_k 条）
         
@@ -76,6 +180,31 @@ class VectorStoreService(ABC):
         """
         pass
     
+    async def search_batch(self, query_embeddings: EmbeddingMatrix, top_k: int = 5,
+                           filter_criteria: Optional[Dict[str, Any]] = None) -> List[List[SearchResult]]:
+        """批量相似度搜索
+        
+        默认实现按 SEARCH_BATCH_CHUNK_SIZE 分片，分片内通过 asyncio.gather 并发调用
+        search_similar。FAISS/HNSW 等后端应覆盖此方法，对整个 (B, d) 矩阵只调用一次
+        底层检索（如 index.search(xq, k)）。
+        
+        Args:
+            query_embeddings: 查询向量矩阵 (B, d)
+            top_k: 每个查询返回的结果条数
+            filter_criteria: 过滤条件
+            
+        Returns:
+            与查询一一对应的结果列表
+        """
+        queries = self._as_f32_matrix(query_embeddings, self.get_dimension())
+        results: List[List[SearchResult]] = []
+        for start in range(0, len(queries), SEARCH_BATCH_CHUNK_SIZE):
+            chunk = queries[start:start + SEARCH_BATCH_CHUNK_SIZE]
+            results.extend(await asyncio.gather(
+                *(self.search_similar(query, top_k, filter_criteria) for query in chunk)
+            ))
+        return results
+    
     @abstractmethod
     async def get_document(self, document_id: str) -> Optional[Document]:
         """根据ID获取文档
@@ -113,7 +242,7 @@ class VectorStoreService(ABC):
         pass
     
     @abstractmethod
-    async def update_document(self, document: Document, embedding: List[float]) -> bool:
+    async def update_document(self, document: Document, embedding: EmbeddingVector) -> bool:
         """更新文档和向量
         
         Args:
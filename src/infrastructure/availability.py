@@ -0,0 +1,32 @@
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+# 可用性探测结果的缓存时长（秒），避免健康检查频繁请求模型服务
+AVAILABILITY_TTL = 30.0
+
+
+class CachedAvailabilityMixin:
+    """可用性探测结果缓存，供 LLM 与嵌入提供者共用"""
+
+    # 最近一次可用性探测结果：(是否可用, time.monotonic() 时间戳)
+    _availability: Optional[Tuple[bool, float]] = None
+
+    async def _cached_availability(self, probe: Callable[[], Awaitable[Any]]) -> bool:
+        """执行可用性探测并缓存结果，AVAILABILITY_TTL 内重复调用直接返回缓存
+
+        Args:
+            probe: 探测函数，抛出异常视为不可用
+
+        Returns:
+            服务是否可用
+        """
+        now = time.monotonic()
+        if self._availability is not None and now - self._availability[1] < AVAILABILITY_TTL:
+            return self._availability[0]
+        try:
+            await probe()
+            ok = True
+        except Exception:
+            ok = False
+        self._availability = (ok, now)
+        return ok
@@ -5,15 +5,29 @@
 负责加载和管理系统配置，支持YAML配置文件和环境变量覆盖。
 """
 
+import asyncio
+import functools
+import logging
 import os
+import threading
 import yaml
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Literal, Optional, Tuple
 from dataclasses import dataclass, field
-from loguru import logger
 
+# 优先使用 libyaml 的 C 解析器，不可用时回退到纯 Python 实现
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+# 配置在全局 loguru 处理器初始化之前加载，这里使用标准库日志：
+# 级别不满足时直接短路，不做调用栈检查与消息格式化
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """服务器配置"""
     host: str = "0.0.0.0"
@@ -22,7 +36,7 @@ class ServerConfig:
     workers: int = 1
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """应用配置"""
     name: str = "RAG系统"
@@ -30,7 +44,7 @@ class AppConfig:
     # 移除 environment/debug/log_level，改为仅保留基础信息
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoggingConfig:
     """日志配置"""
     level: str = "INFO"
@@ -39,7 +53,7 @@ class LoggingConfig:
     backup_count: int = 5
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OpenAIConfig:
     """OpenAI配置"""
     api_key: str = ""
@@ -48,18 +62,18 @@ class OpenAIConfig:
     organization: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EmbeddingConfig:
     """嵌入模型配置"""
     provider: str = "sentence_transformers"  # openai, aliyun, sentence_transformers
     batch_size: int = 32
     max_length: int = 512
-    openai: OpenAIConfig = field(default_factory=OpenAIConfig)
+    openai: OpenAIConfig = field(default_factory=lambda: OpenAIConfig(model="text-embedding-ada-002"))
     aliyun: 'AliyunEmbeddingConfig' = field(default_factory=lambda: AliyunEmbeddingConfig())
     sentence_transformers: 'SentenceTransformersConfig' = field(default_factory=lambda: SentenceTransformersConfig())
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AliyunEmbeddingConfig:
     """阿里云嵌入模型配置"""
     api_key: str = ""
@@ -67,7 +81,7 @@ class AliyunEmbeddingConfig:
     api_base: str = "https://dashscope.aliyuncs.com/api/v1"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AliyunLLMConfig:
     """阿里云LLM配置"""
     api_key: str = ""
@@ -75,24 +89,39 @@ class AliyunLLMConfig:
     api_base: str = "https://dashscope.aliyuncs.com/api/v1"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SentenceTransformersConfig:
     """SentenceTransformers配置"""
     model: str = "all-MiniLM-L6-v2"
     device: str = "cpu"  # cpu, cuda
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class LLMCacheConfig:
+    """LLM响应缓存配置"""
+    enabled: bool = False
+    path: str = "./data/llm_cache.sqlite"
+    # 语义命中的余弦相似度阈值；RAG 提示词中检索上下文占比大，阈值过低容易误命中
+    similarity_threshold: float = 0.95
+    ttl_seconds: int = 86400
+    # 进程内精确匹配缓存的最大条目数，0 表示不启用
+    memory_max_entries: int = 10000
+
+
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
     """大语言模型配置"""
     provider: str = "openai"  # openai, aliyun, anthropic
     max_tokens: int = 1000
     temperature: float = 0.7
+    # generate_batch 单次请求合并的最大提示词数量
+    batch_size: int = 8
     openai: OpenAIConfig = field(default_factory=OpenAIConfig)
     aliyun: AliyunLLMConfig = field(default_factory=AliyunLLMConfig)
+    cache: LLMCacheConfig = field(default_factory=LLMCacheConfig)
     
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AliyunConfig:
     """阿里云配置（兼容性保留）"""
     api_key: str = ""
@@ -100,7 +129,7 @@ class AliyunConfig:
     api_base: str = "https://dashscope.aliyuncs.com/api/v1"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AIProvidersConfig:
     """AI服务提供商配置"""
     embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
@@ -109,23 +138,26 @@ class AIProvidersConfig:
     aliyun: AliyunConfig = field(default_factory=AliyunConfig)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class VectorStoreConfig:
     """向量存储配置"""
     provider: str = "faiss"
     type: str = "faiss"
     dimension: int = 384
     index_path: str = "./data/vector_index"
+    # 向量存储精度与量化方式（sq: 标量量化, pq4/pq8: 4/8 bit 乘积量化）
+    dtype: Literal["float32", "float16", "int8"] = "float32"
+    quantization: Optional[Literal["sq", "pq4", "pq8"]] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocumentRepositoryConfig:
     """文档仓储配置"""
     provider: str = "local_file"
     base_path: str = "./data"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LocalDocumentsConfig:
     """本地文档存储配置"""
     base_path: str = "./data/storage"
@@ -133,14 +165,14 @@ class LocalDocumentsConfig:
     documents_path: str = "./data"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocumentsConfig:
     """文档存储配置"""
     type: str = "local"
     local: LocalDocumentsConfig = field(default_factory=LocalDocumentsConfig)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StorageConfig:
     """存储配置"""
     vector_store: VectorStoreConfig = field(default_factory=VectorStoreConfig)
@@ -148,7 +180,7 @@ class StorageConfig:
     document_repository: DocumentRepositoryConfig = field(default_factory=DocumentRepositoryConfig)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RetrievalConfig:
     """检索配置"""
     top_k: int = 5
@@ -156,7 +188,7 @@ class RetrievalConfig:
     max_context_length: int = 2000
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocumentProcessingConfig:
     """文档处理配置"""
     chunk_size: int = 500
@@ -164,14 +196,14 @@ class DocumentProcessingConfig:
     supported_formats: list = field(default_factory=lambda: ["txt", "md", "json"])
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConversationConfig:
     """对话配置"""
     max_history_length: int = 10
     session_timeout_minutes: int = 30
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RAGConfig:
     """RAG系统配置"""
     retrieval: RetrievalConfig = field(default_factory=RetrievalConfig)
@@ -181,14 +213,14 @@ class RAGConfig:
 
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CORSConfig:
     """CORS配置"""
     allow_origins: list = field(default_factory=lambda: ["*"])
     allow_methods: list = field(default_factory=lambda: ["GET", "POST", "PUT", "DELETE"])
     allow_headers: list = field(default_factory=lambda: ["*"])
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     """主配置类"""
     app: AppConfig = field(default_factory=AppConfig)
@@ -217,212 +249,83 @@ class ConfigManager:
         try:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f)
-                self._config = self._create_config_from_dict(config_data or {})
+                    config_data = yaml.load(f, Loader=_YamlLoader)
+                config = self._create_config_from_dict(config_data or {})
             else:
-                logger.warning(f"配置文件不存在: {self.config_path}，使用默认配置")
-                self._config = Config()
+                logger.warning("配置文件不存在: %s，使用默认配置", self.config_path)
+                config = Config()
             
             # 应用环境变量覆盖
-            self._apply_env_overrides()
+            self._apply_env_overrides(config)
             
         except Exception as e:
-            logger.error(f"加载配置文件失败: {e}")
+            logger.error("加载配置文件失败: %s", e)
             logger.info("使用默认配置")
-            self._config = Config()
+            config = Config()
+        
+        # 构建完成后整体替换，并发读取方不会看到半成品配置
+        self._config = config
+        self._resolve_paths()
+    
+    async def reload(self) -> Config:
+        """重新加载配置（文件读取与解析放到线程中执行，不阻塞事件循环）
+        
+        Returns:
+            重新加载后的配置对象
+        """
+        await asyncio.to_thread(self._load_config)
+        # 清除模块级 get_config 缓存，使其返回新配置
+        get_config.cache_clear()
+        return self._config
+    
+    def _resolve_paths(self) -> None:
+        """预先构造 validate_config 用到的目录路径（配置不可变，只需计算一次）"""
+        config = self._config
+        self._docs_path = Path(config.storage.documents.local.documents_path)
+        self._base_path = Path(config.storage.documents.local.base_path)
+        self._index_parent = Path(config.storage.vector_store.index_path).parent
+        # 目录确认存在后置为 True，后续校验跳过文件系统检查
+        self._paths_ready = False
     
     def _create_config_from_dict(self, data: Dict[str, Any]) -> Config:
-        """从字典创建配置对象"""
+        """从字典创建配置对象（按 _YAML_TABLE 将存在的键写入默认配置）"""
         config = Config()
-        
-        # 应用配置
-        if 'app' in data:
-            app_data = data['app']
-            config.app = AppConfig(
-                name=app_data.get('name', config.app.name),
-                version=app_data.get('version', config.app.version),
-            )
-        
-        # 日志配置
-        if 'logging' in data:
-            logging_data = data['logging']
-            config.logging = LoggingConfig(
-                level=logging_data.get('level', config.logging.level),
-                file_path=logging_data.get('file_path', config.logging.file_path),
-                max_file_size_mb=logging_data.get('max_file_size_mb', config.logging.max_file_size_mb),
-                backup_count=logging_data.get('backup_count', config.logging.backup_count),
-            )
-        
-        # 服务器配置
-        if 'server' in data:
-            server_data = data['server']
-            config.server = ServerConfig(
-                host=server_data.get('host', config.server.host),
-                port=server_data.get('port', config.server.port),
-                reload=server_data.get('reload', config.server.reload),
-                workers=server_data.get('workers', config.server.workers)
-            )
-        
-        # AI服务配置
-        if 'ai_providers' in data:
-            ai_data = data['ai_providers']
-            
-            # 嵌入配置
-            embedding_data = ai_data.get('embedding', {})
-            openai_embedding = embedding_data.get('openai', {})
-            aliyun_embedding = embedding_data.get('aliyun', {})
-            sentence_transformers_embedding = embedding_data.get('sentence_transformers', {})
-            
-            config.ai_providers.embedding = EmbeddingConfig(
-                provider=embedding_data.get('provider', config.ai_providers.embedding.provider),
-                batch_size=embedding_data.get('batch_size', config.ai_providers.embedding.batch_size),
-                max_length=embedding_data.get('max_length', config.ai_providers.embedding.max_length),
-                openai=OpenAIConfig(
-                    api_key=openai_embedding.get('api_key', ''),
-                    model=openai_embedding.get('model', 'text-embedding-ada-002'),
-                    api_base=openai_embedding.get('api_base', 'https://api.openai.com/v1'),
-                    organization=openai_embedding.get('organization')
-                ),
-                aliyun=AliyunEmbeddingConfig(
-                    api_key=aliyun_embedding.get('api_key', ''),
-                    model=aliyun_embedding.get('model', 'text-embedding-v1'),
-                    api_base=aliyun_embedding.get('api_base', 'https://dashscope.aliyuncs.com/api/v1')
-                ),
-                sentence_transformers=SentenceTransformersConfig(
-                    model=sentence_transformers_embedding.get('model', 'all-MiniLM-L6-v2'),
-                    device=sentence_transformers_embedding.get('device', 'cpu')
-                )
-            )
-            
-            # LLM配置
-            llm_data = ai_data.get('llm', {})
-            openai_llm = llm_data.get('openai', {})
-            aliyun_llm = llm_data.get('aliyun', {})
-            
-            config.ai_providers.llm = LLMConfig(
-                provider=llm_data.get('provider', config.ai_providers.llm.provider),
-                max_tokens=llm_data.get('max_tokens', config.ai_providers.llm.max_tokens),
-                temperature=llm_data.get('temperature', config.ai_providers.llm.temperature),
-                openai=OpenAIConfig(
-                    api_key=openai_llm.get('api_key', ''),
-                    model=openai_llm.get('model', 'gpt-3.5-turbo'),
-                    api_base=openai_llm.get('api_base', 'https://api.openai.com/v1'),
-                    organization=openai_llm.get('organization')
-                ),
-                aliyun=AliyunLLMConfig(
-                    api_key=aliyun_llm.get('api_key', ''),
-                    model=aliyun_llm.get('model', 'qwen-turbo'),
-                    api_base=aliyun_llm.get('api_base', 'https://dashscope.aliyuncs.com/api/v1')
-                )
-            )
-        
-        # 存储配置
-        if 'storage' in data:
-            storage_data = data['storage']
-            vector_store_data = storage_data.get('vector_store', {})
-            documents_data = storage_data.get('documents', {})
-            local_documents_data = documents_data.get('local', {})
-            
-            # 处理向量存储配置
-            faiss_data = vector_store_data.get('faiss', {})
-            
-            config.storage = StorageConfig(
-                vector_store=VectorStoreConfig(
-                    type=vector_store_data.get('type', config.storage.vector_store.type),
-                    dimension=faiss_data.get('dimension', config.storage.vector_store.dimension),
-                    index_path=faiss_data.get('index_path', config.storage.vector_store.index_path)
-                ),
-                documents=DocumentsConfig(
-                    type=documents_data.get('type', config.storage.documents.type),
-                    local=LocalDocumentsConfig(
-                        base_path=local_documents_data.get('base_path', config.storage.documents.local.base_path),
-                        max_file_size_mb=local_documents_data.get('max_file_size_mb', config.storage.documents.local.max_file_size_mb),
-                        documents_path=local_documents_data.get('documents_path', config.storage.documents.local.documents_path)
-                    )
-                )
-            )
-        
-        # RAG配置
-        if 'rag' in data:
-            rag_data = data['rag']
-            retrieval_data = rag_data.get('retrieval', {})
-            doc_processing_data = rag_data.get('document_processing', {})
-            conversation_data = rag_data.get('conversation', {})
-            
-            config.rag = RAGConfig(
-                retrieval=RetrievalConfig(
-                    top_k=retrieval_data.get('top_k', config.rag.retrieval.top_k),
-                    similarity_threshold=retrieval_data.get('similarity_threshold', config.rag.retrieval.similarity_threshold),
-                    max_context_length=retrieval_data.get('max_context_length', config.rag.retrieval.max_context_length)
-                ),
-                document_processing=DocumentProcessingConfig(
-                    chunk_size=doc_processing_data.get('chunk_size', config.rag.document_processing.chunk_size),
-                    chunk_overlap=doc_processing_data.get('chunk_overlap', config.rag.document_processing.chunk_overlap),
-                    supported_formats=doc_processing_data.get('supported_formats', config.rag.document_processing.supported_formats)
-                ),
-                conversation=ConversationConfig(
-                    max_history_length=conversation_data.get('max_history_length', config.rag.conversation.max_history_length),
-                    session_timeout_minutes=conversation_data.get('session_timeout_minutes', config.rag.conversation.session_timeout_minutes)
-                )
-            )
-        
+        for keys, get_parent, leaf in _YAML_TABLE:
+            node = data
+            for key in keys:
+                if not isinstance(node, dict) or key not in node:
+                    break
+                node = node[key]
+            else:
+                # 配置类为 frozen：仅在加载阶段绕过冻结写入字段
+                object.__setattr__(get_parent(config), leaf, node)
         return config
     
-    def _apply_env_overrides(self) -> None:
-        """应用环境变量覆盖"""
-        if not self._config:
-            return
-        
-        # 应用环境：已移除对 app.environment 的覆盖
-        
-        # 服务器配置
-        env_val = os.getenv('HOST')
-        if env_val:
-            self._config.server.host = env_val
-        env_val = os.getenv('PORT')
-        if env_val:
-            try:
-                self._config.server.port = int(env_val)
-            except ValueError:
-                logger.warning(f"无效的端口号: {env_val}")
+    def _apply_env_overrides(self, config: Optional[Config] = None) -> None:
+        """应用环境变量覆盖（按 _ENV_TABLE）
         
-        # OpenAI API密钥
-        env_val = os.getenv('OPENAI_API_KEY')
-        if env_val:
-            self._config.ai_providers.embedding.openai.api_key = env_val
-            self._config.ai_providers.llm.openai.api_key = env_val
+        Args:
+            config: 要覆盖的配置对象，默认为当前配置
+        """
+        config = config or self._config
+        if not config:
+            return
         
-        # 日志级别
-        env_val = os.getenv('LOG_LEVEL')
-        if env_val:
-            # 仅更新日志配置
-            self._config.logging.level = env_val
-
-        # 日志文件路径
-        env_val = os.getenv('LOG_FILE_PATH')
-        if env_val:
-            self._config.logging.file_path = env_val
-
-        # 日志文件最大尺寸（MB）
-        env_val = os.getenv('LOG_MAX_FILE_SIZE_MB')
-        if env_val:
-            try:
-                self._config.logging.max_file_size_mb = int(env_val)
-            except ValueError:
-                logger.warning(f"无效的日志最大文件大小: {env_val}")
-
-        # 日志备份文件数量
-        env_val = os.getenv('LOG_BACKUP_COUNT')
-        if env_val:
+        environ = os.environ
+        for name, targets, caster, invalid_msg in _ENV_TABLE:
+            env_val = environ.get(name)
+            if not env_val:
+                continue
             try:
-                self._config.logging.backup_count = int(env_val)
+                value = caster(env_val)
             except ValueError:
-                logger.warning(f"无效的日志备份数量: {env_val}")
+                logger.warning("%s: %s", invalid_msg, env_val)
+                continue
+            for get_parent, leaf in targets:
+                object.__setattr__(get_parent(config), leaf, value)
     
     def get_config(self) -> Config:
-        """获取配置对象"""
-        if self._config is None:
-            self._load_config()
+        """获取配置对象（__init__ 中已完成加载，且加载失败时回退为默认配置）"""
         return self._config
     
     def validate_config(self) -> bool:
@@ -435,31 +338,50 @@ class ConfigManager:
                 logger.error("文档路径未配置")
                 return False
             
+            vector_store = config.storage.vector_store
+            if vector_store.dtype not in ("float32", "float16", "int8"):
+                logger.error("不支持的向量存储精度: %s", vector_store.dtype)
+                return False
+            if vector_store.quantization not in (None, "sq", "pq4", "pq8"):
+                logger.error("不支持的向量量化方式: %s", vector_store.quantization)
+                return False
+            
+            if config.ai_providers.llm.batch_size < 1:
+                logger.error("LLM批量生成的 batch_size 必须为正整数: %s", config.ai_providers.llm.batch_size)
+                return False
+            llm_cache = config.ai_providers.llm.cache
+            if not 0 < llm_cache.similarity_threshold <= 1:
+                logger.error("LLM缓存相似度阈值必须在 (0, 1] 范围内: %s", llm_cache.similarity_threshold)
+                return False
+            if llm_cache.memory_max_entries < 0:
+                logger.error("LLM内存缓存条目数不能为负数: %s", llm_cache.memory_max_entries)
+                return False
+            
             if config.ai_providers.llm.provider == "openai":
                 if not config.ai_providers.llm.openai.api_key:
                     logger.warning("OpenAI API密钥未配置")
             
-            # 验证路径存在性
-            docs_path = Path(config.storage.documents.local.documents_path)
-            if not docs_path.exists():
-                logger.info(f"创建文档目录: {docs_path}")
-                docs_path.mkdir(parents=True, exist_ok=True)
+            if not self._paths_ready:
+                # 验证路径存在性
+                if not self._docs_path.exists():
+                    logger.info("创建文档目录: %s", self._docs_path)
+                    self._docs_path.mkdir(parents=True, exist_ok=True)
+                    
+                # 验证存储基础路径
+                if not self._base_path.exists():
+                    logger.info("创建存储目录: %s", self._base_path)
+                    self._base_path.mkdir(parents=True, exist_ok=True)
                 
-            # 验证存储基础路径
-            base_path = Path(config.storage.documents.local.base_path)
-            if not base_path.exists():
-                logger.info(f"创建存储目录: {base_path}")
-                base_path.mkdir(parents=True, exist_ok=True)
-            
-            index_path = Path(config.storage.vector_store.index_path)
-            if not index_path.parent.exists():
-                logger.info(f"创建索引目录: {index_path.parent}")
-                index_path.parent.mkdir(parents=True, exist_ok=True)
+                if not self._index_parent.exists():
+                    logger.info("创建索引目录: %s", self._index_parent)
+                    self._index_parent.mkdir(parents=True, exist_ok=True)
+                
+                self._paths_ready = True
             
             return True
             
         except Exception as e:
-            logger.error(f"配置验证失败: {e}")
+            logger.error("配置验证失败: %s", e)
             return False
     
     def get_env_info(self) -> Dict[str, Any]:
@@ -474,20 +396,112 @@ class ConfigManager:
         }
 
 
+def _compile_attr_path(path: str) -> Tuple[Callable[[Any], Any], str]:
+    """将 'a.b.c' 预编译为 (取父对象的 attrgetter('a.b'), 'c')"""
+    parent, _, leaf = path.rpartition('.')
+    return attrgetter(parent), leaf
+
+
+# YAML 键路径 -> 配置属性路径
+_YAML_BINDINGS = (
+    (('app', 'name'), 'app.name'),
+    (('app', 'version'), 'app.version'),
+    (('logging', 'level'), 'logging.level'),
+    (('logging', 'file_path'), 'logging.file_path'),
+    (('logging', 'max_file_size_mb'), 'logging.max_file_size_mb'),
+    (('logging', 'backup_count'), 'logging.backup_count'),
+    (('server', 'host'), 'server.host'),
+    (('server', 'port'), 'server.port'),
+    (('server', 'reload'), 'server.reload'),
+    (('server', 'workers'), 'server.workers'),
+    (('ai_providers', 'embedding', 'provider'), 'ai_providers.embedding.provider'),
+    (('ai_providers', 'embedding', 'batch_size'), 'ai_providers.embedding.batch_size'),
+    (('ai_providers', 'embedding', 'max_length'), 'ai_providers.embedding.max_length'),
+    (('ai_providers', 'embedding', 'openai', 'api_key'), 'ai_providers.embedding.openai.api_key'),
+    (('ai_providers', 'embedding', 'openai', 'model'), 'ai_providers.embedding.openai.model'),
+    (('ai_providers', 'embedding', 'openai', 'api_base'), 'ai_providers.embedding.openai.api_base'),
+    (('ai_providers', 'embedding', 'openai', 'organization'), 'ai_providers.embedding.openai.organization'),
+    (('ai_providers', 'embedding', 'aliyun', 'api_key'), 'ai_providers.embedding.aliyun.api_key'),
+    (('ai_providers', 'embedding', 'aliyun', 'model'), 'ai_providers.embedding.aliyun.model'),
+    (('ai_providers', 'embedding', 'aliyun', 'api_base'), 'ai_providers.embedding.aliyun.api_base'),
+    (('ai_providers', 'embedding', 'sentence_transformers', 'model'), 'ai_providers.embedding.sentence_transformers.model'),
+    (('ai_providers', 'embedding', 'sentence_transformers', 'device'), 'ai_providers.embedding.sentence_transformers.device'),
+    (('ai_providers', 'llm', 'provider'), 'ai_providers.llm.provider'),
+    (('ai_providers', 'llm', 'max_tokens'), 'ai_providers.llm.max_tokens'),
+    (('ai_providers', 'llm', 'temperature'), 'ai_providers.llm.temperature'),
+    (('ai_providers', 'llm', 'batch_size'), 'ai_providers.llm.batch_size'),
+    (('ai_providers', 'llm', 'openai', 'api_key'), 'ai_providers.llm.openai.api_key'),
+    (('ai_providers', 'llm', 'openai', 'model'), 'ai_providers.llm.openai.model'),
+    (('ai_providers', 'llm', 'openai', 'api_base'), 'ai_providers.llm.openai.api_base'),
+    (('ai_providers', 'llm', 'openai', 'organization'), 'ai_providers.llm.openai.organization'),
+    (('ai_providers', 'llm', 'aliyun', 'api_key'), 'ai_providers.llm.aliyun.api_key'),
+    (('ai_providers', 'llm', 'aliyun', 'model'), 'ai_providers.llm.aliyun.model'),
+    (('ai_providers', 'llm', 'aliyun', 'api_base'), 'ai_providers.llm.aliyun.api_base'),
+    (('ai_providers', 'llm', 'cache', 'enabled'), 'ai_providers.llm.cache.enabled'),
+    (('ai_providers', 'llm', 'cache', 'path'), 'ai_providers.llm.cache.path'),
+    (('ai_providers', 'llm', 'cache', 'similarity_threshold'), 'ai_providers.llm.cache.similarity_threshold'),
+    (('ai_providers', 'llm', 'cache', 'ttl_seconds'), 'ai_providers.llm.cache.ttl_seconds'),
+    (('ai_providers', 'llm', 'cache', 'memory_max_entries'), 'ai_providers.llm.cache.memory_max_entries'),
+    (('storage', 'vector_store', 'type'), 'storage.vector_store.type'),
+    (('storage', 'vector_store', 'faiss', 'dimension'), 'storage.vector_store.dimension'),
+    (('storage', 'vector_store', 'faiss', 'index_path'), 'storage.vector_store.index_path'),
+    (('storage', 'vector_store', 'faiss', 'dtype'), 'storage.vector_store.dtype'),
+    (('storage', 'vector_store', 'faiss', 'quantization'), 'storage.vector_store.quantization'),
+    (('storage', 'documents', 'type'), 'storage.documents.type'),
+    (('storage', 'documents', 'local', 'base_path'), 'storage.documents.local.base_path'),
+    (('storage', 'documents', 'local', 'max_file_size_mb'), 'storage.documents.local.max_file_size_mb'),
+    (('storage', 'documents', 'local', 'documents_path'), 'storage.documents.local.documents_path'),
+    (('rag', 'retrieval', 'top_k'), 'rag.retrieval.top_k'),
+    (('rag', 'retrieval', 'similarity_threshold'), 'rag.retrieval.similarity_threshold'),
+    (('rag', 'retrieval', 'max_context_length'), 'rag.retrieval.max_context_length'),
+    (('rag', 'document_processing', 'chunk_size'), 'rag.document_processing.chunk_size'),
+    (('rag', 'document_processing', 'chunk_overlap'), 'rag.document_processing.chunk_overlap'),
+    (('rag', 'document_processing', 'supported_formats'), 'rag.document_processing.supported_formats'),
+    (('rag', 'conversation', 'max_history_length'), 'rag.conversation.max_history_length'),
+    (('rag', 'conversation', 'session_timeout_minutes'), 'rag.conversation.session_timeout_minutes'),
+)
+
+# 环境变量名 -> (配置属性路径, 类型转换, 转换失败时的警告)
+_ENV_BINDINGS = (
+    ('HOST', ('server.host',), str, None),
+    ('PORT', ('server.port',), int, "无效的端口号"),
+    ('OPENAI_API_KEY', ('ai_providers.embedding.openai.api_key', 'ai_providers.llm.openai.api_key'), str, None),
+    ('LOG_LEVEL', ('logging.level',), str, None),
+    ('LOG_FILE_PATH', ('logging.file_path',), str, None),
+    ('LOG_MAX_FILE_SIZE_MB', ('logging.max_file_size_mb',), int, "无效的日志最大文件大小"),
+    ('LOG_BACKUP_COUNT', ('logging.backup_count',), int, "无效的日志备份数量"),
+)
+
+# 模块导入时预编译属性访问器
+_YAML_TABLE = tuple((keys,) + _compile_attr_path(path) for keys, path in _YAML_BINDINGS)
+_ENV_TABLE = tuple(
+    (name, tuple(_compile_attr_path(path) for path in paths), caster, invalid_msg)
+    for name, paths, caster, invalid_msg in _ENV_BINDINGS
+)
+
+
 # 全局配置管理器实例
 _config_manager: Optional[ConfigManager] = None
+_config_manager_lock = threading.Lock()
 
 
 def get_config_manager(config_path: str = "config.yaml") -> ConfigManager:
     """获取全局配置管理器实例"""
     global _config_manager
+    # 双重检查加锁：初始化后无锁快速返回，并发首次调用时只构造一次
     if _config_manager is None:
-        # 支持通过环境变量覆盖配置路径
-        env_path = os.getenv("CONFIG_PATH") or config_path
-        _config_manager = ConfigManager(env_path)
+        with _config_manager_lock:
+            if _config_manager is None:
+                # 支持通过环境变量覆盖配置路径
+                env_path = os.getenv("CONFIG_PATH") or config_path
+                _config_manager = ConfigManager(env_path)
     return _config_manager
 
 
+@functools.cache
 def get_config() -> Config:
-    """获取配置对象的便捷函数"""
+    """获取配置对象的便捷函数
+
+    配置加载后不可变，首次调用后直接返回缓存的同一实例。
+    """
     return get_config_manager().get_config()
\ No newline at end of file
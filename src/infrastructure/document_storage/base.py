@@ -1,28 +1,107 @@
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Union
+from dataclasses import dataclass, field
+
+try:
+    from blake3 import blake3
+except ImportError as e:
+    # 文档ID必须在所有环境下一致，缺少 blake3 时直接失败，而不是改用其他算法生成不同的ID
+    raise ImportError(
+        "文档存储依赖 blake3 生成文档ID，请按 requirements.txt 安装（pip install blake3==1.0.11）"
+    ) from e
+
 from ...domain.interfaces.document_storage_service import DocumentStorageService
 
-@dataclass
+# 文档ID只使用 BLAKE3 一种算法，不做回退：同一文件在任何环境下得到相同的ID
+_ID_HASHER = blake3
+# 历史ID方案：最初为 MD5，之后曾在未安装 blake3 时回退到 SHA-256；仅用于旧ID到当前ID的映射
+_LEGACY_ID_HASHERS = (hashlib.md5, hashlib.sha256)
+
+
+def _hash_document_id(hasher: Callable[[], Any], content: Union[str, bytes, memoryview], source: str) -> str:
+    """按 hash(source + ':' + content) 计算文档ID（分段送入哈希，不拼接内容）"""
+    h = hasher()
+    h.update(source.encode())
+    h.update(b":")
+    h.update(content.encode() if isinstance(content, str) else content)
+    return f"doc_{h.hexdigest()[:16]}"
+
+@dataclass(slots=True)
 class RawDocument:
-    """原始文档数据类"""
+    """原始文档数据类
+
+    content 可以是已解码的 str，也可以是未解码的 bytes/memoryview；
+    需要文本时调用 text()，按 UTF-8 延迟解码（忽略非法字节）并缓存结果。
+    """
     id: str
-    content: str
+    content: Union[str, bytes, memoryview]
     source: str  # 文档来源（本地路径或 s3://bucket/key）
     metadata: Dict[str, Any] = None
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def text(self) -> str:
+        """返回文本内容（首次调用时解码字节内容）"""
+        if isinstance(self.content, str):
+            return self.content
+        if self._text is None:
+            self._text = str(self.content, "utf-8", "ignore")
+        return self._text
 
 class DocumentStorageProvider(DocumentStorageService, ABC):
     """文档存储接口（基础抽象类）
     仅定义必须的 Raw 层抽象方法，具体 Domain 层实现交由各 Provider 完成。
     """
 
+    def _generate_document_id(self, content: Union[str, bytes, memoryview], source: str) -> str:
+        """根据内容和来源生成文档ID
+
+        来源与内容分别送入哈希，避免为拼接前缀再复制一份内容；
+        bytes/memoryview（如 mmap）内容直接参与哈希。
+        """
+        return _hash_document_id(_ID_HASHER, content, source)
+
+    def _legacy_document_ids(self, raw_doc: RawDocument) -> List[str]:
+        """按历史ID方案重新计算文档ID（保留 _序号 后缀），ID不是由内容生成时返回空列表"""
+        content = raw_doc.text()
+        current = self._generate_document_id(content, raw_doc.source)
+        if not raw_doc.id.startswith(current):
+            return []
+        suffix = raw_doc.id[len(current):]
+        return [_hash_document_id(hasher, content, raw_doc.source) + suffix for hasher in _LEGACY_ID_HASHERS]
+
+    async def build_legacy_id_map(self, source_path: Optional[str] = None) -> Dict[str, str]:
+        """生成旧文档ID到当前文档ID的映射
+
+        文档ID改用 BLAKE3 之前保存的ID（MD5，或未安装 blake3 时的 SHA-256）
+        可借此映射到当前ID，用于迁移外部保存的ID引用。
+
+        Args:
+            source_path: 可选的源路径/前缀过滤
+
+        Returns:
+            {旧ID: 当前ID}
+        """
+        mapping: Dict[str, str] = {}
+        async for doc in self._iter_raw_documents(source_path):
+            for legacy_id in self._legacy_document_ids(doc):
+                mapping[legacy_id] = doc.id
+        return mapping
+
     # --------------------
     # Raw 层抽象方法（具体实现必须覆盖）
     # --------------------
     @abstractmethod
+    def _iter_raw_documents(self, source_path: Optional[str] = None) -> AsyncIterator[RawDocument]:
+        """逐个产出原始文档的异步生成器（可按源路径/前缀过滤）
+
+        调用方可边读边处理（如送入嵌入队列），无需等待全部文档载入内存。
+        """
+        pass
+
     async def _load_raw_documents(self, source_path: Optional[str] = None) -> List[RawDocument]:
         """加载所有原始文档（可按源路径/前缀过滤）"""
-        pass
+        return [doc async for doc in self._iter_raw_documents(source_path)]
 
     @abstractmethod
     async def _save_raw_document(self, document: RawDocument) -> bool:
@@ -1,9 +1,21 @@
 import os
+import sys
 import json
-import hashlib
+import asyncio
 import base64
-from typing import List, Dict, Any, Optional
+import io
+import mmap
+import re
+import sqlite3
+import threading
+import weakref
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import shutil
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
 from datetime import datetime
 
@@ -13,6 +25,64 @@ from ...infrastructure.log.logger_service import LoggerService
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    # orjson 未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import ijson as _ijson
+    try:
+        # 优先使用基于 yajl2 的 C 后端
+        _ijson = _ijson.get_backend('yajl2_c')
+    except ImportError:
+        pass
+except ImportError:
+    _ijson = None
+
+# 超过该大小的顶层数组JSON文件改为流式解析
+_JSON_STREAM_THRESHOLD = 32 * 1024 * 1024
+
+# 按文本读取的文件后缀
+_TEXT_SUFFIXES = frozenset({'.txt', '.text', '.md', '.markdown'})
+
+# 并发加载文件的线程数
+_LOAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Markdown 标题行（以 # 开头的行）
+_MD_HEADING_RE = re.compile(r'(?m)^#.*$')
+
+# 超过该大小的文件通过 mmap 读取，按需分页且省去一次用户态缓冲区拷贝
+_MMAP_THRESHOLD = 1024 * 1024
+
+# 全文索引库结构版本（PRAGMA user_version），低于该版本时清空重建
+_FTS_SCHEMA_VERSION = 2
+
+# 当前异步上下文中处于 bulk_save 的 provider：提交只对调用方自身推迟，不影响其他并发任务
+_BULK_SAVE: ContextVar[Tuple[Any, ...]] = ContextVar("local_storage_bulk_save", default=())
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析JSON，优先使用 orjson；orjson 拒绝的输入（如 NaN/Infinity）回退到标准库"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为缩进2格的UTF-8 JSON（不转义非ASCII字符）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
 class LocalDocumentStorageProvider(DocumentStorageProvider):
     """本地文件存储实现"""
     
@@ -20,101 +90,197 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
         self.data_path = Path(data_path)
         self.data_path.mkdir(parents=True, exist_ok=True)
         self.logger = logger
-        # 维护文件ID与实际保存文件路径的映射文件路径
-        self.id_map_path = self.data_path / 'id_map.json'
+        # 文件ID与实际保存文件路径的映射（SQLite，单行读写，无需整体重写）
+        self.id_map_path = self.data_path / 'id_map.sqlite'
+        self._id_map_db = sqlite3.connect(str(self.id_map_path), check_same_thread=False)
+        self._id_map_db.execute("PRAGMA journal_mode=WAL")
+        self._id_map_db.execute("PRAGMA synchronous=NORMAL")
+        self._id_map_db.execute(
+            "CREATE TABLE IF NOT EXISTS id_map (doc_id TEXT PRIMARY KEY, path TEXT NOT NULL, filename TEXT NOT NULL)"
+        )
+        # 映射库连接在事件循环与工作线程间共用，语句与提交由该锁串行化
+        self._id_map_lock = threading.Lock()
+        self._migrate_legacy_id_map()
+        # 文件后缀 -> 加载方法（Markdown文件按章节分割）
+        self._loaders = {
+            '.json': self._load_json_file,
+            '.md': self._load_markdown_file,
+            '.markdown': self._load_markdown_file,
+            '.txt': self._load_text_file,
+            '.text': self._load_text_file,
+            '.pdf': self._load_pdf_file,
+            '.docx': self._load_docx_file,
+        }
+        # 文件读取/解析线程池，首次加载时创建
+        self._load_pool: Optional[ThreadPoolExecutor] = None
+        # 全文检索索引（SQLite FTS5，trigram 分词支持任意子串匹配）：
+        # 保存/删除时同步更新对应文件的索引项，检索只查询索引库；
+        # files 表记录已索引文件的 (修改时间, 大小)，供首次检索前或 reindex() 时与数据目录对齐
+        self._fts = sqlite3.connect(str(self.data_path / 'fts.sqlite'), check_same_thread=False)
+        self._fts.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5("
+            "doc_id UNINDEXED, source UNINDEXED, metadata UNINDEXED, content, tokenize='trigram')"
+        )
+        self._fts.execute(
+            "CREATE TABLE IF NOT EXISTS files (source TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._fts.commit()
+        # 索引库连接在事件循环与工作线程间共用，语句与事务由该锁串行化
+        self._fts_lock = threading.Lock()
+        # 同一时间只允许一个对齐过程，避免重复写入
+        self._fts_sync_lock = asyncio.Lock()
+        # 是否已完成启动后的首次对齐
+        self._fts_synced = False
 
     def get_data_path(self) -> Path:
         """获取当前本地存储的数据根路径"""
         return self.data_path
 
     # --- 映射文件工具方法 ---
-    def _load_id_map(self) -> Dict[str, Any]:
+    def _migrate_legacy_id_map(self) -> None:
+        """将旧版 id_map.json 一次性导入 SQLite，导入后重命名为 id_map.json.migrated"""
+        legacy_path = self.data_path / 'id_map.json'
+        if not legacy_path.exists():
+            return
         try:
-            if self.id_map_path.exists():
-                with open(self.id_map_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return data if isinstance(data, dict) else {}
+            data = _json_loads(legacy_path.read_bytes())
+            rows = []
+            for doc_id, entry in (data if isinstance(data, dict) else {}).items():
+                # 兼容旧结构：字符串为路径；新结构：字典包含 path 和 filename
+                if isinstance(entry, str):
+                    path, filename = entry, Path(entry).name
+                elif isinstance(entry, dict) and isinstance(entry.get('path'), str):
+                    path = entry['path']
+                    filename = entry.get('filename') or Path(path).name
+                else:
+                    continue
+                if path:
+                    rows.append((doc_id, path, filename))
+            with self._id_map_lock, self._id_map_db:
+                self._id_map_db.executemany("INSERT OR REPLACE INTO id_map VALUES (?, ?, ?)", rows)
+            os.replace(legacy_path, legacy_path.with_name('id_map.json.migrated'))
+            if self.logger:
+                self.logger.info(f"LocalStorage: migrated {len(rows)} entries from id_map.json")
         except Exception as e:
             if self.logger:
-                self.logger.warning(f"LocalStorage: load id_map failed: {e}")
-        return {}
+                self.logger.warning(f"LocalStorage: migrate id_map.json failed: {e}")
+
+    def _flush_id_map(self) -> None:
+        """提交未提交的映射修改（批量修改时使用 flush=False 后调用）"""
+        with self._id_map_lock:
+            self._id_map_db.commit()
+
+    def _flush_fts(self) -> None:
+        """提交全文索引库中推迟的修改"""
+        with self._fts_lock:
+            self._fts.commit()
+
+    def _in_bulk(self) -> bool:
+        """当前异步上下文是否处于本 provider 的 bulk_save 中"""
+        return any(provider is self for provider in _BULK_SAVE.get())
 
-    def _save_id_map(self, id_map: Dict[str, Any]) -> None:
+    @contextmanager
+    def bulk_save(self):
+        """批量保存上下文：期间的映射与全文索引修改在退出时各提交一次
+
+        推迟只作用于进入该上下文的任务（及其创建的子任务），其他并发任务的保存照常提交。
+
+        用法：
+            with provider.bulk_save():
+                for doc in docs:
+                    await provider.save_document(doc)
+        """
+        token = _BULK_SAVE.set(_BULK_SAVE.get() + (self,))
         try:
-            with open(self.id_map_path, 'w', encoding='utf-8') as f:
-                json.dump(id_map, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            if self.logger:
-                self.logger.warning(f"LocalStorage: save id_map failed: {e}")
+            yield self
+        finally:
+            _BULK_SAVE.reset(token)
+            if not self._in_bulk():
+                self._flush_id_map()
+                self._flush_fts()
+
+    def compact(self) -> None:
+        """将映射库的 WAL 日志合并回主库并截断（适合在大批量导入完成后调用）"""
+        self._flush_id_map()
+        with self._id_map_lock:
+            self._id_map_db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
     def _get_mapped_path(self, document_id: str) -> Optional[Path]:
-        id_map = self._load_id_map()
-        entry = id_map.get(document_id)
-        # 兼容旧结构：字符串为路径
-        if isinstance(entry, str):
-            return Path(entry) if entry else None
-        # 新结构：字典包含 path 和 filename
-        if isinstance(entry, dict):
-            path = entry.get('path')
-            return Path(path) if isinstance(path, str) and path else None
-        return None
-
-    def _set_mapped_path(self, document_id: str, path: Path) -> None:
-        id_map = self._load_id_map()
-        id_map[document_id] = {
-            'path': str(path),
-            'filename': path.name
-        }
-        self._save_id_map(id_map)
+        with self._id_map_lock:
+            row = self._id_map_db.execute("SELECT path FROM id_map WHERE doc_id = ?", (document_id,)).fetchone()
+        return Path(row[0]) if row else None
 
-    def _remove_mapped_path(self, document_id: str) -> None:
-        id_map = self._load_id_map()
-        if document_id in id_map:
-            del id_map[document_id]
-            self._save_id_map(id_map)
-    
-    def _generate_document_id(self, content: str, source: str) -> str:
-        """根据内容和来源生成文档ID"""
-        content_hash = hashlib.md5(f"{source}:{content}".encode()).hexdigest()
-        return f"doc_{content_hash[:16]}"
+    def _set_mapped_path(self, document_id: str, path: Path, flush: bool = True) -> None:
+        with self._id_map_lock:
+            self._id_map_db.execute(
+                "INSERT OR REPLACE INTO id_map VALUES (?, ?, ?)", (document_id, str(path), path.name)
+            )
+        if flush and not self._in_bulk():
+            self._flush_id_map()
+
+    def _remove_mapped_path(self, document_id: str, flush: bool = True) -> None:
+        with self._id_map_lock:
+            self._id_map_db.execute("DELETE FROM id_map WHERE doc_id = ?", (document_id,))
+        if flush and not self._in_bulk():
+            self._flush_id_map()
     
+    @staticmethod
+    def _json_root_is_array(file_path: Path) -> bool:
+        """读取首个非空白字节判断JSON顶层是否为数组"""
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(4096)
+                if not chunk:
+                    return False
+                stripped = chunk.lstrip(b' \t\r\n\xef\xbb\xbf')
+                if stripped:
+                    return stripped[:1] == b'['
+
+    def _json_item_to_raw(self, item: Any, index: int, source: str) -> RawDocument:
+        """将JSON数组中的单个元素转换为RawDocument"""
+        if isinstance(item, dict):
+            # 处理字典格式的数据
+            content = _json_dumps(item).decode('utf-8')
+            doc_type = "json_object"
+        else:
+            # 处理其他类型的数据
+            content = str(item)
+            doc_type = "json_item"
+        doc_id = self._generate_document_id(content, source)
+        return RawDocument(
+            id=f"{doc_id}_{index}",
+            content=content,
+            source=source,
+            metadata={"type": doc_type, "index": index}
+        )
+
     def _load_json_file(self, file_path: Path) -> List[RawDocument]:
-        """加载JSON文件"""
+        """加载JSON文件（大型顶层数组使用 ijson 流式解析，避免整体载入内存）"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 同一文件产生的多个文档共享同一个 source 字符串对象
+            source = sys.intern(str(file_path))
             
+            if (_ijson is not None
+                    and file_path.stat().st_size > _JSON_STREAM_THRESHOLD
+                    and self._json_root_is_array(file_path)):
+                with open(file_path, 'rb') as f:
+                    return [
+                        self._json_item_to_raw(item, i, source)
+                        for i, item in enumerate(_ijson.items(f, 'item', use_float=True))
+                    ]
+            
+            data = _json_loads(file_path.read_bytes())
             documents = []
             if isinstance(data, list):
-                for i, item in enumerate(data):
-                    if isinstance(item, dict):
-                        # 处理字典格式的数据
-                        content = json.dumps(item, ensure_ascii=False, indent=2)
-                        doc_id = self._generate_document_id(content, str(file_path))
-                        documents.append(RawDocument(
-                            id=f"{doc_id}_{i}",
-                            content=content,
-                            source=str(file_path),
-                            metadata={"type": "json_object", "index": i}
-                        ))
-                    else:
-                        # 处理其他类型的数据
-                        content = str(item)
-                        doc_id = self._generate_document_id(content, str(file_path))
-                        documents.append(RawDocument(
-                            id=f"{doc_id}_{i}",
-                            content=content,
-                            source=str(file_path),
-                            metadata={"type": "json_item", "index": i}
-                        ))
+                documents = [self._json_item_to_raw(item, i, source) for i, item in enumerate(data)]
             elif isinstance(data, dict):
                 # 处理单个字典
-                content = json.dumps(data, ensure_ascii=False, indent=2)
-                doc_id = self._generate_document_id(content, str(file_path))
+                content = _json_dumps(data).decode('utf-8')
+                doc_id = self._generate_document_id(content, source)
                 documents.append(RawDocument(
                     id=doc_id,
                     content=content,
-                    source=str(file_path),
+                    source=source,
                     metadata={"type": "json_dict"}
                 ))
             
@@ -124,16 +290,33 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
             print(f"加载JSON文件失败 {file_path}: {str(e)}")
             return []
     
+    def _read_text(self, file_path: Path, id_source: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        """按UTF-8读取文本文件（与文本模式一致统一换行符），大文件通过 mmap 读取
+
+        传入 id_source 时，若映射字节可直接作为哈希输入，则一并返回文档ID；否则ID为None。
+        """
+        if file_path.stat().st_size <= _MMAP_THRESHOLD:
+            return file_path.read_text(encoding='utf-8'), None
+        doc_id = None
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, 'utf-8')
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
+            elif id_source is not None:
+                # 映射字节与 content.encode() 一致，直接哈希，省去一次编码拷贝
+                doc_id = self._generate_document_id(mm, id_source)
+        return content, doc_id
+
     def _load_text_file(self, file_path: Path) -> List[RawDocument]:
         """加载文本文件"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content, doc_id = self._read_text(file_path, str(file_path))
             
-            if not content.strip():
+            if not content or content.isspace():
                 return []
             
-            doc_id = self._generate_document_id(content, str(file_path))
+            if doc_id is None:
+                doc_id = self._generate_document_id(content, str(file_path))
             return [RawDocument(
                 id=doc_id,
                 content=content,
@@ -145,41 +328,42 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
             print(f"加载文本文件失败 {file_path}: {str(e)}")
             return []
     
+    def _load_markdown_file(self, file_path: Path) -> List[RawDocument]:
+        """加载Markdown文件并按章节分割（整篇内容只读取一次，不为整篇文件生成ID）"""
+        try:
+            content, _ = self._read_text(file_path)
+        except Exception as e:
+            print(f"加载文本文件失败 {file_path}: {str(e)}")
+            return []
+        if not content or content.isspace():
+            return []
+        return self._split_markdown_sections(content, file_path)
+    
     def _split_markdown_sections(self, content: str, file_path: Path) -> List[RawDocument]:
         """将Markdown文件按章节分割"""
         documents = []
         sections = []
-        current_section = []
-        current_title = ""
-        
-        lines = content.split('\n')
-        for line in lines:
-            if line.startswith('#'):
-                # 保存前一个章节
-                if current_section:
-                    section_content = '\n'.join(current_section).strip()
-                    if section_content:
-                        sections.append((current_title, section_content))
-                
-                # 开始新章节
-                current_title = line.strip()
-                current_section = [line]
-            else:
-                current_section.append(line)
         
-        # 保存最后一个章节
-        if current_section:
-            section_content = '\n'.join(current_section).strip()
+        # 以标题行位置切分原文，标题前的内容作为无标题章节
+        starts = [0]
+        titles = [""]
+        for match in _MD_HEADING_RE.finditer(content):
+            starts.append(match.start())
+            titles.append(match.group().strip())
+        starts.append(len(content))
+        for i, title in enumerate(titles):
+            section_content = content[starts[i]:starts[i + 1]].strip()
             if section_content:
-                sections.append((current_title, section_content))
+                sections.append((title, section_content))
         
-        # 创建文档
+        # 创建文档（各章节共享同一个 source 字符串对象）
+        source = sys.intern(str(file_path))
         for i, (title, section_content) in enumerate(sections):
-            doc_id = self._generate_document_id(section_content, str(file_path))
+            doc_id = self._generate_document_id(section_content, source)
             documents.append(RawDocument(
                 id=f"{doc_id}_{i}",
                 content=section_content,
-                source=str(file_path),
+                source=source,
                 metadata={
                     "type": "markdown_section",
                     "title": title,
@@ -190,28 +374,34 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
         return documents
     
     def _load_pdf_file(self, file_path: Path) -> List[RawDocument]:
-        """加载PDF文件为文本"""
+        """加载PDF文件为文本，每页生成一个文档"""
         try:
             try:
-                from pdfminer.high_level import extract_text
-                content = extract_text(str(file_path))
+                from pdfminer.high_level import extract_pages
+                page_texts = [
+                    ''.join(element.get_text() for element in page_layout if hasattr(element, 'get_text'))
+                    for page_layout in extract_pages(str(file_path))
+                ]
             except Exception:
                 # 尝试使用 PyPDF2 作为备选
                 import PyPDF2
-                content = ""
                 with open(file_path, "rb") as f:
                     reader = PyPDF2.PdfReader(f)
-                    for page in reader.pages:
-                        content += page.extract_text() or ""
-            if not content.strip():
-                return []
-            doc_id = self._generate_document_id(content, str(file_path))
-            return [RawDocument(
-                id=doc_id,
-                content=content,
-                source=str(file_path),
-                metadata={"type": "pdf_file", "size": len(content)}
-            )]
+                    page_texts = [page.extract_text() or "" for page in reader.pages]
+            # 各页文档共享同一个 source 字符串对象
+            source = sys.intern(str(file_path))
+            documents = []
+            for i, content in enumerate(page_texts):
+                if not content or content.isspace():
+                    continue
+                doc_id = self._generate_document_id(content, source)
+                documents.append(RawDocument(
+                    id=f"{doc_id}_{i}",
+                    content=content,
+                    source=source,
+                    metadata={"type": "pdf_file", "page": i, "size": len(content)}
+                ))
+            return documents
         except Exception as e:
             print(f"加载PDF文件失败 {file_path}: {str(e)}")
             return []
@@ -221,9 +411,16 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
         try:
             import docx
             d = docx.Document(str(file_path))
-            paragraphs = [p.text for p in d.paragraphs if p.text]
-            content = "\n".join(paragraphs)
-            if not content.strip():
+            # 单次遍历写入缓冲区；paragraph.text 每次访问都会重新拼接 runs，只取一次
+            buf = io.StringIO()
+            for paragraph in d.paragraphs:
+                text = paragraph.text
+                if text:
+                    if buf.tell():
+                        buf.write("\n")
+                    buf.write(text)
+            content = buf.getvalue()
+            if not content or content.isspace():
                 return []
             doc_id = self._generate_document_id(content, str(file_path))
             return [RawDocument(
@@ -236,32 +433,72 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
             print(f"加载DOCX文件失败 {file_path}: {str(e)}")
             return []
     
-    async def _load_raw_documents(self, source_path: Optional[str] = None) -> List[RawDocument]:
-        """加载所有原始文档（可选按目录过滤）"""
+    @staticmethod
+    def _list_files(base: Path) -> List[Path]:
+        """递归列出目录下的所有文件（os.scandir 直接使用目录项类型信息，无需逐个 stat）"""
+        files: List[Path] = []
+        stack = [str(base)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        files.append(Path(entry.path))
+        return files
+
+    def _get_load_pool(self) -> ThreadPoolExecutor:
+        """获取文件IO线程池（首次使用时创建）"""
+        if self._load_pool is None:
+            self._load_pool = ThreadPoolExecutor(
+                max_workers=_LOAD_WORKERS, thread_name_prefix="local-storage-load"
+            )
+            # 未显式 close() 时，随 provider 被回收一并关闭线程池
+            weakref.finalize(self, self._load_pool.shutdown, wait=False)
+        return self._load_pool
+
+    def close(self) -> None:
+        """关闭文件IO线程池与 SQLite 连接（之后不应再使用该 provider）"""
+        if self._load_pool is not None:
+            self._load_pool.shutdown(wait=True)
+            self._load_pool = None
+        self._flush_id_map()
+        with self._id_map_lock:
+            self._id_map_db.close()
+        with self._fts_lock:
+            self._fts.close()
+
+    def _load_file(self, file_path: Path) -> List[RawDocument]:
+        """按后缀加载单个文件，不支持的类型返回空列表"""
+        loader = self._loaders.get(os.path.splitext(file_path.name)[1].lower())
+        return loader(file_path) if loader else []
+
+    async def _iter_raw_documents(self, source_path: Optional[str] = None) -> AsyncIterator[RawDocument]:
+        """逐文件产出原始文档（可选按目录过滤）"""
         if self.logger:
             self.logger.info(f"LocalStorage: loading documents from {source_path or str(self.data_path)}")
-        documents: List[RawDocument] = []
         base = self.data_path if not source_path else Path(source_path)
-        for file_path in base.rglob('*'):
-            if file_path.is_file():
-                suffix = file_path.suffix.lower()
-                if suffix in ['.json']:
-                    documents.extend(self._load_json_file(file_path))
-                elif suffix in ['.md', '.markdown']:
-                    # Markdown文件按章节分割
-                    text_docs = self._load_text_file(file_path)
-                    for doc in text_docs:
-                        sections = self._split_markdown_sections(doc.content, file_path)
-                        documents.extend(sections)
-                elif suffix in ['.txt', '.text']:
-                    documents.extend(self._load_text_file(file_path))
-                elif suffix in ['.pdf']:
-                    documents.extend(self._load_pdf_file(file_path))
-                elif suffix in ['.docx']:
-                    documents.extend(self._load_docx_file(file_path))
+        # 目录遍历与 stat 属于阻塞 IO，放到线程中执行，避免阻塞事件循环
+        file_paths = await asyncio.to_thread(self._list_files, base)
+        pool = self._get_load_pool()
+        # 多个文件在线程池中并发读取/解析，按原顺序产出；在途任务数有上限，保持流式内存占用
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        paths = iter(file_paths)
+        count = 0
+        while True:
+            while len(pending) < _LOAD_WORKERS * 2:
+                file_path = next(paths, None)
+                if file_path is None:
+                    break
+                pending.append(loop.run_in_executor(pool, self._load_file, file_path))
+            if not pending:
+                break
+            for doc in await pending.popleft():
+                count += 1
+                yield doc
         if self.logger:
-            self.logger.info(f"LocalStorage: loaded {len(documents)} documents")
-        return documents
+            self.logger.info(f"LocalStorage: loaded {count} documents")
     
     async def _save_raw_document(self, document: RawDocument) -> bool:
         """保存原始文档到本地文件。
@@ -288,13 +525,14 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
                         data = base64.b64decode(binary_b64)
                     except Exception:
                         data = b""
-                    with open(dst_path, 'wb') as f:
-                        f.write(data)
+                    dst_path.write_bytes(data)
+                elif isinstance(document.content, (bytes, memoryview)):
+                    dst_path.write_bytes(document.content)
                 else:
-                    with open(dst_path, 'w', encoding='utf-8') as f:
-                        f.write(document.content)
+                    dst_path.write_text(document.content, encoding='utf-8')
                 # 更新映射
                 self._set_mapped_path(document.id, dst_path)
+                await asyncio.to_thread(self._fts_index_file, dst_path, not self._in_bulk())
                 return True
 
             # 默认行为：写入为 {id}.txt
@@ -309,14 +547,15 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
                     data = base64.b64decode(binary_b64)
                 except Exception:
                     data = b""
-                with open(file_path, 'wb') as f:
-                    f.write(data)
+                file_path.write_bytes(data)
+            elif isinstance(document.content, (bytes, memoryview)):
+                file_path.write_bytes(document.content)
             else:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(document.content)
-            # 更新 id_map.json：记录 doc.id -> {id}.txt 路径
+                file_path.write_text(document.content, encoding='utf-8')
+            # 更新 id_map：记录 doc.id -> {id}.txt 路径
             # 更新映射
             self._set_mapped_path(document.id, file_path)
+            await asyncio.to_thread(self._fts_index_file, file_path, not self._in_bulk())
             return True
         except Exception as e:
             if self.logger:
@@ -326,7 +565,7 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
             return False
     
     async def _get_raw_document(self, document_id: str) -> Optional[RawDocument]:
-        """读取原始文档：优先从 id_map.json 解析路径，其次回退到 {id}.txt。"""
+        """读取原始文档：优先从 id_map 解析路径，其次回退到 {id}.txt。"""
         if self.logger:
             self.logger.info(f"LocalStorage: get document {document_id}")
         try:
@@ -340,14 +579,16 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
                 return None
             # 3) 按后缀决定读取方式（文本/二进制）
             suffix = file_path.suffix.lower()
-            if suffix in ['.txt', '.text', '.md', '.markdown']:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
+            if suffix in _TEXT_SUFFIXES:
+                content = file_path.read_text(encoding='utf-8', errors='ignore')
+            elif file_path.stat().st_size > _MMAP_THRESHOLD:
+                # 大型二进制文件：在映射的生命周期内直接解码为文本（与 RawDocument.text() 一致），
+                # 省去一份整文件的字节拷贝，且映射随 with 块关闭
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, 'utf-8', 'ignore')
             else:
-                # 对于二进制类型，读取为字节并宽容解码
-                with open(file_path, 'rb') as f:
-                    content_bytes = f.read()
-                content = content_bytes.decode('utf-8', errors='ignore')
+                # 对于二进制类型，保留原始字节，由 RawDocument.text() 按需宽容解码
+                content = file_path.read_bytes()
             return RawDocument(id=document_id, content=content, source=str(file_path), metadata={})
         except Exception as e:
             if self.logger:
@@ -375,6 +616,7 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
             # 删除成功后移除映射项
             if success:
                 self._remove_mapped_path(document_id)
+                await asyncio.to_thread(self._fts_remove, target_path, not self._in_bulk())
             return success
         except Exception as e:
             if self.logger:
@@ -383,78 +625,226 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
                 print(f"删除文档失败: {str(e)}")
             return False
     
+    def _list_raw_columns(
+        self, category: Optional[str] = None, with_sizes: bool = True
+    ) -> Tuple[List[str], List[str], array]:
+        """以结构数组形式列出映射中的文档：ids/filenames/sizes 按下标一一对应
+
+        sizes 为连续的 int64 数组；with_sizes=False 时不访问文件系统，sizes 为空。
+        """
+        ids: List[str] = []
+        filenames: List[str] = []
+        paths: List[str] = []
+        # 一次取全部行，不在工作线程中长时间持有游标与锁
+        with self._id_map_lock:
+            rows = self._id_map_db.execute("SELECT doc_id, path, filename FROM id_map").fetchall()
+        for doc_id, source, filename in rows:
+            if category and (category not in source):
+                continue
+            ids.append(doc_id)
+            filenames.append(filename)
+            paths.append(source)
+        sizes = array('q')
+        if with_sizes and paths:
+            # stat 期间释放GIL，并发执行可重叠网络文件系统/冷缓存下的往返延迟
+            sizes.extend(self._get_load_pool().map(self._file_size, paths))
+        return ids, filenames, sizes
+
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
     async def _list_raw_documents(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
-        """从 id_map.json 读取文档信息字典（id/source/metadata）。
-        当映射文件不存在或不可读时，返回空列表并记录日志。
+        """从 id_map 读取文档信息字典（id/source/metadata）。
+        当映射不可读时，返回空列表并记录日志。
         """
         if self.logger:
-            self.logger.info(f"LocalStorage: listing documents from id_map.json category={category}")
-        infos: List[Dict[str, Any]] = []
+            self.logger.info(f"LocalStorage: listing documents from id_map category={category}")
         try:
-            if not self.id_map_path.exists():
-                if self.logger:
-                    self.logger.warning(f"LocalStorage: id_map.json not found at {self.id_map_path}")
-                return []
-            with open(self.id_map_path, 'r', encoding='utf-8') as f:
-                id_map = json.load(f)
-            if not isinstance(id_map, dict):
-                if self.logger:
-                    self.logger.warning("LocalStorage: id_map.json content is not a dict")
-                return []
-            for doc_id, entry in id_map.items():
-                # 兼容旧结构
-                if isinstance(entry, str):
-                    source = entry
-                    filename = Path(entry).name
-                elif isinstance(entry, dict):
-                    source = entry.get('path') or ''
-                    filename = entry.get('filename') or (Path(source).name if source else '')
-                else:
-                    continue
-                if not isinstance(source, str):
-                    continue
-                if category and (category not in source):
-                    continue
-                file_path = Path(source)
-                try:
-                    size = file_path.stat().st_size if file_path.exists() else 0
-                except Exception:
-                    size = 0
-                infos.append({
-                    "id": doc_id,
-                    "filename": filename,
-                    "metadata": {"size": size}
-                })
+            # 映射查询与逐个 stat 都是阻塞操作，整体放到线程中执行，不阻塞事件循环
+            ids, filenames, sizes = await asyncio.to_thread(self._list_raw_columns, category)
         except Exception as e:
             if self.logger:
-                self.logger.error(f"LocalStorage: failed to list from id_map.json: {e}")
+                self.logger.error(f"LocalStorage: failed to list from id_map: {e}")
             else:
                 print(f"列出文档失败: {str(e)}")
             return []
         if self.logger:
-            self.logger.info(f"LocalStorage: listed {len(infos)} items from id_map.json")
-        return infos
+            self.logger.info(f"LocalStorage: listed {len(ids)} items from id_map")
+        # 对外接口仍为字典列表，仅在此处按需组装
+        return [
+            {"id": doc_id, "filename": filename, "metadata": {"size": size}}
+            for doc_id, filename, size in zip(ids, filenames, sizes)
+        ]
     
+    # --- 全文检索索引工具方法 ---
+    def _fts_row(self, document: RawDocument, source: str) -> tuple:
+        # 二进制原文（_binary_base64 等）不进入索引
+        metadata = {k: v for k, v in (document.metadata or {}).items() if not k.startswith('_')}
+        try:
+            metadata_json = _json_dumps(metadata).decode('utf-8')
+        except Exception:
+            metadata_json = '{}'
+        return (document.id, source, metadata_json, document.text())
+
+    @contextmanager
+    def _fts_write(self, commit: bool = True):
+        """持有索引库锁执行写操作；commit=False（bulk_save 中）时推迟到批量结束时统一提交"""
+        with self._fts_lock:
+            if not commit:
+                yield
+                return
+            with self._fts:
+                yield
+
+    def _fts_index_file(self, path: Path, commit: bool = True) -> None:
+        """解析文件并替换其全部索引项（在工作线程中执行）"""
+        source = str(path)
+        try:
+            st = path.stat()
+            rows = [self._fts_row(doc, source) for doc in self._load_file(path)]
+            with self._fts_write(commit):
+                self._fts.execute("DELETE FROM docs WHERE source = ?", (source,))
+                self._fts.executemany("INSERT INTO docs VALUES (?, ?, ?, ?)", rows)
+                self._fts.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (source, st.st_mtime_ns, st.st_size)
+                )
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"LocalStorage: fts index failed {path}: {e}")
+
+    def _fts_remove(self, path: Path, commit: bool = True) -> None:
+        """移除文件的全部索引项"""
+        source = str(path)
+        try:
+            with self._fts_write(commit):
+                self._fts.execute("DELETE FROM docs WHERE source = ?", (source,))
+                self._fts.execute("DELETE FROM files WHERE source = ?", (source,))
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"LocalStorage: fts remove failed {path}: {e}")
+
+    def _scan_indexable_files(self) -> Dict[str, Tuple[int, int]]:
+        """列出数据目录中可解析的文件及其 (修改时间, 大小)"""
+        state: Dict[str, Tuple[int, int]] = {}
+        for path in self._list_files(self.data_path):
+            if os.path.splitext(path.name)[1].lower() not in self._loaders:
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            state[str(path)] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def _sync_fts(self) -> None:
+        """按 (路径, 修改时间, 大小) 将全文索引与数据目录中的文件对齐（在工作线程中执行）
+
+        新增或变化的文件重新解析并替换其索引项，已不存在的文件移除索引项；
+        用于启动后首次检索前以及 reindex()，使绕过 save_document 直接增删改的文件也能被检索到。
+        """
+        with self._fts_lock:
+            if self._fts.execute("PRAGMA user_version").fetchone()[0] < _FTS_SCHEMA_VERSION:
+                # 旧版索引没有文件状态记录，无法增量对齐，清空后整体重建
+                with self._fts:
+                    self._fts.execute("DELETE FROM docs")
+                    self._fts.execute("DELETE FROM files")
+                    self._fts.execute(f"PRAGMA user_version = {_FTS_SCHEMA_VERSION}")
+            indexed = {
+                source: (mtime_ns, size)
+                for source, mtime_ns, size in self._fts.execute("SELECT source, mtime_ns, size FROM files")
+            }
+        current = self._scan_indexable_files()
+        removed = [source for source in indexed if source not in current]
+        changed = [source for source, state in current.items() if indexed.get(source) != state]
+        if not removed and not changed:
+            return
+        # 解析在锁外并发进行，不阻塞保存/删除对索引库的访问
+        parsed = self._get_load_pool().map(lambda source: self._load_file(Path(source)), changed)
+        rows = []
+        for source, docs in zip(changed, parsed):
+            rows.extend(self._fts_row(doc, source) for doc in docs)
+        with self._fts_lock, self._fts:
+            for source in removed + changed:
+                self._fts.execute("DELETE FROM docs WHERE source = ?", (source,))
+            self._fts.executemany("DELETE FROM files WHERE source = ?", [(source,) for source in removed])
+            self._fts.executemany("INSERT INTO docs VALUES (?, ?, ?, ?)", rows)
+            self._fts.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                [(source, *current[source]) for source in changed],
+            )
+        if self.logger:
+            self.logger.info(
+                f"LocalStorage: fts synced, {len(changed)} files reindexed, {len(removed)} removed"
+            )
+
+    async def _ensure_fts_ready(self) -> None:
+        """启动后首次检索前将全文索引与数据目录对齐一次，之后由保存/删除维护索引"""
+        if self._fts_synced:
+            return
+        async with self._fts_sync_lock:
+            if not self._fts_synced:
+                await asyncio.to_thread(self._sync_fts)
+                self._fts_synced = True
+
+    async def reindex(self) -> None:
+        """将全文索引与数据目录重新对齐
+
+        绕过 save_document / delete_document 直接修改数据目录中的文件后调用。
+        """
+        async with self._fts_sync_lock:
+            await asyncio.to_thread(self._sync_fts)
+            self._fts_synced = True
+
+    def _fts_search(self, query: str, category: Optional[str], limit: int) -> List[Document]:
+        """在全文索引中检索（在工作线程中执行）"""
+        if len(query) >= 3:
+            # trigram 分词下的短语匹配即大小写不敏感的子串匹配
+            sql = "SELECT doc_id, source, metadata, content FROM docs WHERE docs MATCH ?"
+            params = ('"' + query.replace('"', '""') + '"',)
+        else:
+            # 不足三个字符无法使用 trigram 索引，退化为 LIKE 扫描
+            pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            sql = "SELECT doc_id, source, metadata, content FROM docs WHERE content LIKE ? ESCAPE '\\'"
+            params = (pattern,)
+        results: List[Document] = []
+        now = datetime.now()
+        with self._fts_lock:
+            for doc_id, source, metadata_json, content in self._fts.execute(sql, params):
+                metadata = _json_loads(metadata_json.encode('utf-8'))
+                if category:
+                    if (metadata.get("category") != category) and (not (source or "").startswith(category)):
+                        continue
+                results.append(Document(
+                    content=content,
+                    metadata=metadata,
+                    doc_id=doc_id,
+                    source_path=source,
+                    created_at=now
+                ))
+                if len(results) >= limit:
+                    break
+        return results
+
     def get_supported_formats(self) -> List[str]:
         """同步返回支持格式，保持与接口一致"""
         return ['.txt', '.text', '.md', '.markdown', '.pdf', '.docx']
     
-    def _raw_to_domain_document(self, raw_doc: RawDocument) -> Document:
+    def _raw_to_domain_document(self, raw_doc: RawDocument, now: Optional[datetime] = None) -> Document:
         """将RawDocument转换为Domain层Document"""
         return Document(
-            content=raw_doc.content,
+            content=raw_doc.text(),
             metadata=raw_doc.metadata or {},
             doc_id=raw_doc.id,
             source_path=raw_doc.source,
-            created_at=datetime.now()
+            created_at=now or datetime.now()
         )
     
     def _domain_to_raw_document(self, doc: Document) -> RawDocument:
         """将Domain层Document转换为RawDocument"""
-        try:
-            print(f"LocalProvider: _domain_to_raw_document doc_id={doc.doc_id}")
-        except Exception:
-            pass
         return RawDocument(
             id=doc.doc_id or self._generate_document_id(doc.content, doc.source_path or ""),
             content=doc.content,
@@ -467,7 +857,9 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
     # =====================
     async def load_documents(self, source_path: Optional[str] = None) -> List[Document]:
         raw_docs = await self._load_raw_documents(source_path=source_path)
-        return [self._raw_to_domain_document(d) for d in raw_docs]
+        # 同一批加载的文档共用一个创建时间
+        now = datetime.now()
+        return [self._raw_to_domain_document(d, now) for d in raw_docs]
 
     async def save_document(self, document: Document) -> tuple[bool, str]:
         raw_doc = self._domain_to_raw_document(document)
@@ -487,28 +879,21 @@ class LocalDocumentStorageProvider(DocumentStorageProvider):
         return await self._delete_raw_document(document_id)
 
     async def search_documents(self, query: str, category: Optional[str] = None, limit: int = 10) -> List[Document]:
-        all_docs = await self.load_documents()
-        results: List[Document] = []
-        for doc in all_docs:
-            if query.lower() in (doc.content or "").lower():
-                if category:
-                    if (doc.metadata.get("category") != category) and (not (doc.source_path or "").startswith(category)):
-                        continue
-                results.append(doc)
-                if len(results) >= limit:
-                    break
-        return results
+        await self._ensure_fts_ready()
+        return await asyncio.to_thread(self._fts_search, query, category, limit)
 
     async def get_document_count(self, category: Optional[str] = None) -> int:
-        infos = await self._list_raw_documents(category=category)
-        return len(infos)
+        # 计数只需要ID列，不组装字典也不读取文件大小
+        ids, _, _ = await asyncio.to_thread(self._list_raw_columns, category, False)
+        return len(ids)
 
     async def update_document(self, document: Document) -> bool:
         raw_doc = self._domain_to_raw_document(document)
         return await self._save_raw_document(raw_doc)
 
     async def validate_document(self, document: Document) -> bool:
-        if not (document.content or "").strip():
+        # isspace 遇到首个非空白字符即返回，不像 strip 那样复制整段内容
+        if not document.content or document.content.isspace():
             return False
         if not document.doc_id:
             return False
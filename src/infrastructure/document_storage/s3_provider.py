@@ -1,16 +1,96 @@
 import asyncio
-import hashlib
-from typing import List, Dict, Any, Optional
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple, Union
+from io import BytesIO
 from urllib.parse import urljoin
 
 import boto3
 from botocore.client import Config
+from botocore.exceptions import ClientError
 
 from .base import DocumentStorageProvider, RawDocument
 from ...infrastructure.log.logger_service import LoggerService
 from ...domain.entities.document import Document
 from datetime import datetime
 
+try:
+    import PyPDF2 as _PyPDF2
+except ImportError:
+    _PyPDF2 = None
+
+try:
+    import docx as _docx
+except ImportError:
+    _docx = None
+
+try:
+    # ISA-L 实现的 gzip 压缩/解压速度约为标准库 zlib 的 2-3 倍
+    from isal import igzip as _gzip
+except ImportError:
+    import gzip as _gzip
+
+# 并发 S3 请求上限（线程池大小与 HTTP 连接池大小保持一致）
+_S3_MAX_CONCURRENCY = 64
+# 单次 delete_objects 请求的键数（S3 上限为 1000）
+_S3_DELETE_BATCH = 500
+# 解析结果缓存条目上限（仅缓存 PDF/DOCX 解析出的文本）
+_PARSE_CACHE_SIZE = 256
+# 文本对象超过该大小时以 gzip 压缩后上传
+_GZIP_MIN_SIZE = 1024
+
+
+def _parse_pdf(body_bytes: bytes) -> str:
+    """提取 PDF 文本；解析库缺失或解析失败时按 UTF-8 解码原始字节"""
+    try:
+        # BytesIO 直接共享 bytes 缓冲区（不复制）；显式关闭以便解析完成后立即释放，
+        # 而不是等待 reader 的循环引用被 GC 回收
+        with BytesIO(body_bytes) as stream:
+            reader = _PyPDF2.PdfReader(stream)
+            return "".join([page.extract_text() or "" for page in reader.pages])
+    except Exception:
+        return body_bytes.decode("utf-8", errors="ignore")
+
+
+def _parse_docx(body_bytes: bytes) -> str:
+    """提取 DOCX 段落文本；解析库缺失或解析失败时按 UTF-8 解码原始字节"""
+    try:
+        with BytesIO(body_bytes) as stream:
+            d = _docx.Document(stream)
+            # paragraph.text 每次访问都会重新拼接 runs，只取一次
+            return "\n".join([t for t in (p.text for p in d.paragraphs) if t])
+    except Exception:
+        return body_bytes.decode("utf-8", errors="ignore")
+
+
+# 搜索时逐段转小写的窗口长度（字符数）
+_SEARCH_WINDOW = 1 << 16
+
+
+def _contains_lower(text: str, needle: str) -> bool:
+    """判断 text 转小写后是否包含 needle（needle 须已转小写）
+
+    按固定窗口逐段转小写并查找，相邻窗口重叠 len(needle)-1 个字符，不会漏掉跨窗口的匹配；
+    避免为整篇文档再分配一份小写副本，命中后也不再处理剩余内容。
+    """
+    if len(text) <= _SEARCH_WINDOW or len(needle) >= _SEARCH_WINDOW:
+        return needle in text.lower()
+    step = _SEARCH_WINDOW - len(needle) + 1
+    for start in range(0, len(text), step):
+        if needle in text[start:start + _SEARCH_WINDOW].lower():
+            return True
+    return False
+
+
+# 需要解析的后缀 -> (解析函数, 文档类型)
+_PARSERS = {
+    ".pdf": (_parse_pdf, "pdf_file"),
+    ".docx": (_parse_docx, "docx_file"),
+}
+
+
 class S3DocumentStorageProvider(DocumentStorageProvider):
     """S3 文档存储实现（兼容 MinIO / S3 协议）"""
 
@@ -27,6 +107,8 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
     ):
         self.bucket = bucket_name
         self.prefix = base_prefix.strip("/") if base_prefix else ""
+        # 对象键前缀（含分隔符），_full_key 只需一次字符串拼接
+        self._key_prefix = f"{self.prefix}/" if self.prefix else ""
         self.logger = logger
         self.client = boto3.client(
             "s3",
@@ -34,107 +116,175 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_key,
             region_name=region_name,
-            config=Config(s3={"addressing_style": "virtual"}, signature_version="s3v4"),
+            config=Config(
+                s3={"addressing_style": "virtual"},
+                signature_version="s3v4",
+                max_pool_connections=_S3_MAX_CONCURRENCY,
+            ),
             use_ssl=use_ssl,
         )
+        # S3 请求线程池（boto3 client 线程安全，可在线程间共享），首次使用时创建
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        # PDF/DOCX 解析结果 LRU 缓存：key -> (ETag, content, doc_type, metadata)
+        self._parse_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=_S3_MAX_CONCURRENCY, thread_name_prefix="s3-storage-io"
+            )
+        return self._io_pool
 
     def _full_key(self, key: str) -> str:
-        if not self.prefix:
-            return key
-        return f"{self.prefix}/{key}".lstrip("/")
+        return self._key_prefix + key
+
+    @staticmethod
+    def _decode_body(key: str, body_bytes: bytes) -> Tuple[Union[str, bytes], str]:
+        """按后缀解析对象内容，返回 (content, doc_type)"""
+        parser = _PARSERS.get(os.path.splitext(key.lower())[1])
+        if parser is None:
+            # 文本对象保留原始字节，由 RawDocument.text() 按需解码
+            return body_bytes, "text_file"
+        parse, doc_type = parser
+        return parse(body_bytes), doc_type
 
-    async def _list_objects(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+    def _fetch_object(self, key: str):
+        """同步拉取并解析对象，返回 (content, doc_type, metadata)
+
+        PDF/DOCX 的解析结果按 ETag 缓存：命中缓存时以 IfNoneMatch 条件 GET，
+        对象未变化时 S3 返回 304，既不传输正文也不重新解析。
+        """
+        cacheable = os.path.splitext(key.lower())[1] in _PARSERS
+        cached = None
+        if cacheable:
+            with self._parse_cache_lock:
+                cached = self._parse_cache.get(key)
+        try:
+            if cached:
+                resp = self.client.get_object(Bucket=self.bucket, Key=key, IfNoneMatch=cached[0])
+            else:
+                resp = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if cached and e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                with self._parse_cache_lock:
+                    self._parse_cache.move_to_end(key)
+                return cached[1], cached[2], dict(cached[3])
+            raise
+        body_bytes = resp["Body"].read()
+        if resp.get("ContentEncoding") == "gzip":
+            body_bytes = _gzip.decompress(body_bytes)
+        meta = resp.get("Metadata", {}) or {}
+        content, doc_type = self._decode_body(key, body_bytes)
+        if cacheable and resp.get("ETag"):
+            with self._parse_cache_lock:
+                self._parse_cache[key] = (resp["ETag"], content, doc_type, dict(meta))
+                self._parse_cache.move_to_end(key)
+                while len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                    self._parse_cache.popitem(last=False)
+        return content, doc_type, meta
+
+    async def _list_objects(self, prefix: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """逐页列举对象并依次产出（内存占用与单页大小成正比，而非与桶内对象总数成正比）"""
         if self.logger:
             self.logger.info(f"S3Storage: list objects prefix={prefix or self.prefix}")
-        def _sync_list():
-            pfx = self._full_key(prefix) if prefix else self.prefix or ""
-            paginator = self.client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=self.bucket, Prefix=pfx)
-            items: List[Dict[str, Any]] = []
-            for page in pages:
-                for obj in page.get("Contents", []):
-                    items.append(obj)
-            return items
-        return await asyncio.to_thread(_sync_list)
-
-    async def _load_raw_documents(self, source_path: Optional[str] = None) -> List[RawDocument]:
-        """拉取对象并读取内容（注意：大规模对象可能较慢）"""
+        pfx = self._full_key(prefix) if prefix else self.prefix or ""
+        paginator = self.client.get_paginator("list_objects_v2")
+        pages = iter(paginator.paginate(
+            Bucket=self.bucket, Prefix=pfx, PaginationConfig={"PageSize": 1000}
+        ))
+        loop = asyncio.get_running_loop()
+        pool = self._get_io_pool()
+        while True:
+            # 每页的 list 请求在线程池中执行
+            page = await loop.run_in_executor(pool, next, pages, None)
+            if page is None:
+                break
+            for obj in page.get("Contents", []):
+                yield obj
+
+    async def _iter_raw_documents(
+        self, source_path: Optional[str] = None, exclude_prefix: Optional[str] = None
+    ) -> AsyncIterator[RawDocument]:
+        """并发拉取对象并按列举顺序产出内容（在途请求数不超过 _S3_MAX_CONCURRENCY）
+
+        exclude_prefix 下的对象在列举阶段跳过，不发起 GET。
+        """
         if self.logger:
             self.logger.info(f"S3Storage: loading documents from prefix={source_path or self.prefix}")
-        objects = await self._list_objects(prefix=source_path)
-        docs: List[RawDocument] = []
+        objects = self._list_objects(prefix=source_path)
+        excluded = self._full_key(exclude_prefix) if exclude_prefix else None
+        count = 0
 
         async def _get_one(key: str) -> Optional[RawDocument]:
             def _sync_get():
-                resp = self.client.get_object(Bucket=self.bucket, Key=key)
-                body_bytes = resp["Body"].read()
-                meta = resp.get("Metadata", {}) or {}
-                # 按后缀解析
-                lower_key = key.lower()
-                content = ""
-                if lower_key.endswith(".pdf"):
-                    try:
-                        from pdfminer.high_level import extract_text
-                        # pdfminer 不直接支持 bytes 流路径，先写到临时内存方案不直观；退回 PyPDF2
-                        import PyPDF2
-                        from io import BytesIO
-                        reader = PyPDF2.PdfReader(BytesIO(body_bytes))
-                        for page in reader.pages:
-                            content += page.extract_text() or ""
-                    except Exception:
-                        content = body_bytes.decode("utf-8", errors="ignore")
-                    doc_type = "pdf_file"
-                elif lower_key.endswith(".docx"):
-                    try:
-                        import docx
-                        from io import BytesIO
-                        d = docx.Document(BytesIO(body_bytes))
-                        paragraphs = [p.text for p in d.paragraphs if p.text]
-                        content = "\n".join(paragraphs)
-                    except Exception:
-                        content = body_bytes.decode("utf-8", errors="ignore")
-                    doc_type = "docx_file"
-                else:
-                    content = body_bytes.decode("utf-8", errors="ignore")
-                    doc_type = "text_file"
-
+                content, doc_type, meta = self._fetch_object(key)
                 return RawDocument(
                     id=key.split("/")[-1],
                     content=content,
                     source=f"s3://{self.bucket}/{key}",
                     metadata={"type": doc_type, **meta},
                 )
-            return await asyncio.to_thread(_sync_get)
-
-        for obj in objects:
-            key = obj["Key"]
             try:
-                rd = await _get_one(key)
-                if rd:
-                    docs.append(rd)
+                return await loop.run_in_executor(pool, _sync_get)
             except Exception as e:
                 if self.logger:
                     self.logger.error(f"S3Storage: load failed key={key}: {e}")
-                continue
+                return None
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_io_pool()
+        pending = deque()
+        listing = True
+        try:
+            while True:
+                while listing and len(pending) < _S3_MAX_CONCURRENCY:
+                    obj = await anext(objects, None)
+                    if obj is None:
+                        listing = False
+                        break
+                    if excluded is not None and obj["Key"].startswith(excluded):
+                        continue
+                    pending.append(asyncio.ensure_future(_get_one(obj["Key"])))
+                if not pending:
+                    break
+                rd = await pending.popleft()
+                if rd:
+                    count += 1
+                    yield rd
+        finally:
+            # 调用方提前结束迭代时取消尚未完成的请求
+            for task in pending:
+                task.cancel()
+            await objects.aclose()
         if self.logger:
-            self.logger.info(f"S3Storage: loaded {len(docs)} documents")
-        return docs
+            self.logger.info(f"S3Storage: loaded {count} documents")
 
     async def _save_raw_document(self, document: RawDocument) -> bool:
         key = self._full_key(document.id)
         if self.logger:
             self.logger.info(f"S3Storage: saving document {document.id} to key={key}")
         def _sync_put():
+            if isinstance(document.content, (bytes, memoryview)):
+                body = bytes(document.content)
+            else:
+                body = (document.content or "").encode("utf-8")
+            extra: Dict[str, Any] = {}
+            # 文本对象压缩存储；PDF/DOCX 本身已是压缩格式，原样上传
+            if len(body) >= _GZIP_MIN_SIZE and os.path.splitext(key.lower())[1] not in _PARSERS:
+                body = _gzip.compress(body)
+                extra["ContentEncoding"] = "gzip"
             self.client.put_object(
                 Bucket=self.bucket,
                 Key=key,
-                Body=(document.content or "").encode("utf-8"),
+                Body=body,
                 Metadata=document.metadata or {},
                 ContentType="text/plain; charset=utf-8",
+                **extra,
             )
             return True
         try:
-            return await asyncio.to_thread(_sync_put)
+            return await asyncio.get_running_loop().run_in_executor(self._get_io_pool(), _sync_put)
         except Exception as e:
             if self.logger:
                 self.logger.error(f"S3Storage: save failed {document.id}: {e}")
@@ -145,31 +295,7 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
         if self.logger:
             self.logger.info(f"S3Storage: get document {document_id} from key={key}")
         def _sync_get():
-            resp = self.client.get_object(Bucket=self.bucket, Key=key)
-            body_bytes = resp["Body"].read()
-            meta = resp.get("Metadata", {}) or {}
-            lower_key = key.lower()
-            content = ""
-            if lower_key.endswith(".pdf"):
-                try:
-                    import PyPDF2
-                    from io import BytesIO
-                    reader = PyPDF2.PdfReader(BytesIO(body_bytes))
-                    for page in reader.pages:
-                        content += page.extract_text() or ""
-                except Exception:
-                    content = body_bytes.decode("utf-8", errors="ignore")
-            elif lower_key.endswith(".docx"):
-                try:
-                    import docx
-                    from io import BytesIO
-                    d = docx.Document(BytesIO(body_bytes))
-                    paragraphs = [p.text for p in d.paragraphs if p.text]
-                    content = "\n".join(paragraphs)
-                except Exception:
-                    content = body_bytes.decode("utf-8", errors="ignore")
-            else:
-                content = body_bytes.decode("utf-8", errors="ignore")
+            content, _, meta = self._fetch_object(key)
             return RawDocument(
                 id=document_id,
                 content=content,
@@ -177,49 +303,103 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
                 metadata=meta,
             )
         try:
-            return await asyncio.to_thread(_sync_get)
+            return await asyncio.get_running_loop().run_in_executor(self._get_io_pool(), _sync_get)
         except Exception as e:
             if self.logger:
                 self.logger.error(f"S3Storage: get failed {document_id}: {e}")
             return None
 
     async def _delete_raw_document(self, document_id: str) -> bool:
-        key = self._full_key(document_id)
+        return await self._delete_raw_documents([document_id]) == 1
+
+    async def _delete_raw_documents(self, document_ids: List[str]) -> int:
+        """批量删除对象：每 _S3_DELETE_BATCH 个键一次 delete_objects 请求，返回成功删除数量"""
+        if not document_ids:
+            return 0
         if self.logger:
-            self.logger.info(f"S3Storage: delete document {document_id} key={key}")
-        def _sync_del():
-            self.client.delete_object(Bucket=self.bucket, Key=key)
-            return True
-        try:
-            return await asyncio.to_thread(_sync_del)
-        except Exception as e:
-            if self.logger:
-                self.logger.error(f"S3Storage: delete failed {document_id}: {e}")
-            return False
+            self.logger.info(f"S3Storage: delete {len(document_ids)} documents")
+
+        key_prefix = self._key_prefix
+
+        def _sync_del(batch: List[str]) -> int:
+            try:
+                resp = self.client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={
+                        "Objects": [{"Key": key_prefix + i} for i in batch],
+                        "Quiet": True,
+                    },
+                )
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"S3Storage: delete failed {batch[0]}..({len(batch)}): {e}")
+                return 0
+            # Quiet 模式下仅返回失败项
+            errors = resp.get("Errors") or []
+            if errors and self.logger:
+                for err in errors:
+                    self.logger.error(
+                        f"S3Storage: delete failed {err.get('Key')}: {err.get('Code')} {err.get('Message')}"
+                    )
+            return len(batch) - len(errors)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_io_pool()
+        counts = await asyncio.gather(*[
+            loop.run_in_executor(pool, _sync_del, document_ids[i:i + _S3_DELETE_BATCH])
+            for i in range(0, len(document_ids), _S3_DELETE_BATCH)
+        ])
+        return sum(counts)
+
+    async def _list_raw_documents(
+        self, category: Optional[str] = None, with_metadata: bool = False
+    ) -> List[Dict[str, Any]]:
+        """列出对象（返回 id/source/metadata）
 
-    async def _list_raw_documents(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
-        """列出对象（返回 id/source/metadata）"""
+        默认只使用 list_objects_v2 已返回的字段（size/etag/last_modified），
+        不产生额外请求；with_metadata=True 时才逐个 HEAD 获取用户元数据。
+        """
         prefix = category if category else None
         if self.logger:
             self.logger.info(f"S3Storage: listing documents prefix={prefix or self.prefix}")
-        objects = await self._list_objects(prefix=prefix)
-        infos: List[Dict[str, Any]] = []
+        objects = [obj async for obj in self._list_objects(prefix=prefix)]
+
+        # 逐键调用的方法与参数预先绑定为局部变量
+        head_object = self.client.head_object
+        bucket = self.bucket
 
         def _sync_head(key: str) -> Dict[str, Any]:
             try:
-                head = self.client.head_object(Bucket=self.bucket, Key=key)
+                head = head_object(Bucket=bucket, Key=key)
                 meta = head.get("Metadata", {}) or {}
             except Exception:
                 meta = {}
             return meta
 
-        for obj in objects:
+        if with_metadata:
+            # 在途 HEAD 请求数由线程池大小限制
+            loop = asyncio.get_running_loop()
+            pool = self._get_io_pool()
+            metas = await asyncio.gather(
+                *(loop.run_in_executor(pool, _sync_head, obj["Key"]) for obj in objects)
+            )
+        else:
+            metas = [
+                {
+                    "size": obj.get("Size", 0),
+                    "etag": obj.get("ETag", ""),
+                    "last_modified": obj["LastModified"].isoformat() if obj.get("LastModified") else None,
+                }
+                for obj in objects
+            ]
+
+        source_prefix = f"s3://{bucket}/"
+        infos: List[Dict[str, Any]] = []
+        for obj, meta in zip(objects, metas):
             key = obj["Key"]
-            doc_id = key.split("/")[-1]
-            meta = await asyncio.to_thread(_sync_head, key)
             infos.append({
-                "id": doc_id,
-                "source": f"s3://{self.bucket}/{key}",
+                "id": key.rpartition("/")[2],
+                "source": source_prefix + key,
                 "metadata": meta,
             })
         if self.logger:
@@ -229,17 +409,13 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
     # =====================
     # Domain层接口实现（符合 DocumentStorageService 签名）
     # =====================
-    def _generate_document_id(self, content: str, source: str) -> str:
-        content_hash = hashlib.md5(f"{source}:{content}".encode()).hexdigest()
-        return f"doc_{content_hash[:16]}"
-
-    def _raw_to_domain_document(self, raw_doc: RawDocument) -> Document:
+    def _raw_to_domain_document(self, raw_doc: RawDocument, now: Optional[datetime] = None) -> Document:
         return Document(
-            content=raw_doc.content,
+            content=raw_doc.text(),
             metadata=raw_doc.metadata or {},
             doc_id=raw_doc.id,
             source_path=raw_doc.source,
-            created_at=datetime.now()
+            created_at=now or datetime.now()
         )
 
     def _domain_to_raw_document(self, doc: Document) -> RawDocument:
@@ -252,7 +428,9 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
 
     async def load_documents(self, source_path: Optional[str] = None) -> List[Document]:
         raw_docs = await self._load_raw_documents(source_path=source_path)
-        return [self._raw_to_domain_document(d) for d in raw_docs]
+        # 同一批加载的文档共用一个创建时间
+        now = datetime.now()
+        return [self._raw_to_domain_document(d, now) for d in raw_docs]
 
     async def save_document(self, document: Document) -> tuple[bool, str]:
         raw_doc = self._domain_to_raw_document(document)
@@ -265,28 +443,65 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
         raw = await self._get_raw_document(document_id)
         return self._raw_to_domain_document(raw) if raw else None
 
-    async def list_documents(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
-        return await self._list_raw_documents(category=category)
+    async def list_documents(
+        self, category: Optional[str] = None, with_metadata: bool = False
+    ) -> List[Dict[str, Any]]:
+        """列出文档；默认不含用户元数据（省去逐对象 HEAD），需要时传 with_metadata=True"""
+        return await self._list_raw_documents(category=category, with_metadata=with_metadata)
 
     async def delete_document(self, document_id: str) -> bool:
         return await self._delete_raw_document(document_id)
 
+    async def delete_documents(self, document_ids: List[str]) -> int:
+        return await self._delete_raw_documents(document_ids)
+
     async def search_documents(self, query: str, category: Optional[str] = None, limit: int = 10) -> List[Document]:
-        all_docs = await self.load_documents()
+        """搜索文档
+
+        category 与本地存储一致：对象键位于该前缀下，或元数据 category 等于它，或源路径以它开头。
+        先只列举该前缀下的对象；命中不足 limit 条时，再扫描前缀之外的对象按元数据/源路径匹配。
+        对象按列举顺序流式拉取，命中 limit 条后立即停止并取消其余在途请求。
+        """
+        q = query.lower()
+        now = datetime.now()
         results: List[Document] = []
-        for doc in all_docs:
-            if query.lower() in (doc.content or "").lower():
-                if category:
-                    if (doc.metadata.get("category") != category) and (not (doc.source_path or "").startswith(category)):
-                        continue
-                results.append(doc)
-                if len(results) >= limit:
-                    break
+        await self._collect_matches(results, q, limit, now, self._iter_raw_documents(source_path=category))
+        if category and len(results) < limit:
+            # 元数据只能随对象正文取回，前缀之外的对象需逐个拉取后判断
+            await self._collect_matches(
+                results, q, limit, now,
+                self._iter_raw_documents(exclude_prefix=category),
+                lambda raw: (raw.metadata or {}).get("category") == category or raw.source.startswith(category),
+            )
         return results
 
+    async def _collect_matches(
+        self,
+        results: List[Document],
+        q: str,
+        limit: int,
+        now: datetime,
+        agen: AsyncIterator[RawDocument],
+        accept: Optional[Callable[[RawDocument], bool]] = None,
+    ) -> None:
+        """从文档流中收集内容包含 q（已转小写）的文档，达到 limit 条后停止"""
+        try:
+            async for raw in agen:
+                if accept is not None and not accept(raw):
+                    continue
+                if _contains_lower(raw.text(), q):
+                    results.append(self._raw_to_domain_document(raw, now))
+                    if len(results) >= limit:
+                        break
+        finally:
+            await agen.aclose()
+
     async def get_document_count(self, category: Optional[str] = None) -> int:
-        infos = await self._list_raw_documents(category=category)
-        return len(infos)
+        # 计数只需要逐页列举，不需要逐个 HEAD，也不保留对象列表
+        count = 0
+        async for _ in self._list_objects(prefix=category):
+            count += 1
+        return count
 
     async def update_document(self, document: Document) -> bool:
         raw_doc = self._domain_to_raw_document(document)
@@ -296,4 +511,4 @@ class S3DocumentStorageProvider(DocumentStorageProvider):
         return ['.txt', '.text', '.md', '.markdown', '.pdf', '.docx']
 
     async def validate_document(self, document: Document) -> bool:
-        return bool(document.doc_id and (document.content or "").strip())
+        return bool(document.doc_id and document.content and not document.content.isspace())
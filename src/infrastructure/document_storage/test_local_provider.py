@@ -3,6 +3,8 @@ import shutil
 import io
 import json
 import asyncio
+import contextvars
+import sqlite3
 import tempfile
 from pathlib import Path
 from typing import List
@@ -118,3 +120,141 @@ async def test_load_and_crud_interfaces_for_all_formats():
         
 
 
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_id_map():
+    """旧版 id_map.json（字符串路径与字典两种结构）导入 SQLite 后改名为 .migrated"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base = Path(tmpdir)
+        (base / 'a.txt').write_text('alpha', encoding='utf-8')
+        (base / 'b.txt').write_text('beta', encoding='utf-8')
+        legacy = {
+            'doc_a': str(base / 'a.txt'),
+            'doc_b': {'path': str(base / 'b.txt'), 'filename': 'b.txt'},
+            'doc_bad': 123,
+        }
+        (base / 'id_map.json').write_text(json.dumps(legacy), encoding='utf-8')
+
+        provider = LocalDocumentStorageProvider(data_path=tmpdir)
+        try:
+            assert not (base / 'id_map.json').exists(), '迁移后 id_map.json 应被改名'
+            assert (base / 'id_map.json.migrated').exists(), '缺少 id_map.json.migrated'
+            ids = sorted(info['id'] for info in await provider.list_documents())
+            print(f"[debug] migrated ids={ids}")
+            assert ids == ['doc_a', 'doc_b'], '迁移结果应只包含合法条目'
+            fetched = await provider.get_document('doc_b')
+            assert fetched is not None and fetched.content == 'beta', '迁移后应能按旧ID读取文档'
+        finally:
+            provider.close()
+
+        # 再次打开不会重复迁移
+        provider = LocalDocumentStorageProvider(data_path=tmpdir)
+        try:
+            assert len(await provider.list_documents()) == 2
+        finally:
+            provider.close()
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_save_and_delete():
+    """保存/删除直接更新全文索引，无需重新扫描数据目录"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        provider = LocalDocumentStorageProvider(data_path=tmpdir)
+        try:
+            assert await provider.search_documents('pineapple') == []
+            ok, doc_id = await provider.save_document(
+                Document(content='notes about pineapple pizza', metadata={}, source_path='fruit.txt')
+            )
+            assert ok is True
+            results = await provider.search_documents('pineapple')
+            print(f"[debug] search after save: {[d.source_path for d in results]}")
+            assert len(results) == 1, '保存后应立即可检索'
+
+            # 检索不再扫描数据目录：之后直接放入的文件在 reindex() 前不可见
+            (Path(tmpdir) / 'external.txt').write_text('more pineapple', encoding='utf-8')
+            assert len(await provider.search_documents('pineapple')) == 1, '检索不应扫描数据目录'
+
+            assert await provider.delete_document(doc_id) is True
+            assert await provider.search_documents('pizza') == [], '删除后不应再命中'
+        finally:
+            provider.close()
+
+
+@pytest.mark.asyncio
+async def test_search_sees_files_changed_outside_save_document():
+    """启动前已存在的文件在首次检索时入索引；之后直接增删改的文件在 reindex() 后同步"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        existing = Path(tmpdir) / 'existing.txt'
+        existing.write_text('kiwi salad', encoding='utf-8')
+        provider = LocalDocumentStorageProvider(data_path=tmpdir)
+        try:
+            assert len(await provider.search_documents('kiwi')) == 1, '启动时应对齐已有文件'
+
+            external = Path(tmpdir) / 'external.txt'
+            external.write_text('notes about pineapple pizza', encoding='utf-8')
+            await provider.reindex()
+            results = await provider.search_documents('pineapple')
+            print(f"[debug] search after external add: {[d.source_path for d in results]}")
+            assert len(results) == 1, '外部新增的文件应能被检索到'
+            assert results[0].source_path == str(external)
+
+            # 修改内容（大小变化）后重新索引
+            external.write_text('notes about mango smoothie only', encoding='utf-8')
+            await provider.reindex()
+            assert await provider.search_documents('pineapple') == [], '修改后旧内容不应再命中'
+            assert len(await provider.search_documents('mango')) == 1, '修改后新内容应能命中'
+
+            # 并发对齐与检索不会产生重复行
+            await asyncio.gather(*[provider.reindex() for _ in range(3)])
+            batches = await asyncio.gather(*[provider.search_documents('mango') for _ in range(5)])
+            assert all(len(batch) == 1 for batch in batches), '并发检索出现重复结果'
+
+            external.unlink()
+            await provider.reindex()
+            assert await provider.search_documents('mango') == [], '删除的文件不应再命中'
+        finally:
+            provider.close()
+
+
+
+def _committed_rows(db_path: Path, sql: str) -> int:
+    """通过独立连接读取已提交的行数"""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(sql).fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_defers_commits_for_caller_only():
+    """bulk_save 内的映射与全文索引修改在退出时提交，且不推迟其他任务的保存"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        id_map_db = Path(tmpdir) / 'id_map.sqlite'
+        fts_db = Path(tmpdir) / 'fts.sqlite'
+        provider = LocalDocumentStorageProvider(data_path=tmpdir)
+        try:
+            with provider.bulk_save():
+                for i in range(3):
+                    ok, _ = await provider.save_document(
+                        Document(content=f'bulk {i}', metadata={}, source_path=f'bulk{i}.txt')
+                    )
+                    assert ok is True
+                assert _committed_rows(id_map_db, "SELECT COUNT(*) FROM id_map") == 0, 'bulk_save 内不应提交映射'
+                assert _committed_rows(fts_db, "SELECT COUNT(*) FROM files") == 0, 'bulk_save 内不应提交全文索引'
+
+                # 在空白上下文中运行的任务不属于该 bulk_save，保存后立即提交
+                other = Document(content='other', metadata={}, source_path='other.txt')
+                ok, other_id = await asyncio.create_task(provider.save_document(other), context=contextvars.Context())
+                assert ok is True
+                assert _committed_rows(
+                    id_map_db, f"SELECT COUNT(*) FROM id_map WHERE doc_id = '{other_id}'"
+                ) == 1, '其他任务的映射修改不应被推迟'
+                assert _committed_rows(
+                    fts_db, "SELECT COUNT(*) FROM files WHERE source LIKE '%other.txt'"
+                ) == 1, '其他任务的索引修改不应被推迟'
+
+            assert _committed_rows(id_map_db, "SELECT COUNT(*) FROM id_map") == 4
+            assert _committed_rows(fts_db, "SELECT COUNT(*) FROM files") == 4
+        finally:
+            provider.close()
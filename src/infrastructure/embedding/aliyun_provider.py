@@ -1,9 +1,12 @@
 from typing import List, Dict, Any
 from langchain_community.embeddings import DashScopeEmbeddings
 
-from .base import EmbeddingProvider
+from .base import EmbeddingProvider, _strip_truncate
 from ...infrastructure.config.config_manager import get_config
 
+# DashScope 通用文本向量接口单次请求最多 25 条文本
+_EMBED_BATCH_SIZE = 25
+
 class AliyunEmbeddingProvider(EmbeddingProvider):
     """阿里云通用文本向量模型实现 - 基于LangChain"""
     
@@ -23,14 +26,22 @@ class AliyunEmbeddingProvider(EmbeddingProvider):
     async def embed_text(self, text: str) -> List[float]:
         """将文本转换为向量嵌入"""
         try:
-            return await self.embeddings.aembed_query(text)
+            async def _query(batch: List[str]) -> List[List[float]]:
+                return [await self.embeddings.aembed_query(batch[0])]
+            vectors = await self._embed_cached([text], _query, kind="query")
+            return vectors[0]
         except Exception as e:
             raise Exception(f"阿里云嵌入服务错误: {str(e)}")
     
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """批量将文本转换为向量嵌入"""
         try:
-            return await self.embeddings.aembed_documents(texts)
+            return await self._embed_cached(
+                texts,
+                lambda batch: self._embed_in_batches(
+                    batch, self.embeddings.aembed_documents, _EMBED_BATCH_SIZE
+                ),
+            )
         except Exception as e:
             raise Exception(f"阿里云批量嵌入服务错误: {str(e)}")
     
@@ -56,13 +67,9 @@ class AliyunEmbeddingProvider(EmbeddingProvider):
         return 8192  # 阿里云嵌入模型的最大输入长度
     
     async def is_available(self) -> bool:
-        """检查服务可用性"""
-        try:
-            # 测试一个简单的嵌入请求
-            await self.embed_text("test")
-            return True
-        except Exception:
-            return False
+        """检查服务可用性（探测请求会计费，结果按 TTL 缓存）"""
+        # 直接请求服务端，绕过嵌入结果缓存
+        return await self._cached_availability(lambda: self.embeddings.aembed_query("test"))
     
     async def embed_query(self, query: str) -> List[float]:
         """为查询文本生成嵌入向量"""
@@ -76,13 +83,8 @@ class AliyunEmbeddingProvider(EmbeddingProvider):
     
     def preprocess_text(self, text: str) -> str:
         """预处理文本"""
-        # 基本的文本清理
-        text = text.strip()
-        # 截断过长的文本
-        max_length = self.get_max_input_length()
-        if len(text) > max_length:
-            text = text[:max_length]
-        return text
+        # 去除首尾空白并截断过长的文本
+        return _strip_truncate(text, self.get_max_input_length())
     
     def get_service_info(self) -> Dict[str, Any]:
         """获取服务信息"""
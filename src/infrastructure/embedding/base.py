@@ -1,10 +1,39 @@
+import asyncio
+import hashlib
+import re
 from abc import ABC, abstractmethod
-from typing import List, Union, Dict, Any, Optional
+from array import array
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Union, Dict, Any, Optional
 from ...domain.interfaces import EmbeddingService
+from ..availability import CachedAvailabilityMixin
 
-class EmbeddingProvider(EmbeddingService):
+# 嵌入结果 LRU 缓存的条目上限（1536 维时约 25MB）
+_EMBED_CACHE_SIZE = 2048
+
+_NON_SPACE_RE = re.compile(r'\S')
+
+def _strip_truncate(text: str, max_length: int) -> str:
+    """等价于 text.strip()[:max_length]，但只复制截断后的片段
+    
+    先定位首个非空白字符，再判断截断点之后是否仍有非空白字符，
+    超长文本不会为去除首尾空白而整体复制一份。
+    """
+    m = _NON_SPACE_RE.search(text)
+    if m is None:
+        return ""
+    start = m.start()
+    end = start + max_length
+    if _NON_SPACE_RE.search(text, end) is not None:
+        return text[start:end]
+    return text[start:end].rstrip()
+
+class EmbeddingProvider(CachedAvailabilityMixin, EmbeddingService):
     """向量嵌入提供者接口"""
     
+    # 嵌入结果缓存：文本摘要 -> 向量，首次使用时创建
+    _embed_cache: Optional["OrderedDict[bytes, array]"] = None
+    
     @abstractmethod
     async def embed(self, text: str) -> List[float]:
         """将文本转换为向量嵌入
@@ -38,6 +67,78 @@ class EmbeddingProvider(EmbeddingService):
         """
         pass
     
+    async def _embed_in_batches(
+        self,
+        texts: List[str],
+        embed_fn: Callable[[List[str]], Awaitable[List[List[float]]]],
+        batch_size: int,
+        max_concurrency: int = 4,
+    ) -> List[List[float]]:
+        """按 batch_size 切分文本并发请求嵌入，结果按输入顺序拼接
+        
+        Args:
+            texts: 输入文本列表
+            embed_fn: 单批嵌入函数（如 aembed_documents）
+            batch_size: 每批文本数（不超过服务端单次请求上限）
+            max_concurrency: 同时在途的请求数上限
+            
+        Returns:
+            向量嵌入列表的列表
+        """
+        if len(texts) <= batch_size:
+            return await embed_fn(texts)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await embed_fn(batch)
+
+        results = await asyncio.gather(*[
+            _run(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)
+        ])
+        return [vector for batch in results for vector in batch]
+    
+    async def _embed_cached(
+        self,
+        texts: List[str],
+        embed_fn: Callable[[List[str]], Awaitable[List[List[float]]]],
+        kind: str = "document",
+    ) -> List[List[float]]:
+        """带缓存的嵌入：已缓存的文本直接返回，其余（批内去重后）交给 embed_fn
+        
+        Args:
+            texts: 输入文本列表
+            embed_fn: 批量嵌入函数，仅接收未命中缓存的文本
+            kind: 嵌入类型（"query"/"document"），部分模型对查询和文档使用不同的向量化方式
+            
+        Returns:
+            向量嵌入列表的列表（与输入顺序一致）
+        """
+        if self._embed_cache is None:
+            self._embed_cache = OrderedDict()
+        cache = self._embed_cache
+        person = kind.encode()
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        missing: Dict[bytes, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = hashlib.blake2b(text.encode(), digest_size=16, person=person).digest()
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                results[i] = cached.tolist()
+            else:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            positions = list(missing.values())
+            vectors = await embed_fn([texts[idx[0]] for idx in positions])
+            for key, idx, vector in zip(missing, positions, vectors):
+                for i in idx:
+                    results[i] = vector if i == idx[0] else list(vector)
+                cache[key] = array('d', vector)
+            while len(cache) > _EMBED_CACHE_SIZE:
+                cache.popitem(last=False)
+        return results
+    
     # Domain层接口实现
     async def embed_query(self, query: str) -> List[float]:
         """查询向量化 - Domain层接口"""
@@ -60,7 +161,7 @@ class EmbeddingProvider(EmbeddingService):
     
     async def validate_input(self, text: str) -> bool:
         """验证输入 - Domain层接口"""
-        if not text or not text.strip():
+        if not text or text.isspace():
             return False
         if len(text) > self.get_max_input_length():
             return False
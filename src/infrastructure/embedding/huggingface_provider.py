@@ -1,17 +1,34 @@
+import asyncio
 from typing import List, Dict, Any
 from langchain_huggingface import HuggingFaceEmbeddings
 
-from .base import EmbeddingProvider
+from .base import EmbeddingProvider, _strip_truncate
 
 class HuggingFaceEmbeddingProvider(EmbeddingProvider):
     """HuggingFace嵌入模型实现 - 基于LangChain"""
     
     def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
         self.model_name = model_name
+        self._dimension = None
+        device = 'cuda' if self._is_cuda_available() else 'cpu'
         self.embeddings = HuggingFaceEmbeddings(
             model_name=model_name,
-            model_kwargs={'device': 'cuda' if self._is_cuda_available() else 'cpu'}
+            model_kwargs={'device': device},
+            encode_kwargs={'batch_size': 64}
         )
+        if device == 'cuda':
+            self._use_half_precision()
+    
+    def _use_half_precision(self) -> None:
+        """GPU 上将模型权重转为 FP16（sentence-transformers 2.2 构造参数不支持 torch_dtype）"""
+        client = getattr(self.embeddings, '_client', None)
+        if client is None:
+            return
+        try:
+            client.half()
+        except Exception:
+            # 转换失败时继续使用 FP32
+            pass
     
     def _is_cuda_available(self) -> bool:
         """检查CUDA是否可用"""
@@ -24,14 +41,22 @@ class HuggingFaceEmbeddingProvider(EmbeddingProvider):
     async def embed(self, text: str) -> List[float]:
         """将文本转换为向量嵌入"""
         try:
-            return self.embeddings.embed_query(text)
+            # 模型推理为同步计算，放到线程中执行以免阻塞事件循环
+            def _query(batch: List[str]) -> List[List[float]]:
+                return [self.embeddings.embed_query(batch[0])]
+            vectors = await self._embed_cached(
+                [text], lambda batch: asyncio.to_thread(_query, batch), kind="query"
+            )
+            return vectors[0]
         except Exception as e:
             raise Exception(f"HuggingFace嵌入服务错误: {str(e)}")
     
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """批量将文本转换为向量嵌入"""
         try:
-            return self.embeddings.embed_documents(texts)
+            return await self._embed_cached(
+                texts, lambda batch: asyncio.to_thread(self.embeddings.embed_documents, batch)
+            )
         except Exception as e:
             raise Exception(f"HuggingFace批量嵌入服务错误: {str(e)}")
     
@@ -44,19 +69,31 @@ class HuggingFaceEmbeddingProvider(EmbeddingProvider):
         return await self.embed_batch(texts)
     
     def get_dimension(self) -> int:
-        """获取向量维度"""
+        """获取向量维度（首次调用时确定并缓存）"""
+        if self._dimension is None:
+            self._dimension = self._resolve_dimension()
+        return self._dimension
+    
+    def _resolve_dimension(self) -> int:
+        """确定向量维度，优先读取模型配置，避免实际推理"""
         # 根据模型名称返回对应的维度
         if "all-MiniLM-L6-v2" in self.model_name:
             return 384
         elif "all-mpnet-base-v2" in self.model_name:
             return 768
-        else:
-            # 使用langchain获取维度
-            try:
-                test_embedding = self.embeddings.embed_query("test")
-                return len(test_embedding)
-            except Exception:
-                return 384  # 默认维度
+        client = getattr(self.embeddings, '_client', None)
+        try:
+            dimension = client.get_sentence_embedding_dimension() if client is not None else None
+            if dimension:
+                return dimension
+        except Exception:
+            pass
+        # 使用langchain获取维度
+        try:
+            test_embedding = self.embeddings.embed_query("test")
+            return len(test_embedding)
+        except Exception:
+            return 384  # 默认维度
     
     def get_model_name(self) -> str:
         """获取模型名称"""
@@ -67,13 +104,8 @@ class HuggingFaceEmbeddingProvider(EmbeddingProvider):
         return 512  # HuggingFace模型的典型最大输入长度
     
     async def is_available(self) -> bool:
-        """检查服务可用性"""
-        try:
-            # 测试一个简单的嵌入请求
-            await self.embed_text("test")
-            return True
-        except Exception:
-            return False
+        """检查服务可用性（本地模型在构造时已加载，无需实际推理）"""
+        return self.embeddings is not None
     
     def validate_input(self, text: str) -> bool:
         """验证输入文本"""
@@ -83,13 +115,8 @@ class HuggingFaceEmbeddingProvider(EmbeddingProvider):
     
     def preprocess_text(self, text: str) -> str:
         """预处理文本"""
-        # 基本的文本清理
-        text = text.strip()
-        # 截断过长的文本
-        max_length = self.get_max_input_length()
-        if len(text) > max_length:
-            text = text[:max_length]
-        return text
+        # 去除首尾空白并截断过长的文本
+        return _strip_truncate(text, self.get_max_input_length())
     
     def get_service_info(self) -> Dict[str, Any]:
         """获取服务信息"""
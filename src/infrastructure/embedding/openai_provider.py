@@ -1,9 +1,13 @@
 from typing import List, Dict, Any
+import tiktoken
 from langchain_openai import OpenAIEmbeddings
 
-from .base import EmbeddingProvider
+from .base import EmbeddingProvider, _strip_truncate
 from ...infrastructure.config.config_manager import get_config
 
+# 单批文本数，控制单次请求体积与 token 总量
+_EMBED_BATCH_SIZE = 64
+
 class OpenAIEmbeddingProvider(EmbeddingProvider):
     """OpenAI嵌入模型实现 - 基于LangChain"""
     
@@ -19,18 +23,42 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
             openai_api_key=self.api_key,
             model=self.model
         )
+        # tiktoken 编码器，首次预处理时加载（False 表示加载失败，按字符截断）
+        self._encoding = None
+    
+    def _get_encoding(self):
+        """获取模型对应的 tiktoken 编码器"""
+        if self._encoding is None:
+            try:
+                try:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                except KeyError:
+                    # 未登记的模型名按 embedding 系列通用的 cl100k_base 处理
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # 编码文件无法加载（如离线环境）
+                self._encoding = False
+        return self._encoding
     
     async def embed_text(self, text: str) -> List[float]:
         """将文本转换为向量嵌入"""
         try:
-            return await self.embeddings.aembed_query(text)
+            async def _query(batch: List[str]) -> List[List[float]]:
+                return [await self.embeddings.aembed_query(batch[0])]
+            vectors = await self._embed_cached([text], _query, kind="query")
+            return vectors[0]
         except Exception as e:
             raise Exception(f"OpenAI嵌入服务错误: {str(e)}")
     
     async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """批量将文本转换为向量嵌入"""
         try:
-            return await self.embeddings.aembed_documents(texts)
+            return await self._embed_cached(
+                texts,
+                lambda batch: self._embed_in_batches(
+                    batch, self.embeddings.aembed_documents, _EMBED_BATCH_SIZE
+                ),
+            )
         except Exception as e:
             raise Exception(f"OpenAI批量嵌入服务错误: {str(e)}")
     
@@ -60,16 +88,12 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
     
     def get_max_input_length(self) -> int:
         """获取最大输入长度"""
-        return 8191  # OpenAI嵌入模型的最大输入长度
+        return 8191  # OpenAI嵌入模型的最大输入长度（token）
     
     async def is_available(self) -> bool:
-        """检查服务可用性"""
-        try:
-            # 测试一个简单的嵌入请求
-            await self.embed_text("test")
-            return True
-        except Exception:
-            return False
+        """检查服务可用性（探测请求会计费，结果按 TTL 缓存）"""
+        # 直接请求服务端，绕过嵌入结果缓存
+        return await self._cached_availability(lambda: self.embeddings.aembed_query("test"))
     
     async def embed_query(self, query: str) -> List[float]:
         """为查询文本生成嵌入向量"""
@@ -82,14 +106,21 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         return len(text.strip()) <= self.get_max_input_length()
     
     def preprocess_text(self, text: str) -> str:
-        """预处理文本"""
-        # 基本的文本清理
+        """预处理文本（模型上限以 token 计，按 token 截断）"""
+        encoding = self._get_encoding()
+        if not encoding:
+            # 去除首尾空白并截断过长的文本
+            return _strip_truncate(text, self.get_max_input_length())
         text = text.strip()
-        # 截断过长的文本
-        max_length = self.get_max_input_length()
-        if len(text) > max_length:
-            text = text[:max_length]
-        return text
+        max_tokens = self.get_max_input_length()
+        # 每个 token 至少对应一个字节，字节数不超过上限的文本无需分词
+        if len(text) * 4 <= max_tokens:
+            return text
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        # 截断处可能落在多字节字符中间，去掉解码出的替换字符
+        return encoding.decode(tokens[:max_tokens]).rstrip("\ufffd")
     
     def get_service_info(self) -> Dict[str, Any]:
         """获取服务信息"""
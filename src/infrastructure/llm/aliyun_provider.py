@@ -1,10 +1,43 @@
+import asyncio
+import importlib.util
+import json
 from typing import List, Dict, Any
-import dashscope
-from dashscope import Generation
 
-from .base import LLMProvider
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+from .base import LLMProvider, _ALLOWED_ROLES, _count_cjk, _merge_params, _params_key
 from ...infrastructure.config.config_manager import get_config
 
+# 通义千问模型的最大token数（按顺序取第一个子串匹配项）
+_MODEL_TOKEN_TABLE = (
+    ("qwen-turbo", 6000),
+    ("qwen-plus", 30000),
+    ("qwen-max", 6000),
+)
+_DEFAULT_MAX_TOKENS = 6000
+
+# 生成参数默认值及接口支持的参数
+_ALIYUN_DEFAULTS = {"temperature": 0.7, "max_tokens": 1500, "top_p": 0.8}
+_ALIYUN_SUPPORTED = frozenset(("temperature", "max_tokens", "top_p"))
+
+# 文本生成接口路径（相对于 dashscope.base_http_api_url）
+_GENERATION_PATH = "/services/aigc/text-generation/generation"
+# 安装了 h2 时启用 HTTP/2，多个并发请求复用同一连接
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+def _loads(raw: bytes) -> Any:
+    """解析响应 JSON，优先使用 orjson"""
+    return _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+
+def _output_text(output: Dict[str, Any]) -> str:
+    """从 output 中取出文本（兼容 text 与 message 两种返回格式）"""
+    if output.get("text") is not None:
+        return output["text"]
+    return output["choices"][0]["message"]["content"]
+
 class AliyunQwenProvider(LLMProvider):
     """阿里云通义千问实现"""
     
@@ -16,44 +49,129 @@ class AliyunQwenProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("阿里云API密钥未配置")
             
+        # 首次实例化时才导入 dashscope，未使用该提供者的部署不承担导入开销
+        import dashscope
+        import httpx
+        from dashscope import Models
+        
         dashscope.api_key = self.api_key
+        self._Models = Models
+        # 生成请求直接走 REST 接口，复用连接池，避免 SDK 每次调用重新建立 TLS 连接
+        self._http = httpx.AsyncClient(
+            base_url=dashscope.base_http_api_url,
+            http2=_HTTP2,
+            timeout=60,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            headers={"Authorization": f"Bearer {self.api_key}"},
+        )
+        # 最大token数只取决于模型名，构造时解析一次
+        self._max_tokens = next(
+            (tokens for name, tokens in _MODEL_TOKEN_TABLE if name in self.model),
+            _DEFAULT_MAX_TOKENS,
+        )
+    
+    async def _post_generation(self, input_data: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """调用文本生成接口
+        
+        Args:
+            input_data: 请求的 input 字段（prompt 或 messages）
+            parameters: 采样等生成参数
+            
+        Returns:
+            响应中的 output 字段
+        """
+        response = await self._http.post(
+            _GENERATION_PATH,
+            json={"model": self.model, "input": input_data, "parameters": parameters},
+        )
+        data = _loads(response.content) if response.content else {}
+        if response.status_code != 200:
+            raise Exception(f"{data.get('code', response.status_code)} - {data.get('message', response.text)}")
+        return data["output"]
+    
+    async def _stream_generation(self, input_data: Dict[str, Any], parameters: Dict[str, Any]):
+        """以 SSE 方式调用文本生成接口，逐段产出增量文本
+        
+        Args:
+            input_data: 请求的 input 字段（prompt 或 messages）
+            parameters: 采样等生成参数
+            
+        Yields:
+            增量生成的文本
+        """
+        async with self._http.stream(
+            "POST",
+            _GENERATION_PATH,
+            json={
+                "model": self.model,
+                "input": input_data,
+                "parameters": {**parameters, "incremental_output": True},
+            },
+            headers={"X-DashScope-SSE": "enable", "Accept": "text/event-stream"},
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                data = _loads(body) if body else {}
+                raise Exception(f"{data.get('code', response.status_code)} - {data.get('message', '')}")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = _loads(line[5:])
+                output = data.get("output")
+                if output is None:
+                    # 流中的错误事件只包含 code 与 message
+                    raise Exception(f"{data.get('code')} - {data.get('message')}")
+                text = _output_text(output)
+                if text:
+                    yield text
+    
+    async def aclose(self) -> None:
+        """关闭 HTTP 连接池（应用关闭时由服务工厂调用）"""
+        await self._http.aclose()
     
     async def generate(self, prompt: str, **kwargs) -> str:
         """生成文本回复"""
+        params = _merge_params(_ALIYUN_DEFAULTS, _ALIYUN_SUPPORTED, kwargs)
+        
+        async def _call() -> str:
+            try:
+                output = await self._post_generation({"prompt": prompt}, params)
+            except Exception as e:
+                raise Exception(f"阿里云LLM API调用失败: {str(e)}")
+            return _output_text(output)
+        
         try:
-            response = Generation.call(
-                model=self.model,
-                prompt=prompt,
-                temperature=kwargs.get('temperature', 0.7),
-                max_tokens=kwargs.get('max_tokens', 1500),
-                top_p=kwargs.get('top_p', 0.8)
+            return await self._cached_call(
+                prompt,
+                f"aliyun:generate:{self.model}:{_params_key(params, _ALIYUN_DEFAULTS)}",
+                _call,
+                use_cache=kwargs.get('use_cache', True),
             )
-            
-            if response.status_code == 200:
-                print("-----------阿里云LLM API调用成功")
-                return response.output.text
-            else:
-                raise Exception(f"阿里云LLM API调用失败: {response.message}")
-                
         except Exception as e:
             raise Exception(f"阿里云LLM服务错误: {str(e)}")
     
     async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """对话生成"""
+        params = _merge_params(_ALIYUN_DEFAULTS, _ALIYUN_SUPPORTED, kwargs)
+        
+        async def _call() -> str:
+            try:
+                output = await self._post_generation(
+                    {"messages": messages},
+                    {**params, "result_format": "message"},
+                )
+            except Exception as e:
+                raise Exception(f"阿里云对话API调用失败: {str(e)}")
+            
+            return _output_text(output)
+        
         try:
-            response = Generation.call(
-                model=self.model,
-                messages=messages,
-                temperature=kwargs.get('temperature', 0.7),
-                max_tokens=kwargs.get('max_tokens', 1500),
-                top_p=kwargs.get('top_p', 0.8)
+            return await self._cached_call(
+                json.dumps(messages, ensure_ascii=False),
+                f"aliyun:chat:{self.model}:{_params_key(params, _ALIYUN_DEFAULTS)}",
+                _call,
+                use_cache=kwargs.get('use_cache', True),
             )
-            
-            if response.status_code == 200:
-                return response.output.choices[0].message.content
-            else:
-                raise Exception(f"阿里云对话API调用失败: {response.message}")
-                
         except Exception as e:
             raise Exception(f"阿里云对话服务错误: {str(e)}")
     
@@ -63,15 +181,7 @@ class AliyunQwenProvider(LLMProvider):
     
     def get_max_tokens(self) -> int:
         """获取最大token数"""
-        # 通义千问模型的最大token数
-        if "qwen-turbo" in self.model:
-            return 6000
-        elif "qwen-plus" in self.model:
-            return 30000
-        elif "qwen-max" in self.model:
-            return 6000
-        else:
-            return 6000  # 默认值
+        return self._max_tokens
     
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """生成文本"""
@@ -83,15 +193,25 @@ class AliyunQwenProvider(LLMProvider):
     
     async def stream_generate(self, prompt: str, **kwargs):
         """流式生成文本"""
-        # 阿里云暂不支持流式生成，返回普通生成结果
-        result = await self.generate(prompt, **kwargs)
-        yield result
+        try:
+            async for chunk in self._stream_generation(
+                {"prompt": prompt},
+                _merge_params(_ALIYUN_DEFAULTS, _ALIYUN_SUPPORTED, kwargs),
+            ):
+                yield chunk
+        except Exception as e:
+            raise Exception(f"阿里云流式生成错误: {str(e)}")
     
     async def stream_chat(self, messages: List[Dict[str, str]], **kwargs):
         """流式对话生成"""
-        # 阿里云暂不支持流式对话，返回普通对话结果
-        result = await self.chat(messages, **kwargs)
-        yield result
+        try:
+            async for chunk in self._stream_generation(
+                {"messages": messages},
+                {**_merge_params(_ALIYUN_DEFAULTS, _ALIYUN_SUPPORTED, kwargs), "result_format": "message"},
+            ):
+                yield chunk
+        except Exception as e:
+            raise Exception(f"阿里云流式对话错误: {str(e)}")
     
     async def generate_stream(self, prompt: str, **kwargs):
         """流式生成文本（兼容旧方法名）"""
@@ -104,20 +224,21 @@ class AliyunQwenProvider(LLMProvider):
             "name": self.model,
             "provider": "aliyun",
             "max_tokens": self.get_max_tokens(),
-            "supports_streaming": False
+            "supports_streaming": True
         }
     
     def get_max_input_length(self) -> int:
         """获取最大输入长度"""
-        return self.get_max_tokens() - 1000  # 预留输出空间
+        return self._max_tokens - 1000  # 预留输出空间
     
     async def is_available(self) -> bool:
-        """检查服务可用性"""
-        try:
-            await self.generate("test", max_tokens=10)
-            return True
-        except Exception:
-            return False
+        """检查服务可用性（查询模型信息，不产生 token 计费；结果短时缓存）"""
+        async def _probe() -> None:
+            response = await asyncio.to_thread(self._Models.get, self.model)
+            if response.status_code != 200:
+                raise Exception(f"{response.code} - {response.message}")
+        
+        return await self._cached_availability(_probe)
     
     def validate_messages(self, messages: List[Dict[str, str]]) -> bool:
         """验证消息格式"""
@@ -127,7 +248,8 @@ class AliyunQwenProvider(LLMProvider):
         for msg in messages:
             if not isinstance(msg, dict) or 'role' not in msg or 'content' not in msg:
                 return False
-            if msg['role'] not in ['user', 'assistant', 'system']:
+            role = msg['role']
+            if not isinstance(role, str) or role not in _ALLOWED_ROLES:
                 return False
         
         return True
@@ -135,7 +257,7 @@ class AliyunQwenProvider(LLMProvider):
     def count_tokens(self, text: str) -> int:
         """估算token数量"""
         # 简单估算：中文按字符数，英文按单词数的1.3倍
-        chinese_chars = len([c for c in text if '\u4e00' <= c <= '\u9fff'])
+        chinese_chars = _count_cjk(text)
         other_chars = len(text) - chinese_chars
         return chinese_chars + int(other_chars * 0.25)
     
@@ -146,7 +268,7 @@ class AliyunQwenProvider(LLMProvider):
             "model": self.model,
             "max_tokens": self.get_max_tokens(),
             "max_input_length": self.get_max_input_length(),
-            "supports_streaming": False,
+            "supports_streaming": True,
             "api_key_configured": bool(self.api_key)
         }
     
@@ -1,10 +1,160 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import re
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional, AsyncGenerator, Awaitable, Callable, Tuple
 from ...domain.interfaces import LLMService
+from ..availability import CachedAvailabilityMixin
+from .prompt_cache import ExactPromptCache
+from .semantic_cache import SemanticLLMCache
 
-class LLMProvider(LLMService):
+# 会话级响应缓存，由 LLMProvider.session_cache() 在当前异步上下文中开启
+_SESSION_CACHE: ContextVar[Optional[Dict[bytes, str]]] = ContextVar("llm_session_cache", default=None)
+
+# 对话消息允许的角色
+_ALLOWED_ROLES = frozenset(("user", "assistant", "system"))
+
+def _merge_params(defaults: Dict[str, Any], supported: frozenset, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """合并默认生成参数与调用参数，只保留模型接口支持的参数（use_cache 等控制参数不会透传）"""
+    return {key: value for key, value in (defaults | kwargs).items() if key in supported}
+
+def _params_key(params: Dict[str, Any], defaults: Dict[str, Any]) -> str:
+    """生成参数在缓存标识中的表示：默认参数按固定顺序取值，其余参数按名称排序后追加"""
+    key = ":".join(str(params[name]) for name in defaults)
+    extras = sorted(params.keys() - defaults.keys())
+    if extras:
+        key += ":" + ":".join(f"{name}={params[name]}" for name in extras)
+    return key
+
+# 连续的 CJK 统一表意文字（按段匹配，正文中汉字通常成段出现）
+_CJK_RUN_RE = re.compile('[\u4e00-\u9fff]+')
+
+def _count_cjk(text: str) -> int:
+    """统计 CJK 统一表意文字（U+4E00–U+9FFF）的字符数，在正则引擎中完成扫描"""
+    return sum(map(len, _CJK_RUN_RE.findall(text)))
+
+# 合并请求的提示词模板：要求模型按编号以 JSON 对象返回各任务的回答
+_BATCH_PROMPT_HEADER = (
+    "请独立完成下列编号任务，互不参考。"
+    "只输出一个 JSON 对象，键为任务编号（字符串），值为该任务的回答，不要输出其他内容。\n"
+)
+
+class LLMProvider(CachedAvailabilityMixin, LLMService):
     """大语言模型提供者接口"""
     
+    # 响应缓存（可选），由服务工厂按配置注入：prompt_cache 为进程内精确匹配（L1），
+    # cache 为持久化的精确/语义缓存（L2）
+    prompt_cache: Optional[ExactPromptCache] = None
+    cache: Optional[SemanticLLMCache] = None
+    # generate_batch 单次合并的最大提示词数量
+    batch_size: int = 8
+    
+    def set_cache(self, cache: Optional[SemanticLLMCache]) -> None:
+        """设置响应缓存（传入 None 关闭缓存）"""
+        self.cache = cache
+    
+    def set_prompt_cache(self, prompt_cache: Optional[ExactPromptCache]) -> None:
+        """设置进程内精确匹配缓存（传入 None 关闭）"""
+        self.prompt_cache = prompt_cache
+    
+    @contextmanager
+    def session_cache(self):
+        """开启会话级响应缓存
+        
+        with 块内（含其中创建的子任务）完全相同的请求只调用一次模型，其后直接复用首次结果，
+        适用于智能体推理循环等会重放相同消息的场景。与 cache / prompt_cache 不同，
+        无需配置开启，也不受 temperature 影响，离开 with 块即失效。
+        """
+        token = _SESSION_CACHE.set({})
+        try:
+            yield
+        finally:
+            _SESSION_CACHE.reset(token)
+    
+    def clear_session_cache(self) -> None:
+        """清空当前会话级响应缓存（如开始新一轮对话时）"""
+        session = _SESSION_CACHE.get()
+        if session is not None:
+            session.clear()
+    
+    async def _cached_call(
+        self,
+        prompt: str,
+        llm_string: str,
+        call: Callable[[], Awaitable[str]],
+        use_cache: bool = True,
+    ) -> str:
+        """先查响应缓存，未命中时调用模型并写入缓存
+        
+        查找顺序：会话级缓存 -> 进程内精确匹配缓存 -> 持久化精确/语义缓存。
+        
+        Args:
+            prompt: 缓存键使用的提示词（对话时为序列化后的消息）
+            llm_string: 提供者、模型与采样参数标识
+            call: 实际调用模型的函数
+            use_cache: 为 False 时直接调用模型（如可用性探测）
+            
+        Returns:
+            生成的文本回复
+        """
+        if not use_cache:
+            return await call()
+        
+        session = _SESSION_CACHE.get()
+        if session is None:
+            return await self._layered_call(prompt, llm_string, call)
+        hasher = hashlib.blake2b(llm_string.encode(), digest_size=16)
+        hasher.update(b"\0")
+        hasher.update(prompt.encode())
+        session_key = hasher.digest()
+        cached = session.get(session_key)
+        if cached is not None:
+            return cached
+        value = await self._layered_call(prompt, llm_string, call)
+        if value:
+            session[session_key] = value
+        return value
+    
+    async def _layered_call(self, prompt: str, llm_string: str, call: Callable[[], Awaitable[str]]) -> str:
+        """依次查询进程内缓存与持久化缓存，未命中时调用模型并写入两级缓存"""
+        prompt_cache = self.prompt_cache
+        if self.cache is None and prompt_cache is None:
+            return await call()
+        
+        key = None
+        if prompt_cache is not None:
+            key = prompt_cache.make_key(prompt, llm_string)
+            cached = prompt_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        cached = None
+        if self.cache is not None:
+            try:
+                cached = await self.cache.lookup(prompt, llm_string)
+            except Exception:
+                # 缓存故障不影响正常调用
+                cached = None
+        if cached is not None:
+            if key is not None:
+                prompt_cache.set(key, cached)
+            return cached
+        
+        value = await call()
+        if value:
+            if key is not None:
+                prompt_cache.set(key, value)
+            if self.cache is not None:
+                try:
+                    await self.cache.update(prompt, llm_string, value)
+                except Exception:
+                    pass
+        return value
+    
     @abstractmethod
     async def generate(self, prompt: str, **kwargs) -> str:
         """生成文本回复
@@ -49,6 +199,110 @@ class LLMProvider(LLMService):
         """
         pass
     
+    async def _token_count(self, text: str) -> int:
+        # 各提供者的 count_tokens 有同步和异步两种实现
+        count = self.count_tokens(text)
+        if inspect.isawaitable(count):
+            count = await count
+        return count
+    
+    async def _pack_prompts(self, prompts: List[str]) -> Tuple[List[List[int]], List[int]]:
+        """按 batch_size 与最大输入长度将提示词下标分组
+
+        Returns:
+            (各组提示词下标, 各组合并请求的输入 token 数)
+        """
+        header_tokens = await self._token_count(_BATCH_PROMPT_HEADER)
+        budget = self.get_max_input_length() - header_tokens
+        groups: List[List[int]] = []
+        group_tokens: List[int] = []
+        current: List[int] = []
+        used = 0
+        for i, prompt in enumerate(prompts):
+            cost = await self._token_count(f"[{i + 1}] {prompt}\n")
+            if current and (len(current) >= self.batch_size or used + cost > budget):
+                groups.append(current)
+                group_tokens.append(header_tokens + used)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            groups.append(current)
+            group_tokens.append(header_tokens + used)
+        return groups, group_tokens
+    
+    @staticmethod
+    def _parse_batch_response(text: str) -> Dict[str, Any]:
+        """解析合并请求的 JSON 回答（容忍代码块包裹等多余内容）"""
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            return {}
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    
+    async def _generate_group(self, prompts: List[str], input_tokens: int, **kwargs) -> List[str]:
+        """将一组提示词合并为一次请求，解析失败的任务单独重试
+
+        Args:
+            prompts: 本组提示词
+            input_tokens: 合并请求的输入 token 数（输出上限为上下文窗口减去该值）
+        """
+        if len(prompts) == 1:
+            return [await self.generate(prompts[0], **kwargs)]
+        body = "".join(f"[{n}] {p}\n" for n, p in enumerate(prompts, 1))
+        per_prompt = kwargs.get('max_tokens', 1500)
+        # get_max_tokens() 是输入与输出共享的上下文窗口，输出只能使用输入之外的部分
+        output_budget = max(1, self.get_max_tokens() - input_tokens)
+        merged_kwargs = dict(kwargs, max_tokens=min(per_prompt * len(prompts), output_budget))
+        try:
+            answers = self._parse_batch_response(
+                await self.generate(_BATCH_PROMPT_HEADER + body, **merged_kwargs)
+            )
+        except Exception:
+            answers = {}
+        results: List[Optional[str]] = [None] * len(prompts)
+        missing: List[int] = []
+        for n in range(len(prompts)):
+            answer = answers.get(str(n + 1))
+            if isinstance(answer, str) and answer:
+                results[n] = answer
+            else:
+                missing.append(n)
+        if missing:
+            retried = await asyncio.gather(*[self.generate(prompts[n], **kwargs) for n in missing])
+            for n, answer in zip(missing, retried):
+                results[n] = answer
+        return results
+    
+    async def generate_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """批量生成：将多个提示词合并为少量请求，分摊单次调用的固定开销
+        
+        每组最多 batch_size 个提示词且不超过最大输入长度；模型按编号返回 JSON，
+        缺失或无法解析的任务回退为单独调用。
+        
+        Args:
+            prompts: 提示词列表
+            **kwargs: 其他参数（max_tokens 为单个任务的上限）
+            
+        Returns:
+            与输入顺序一致的回复列表
+        """
+        if not prompts:
+            return []
+        groups, group_tokens = await self._pack_prompts(prompts)
+        grouped = await asyncio.gather(*[
+            self._generate_group([prompts[i] for i in group], tokens, **kwargs)
+            for group, tokens in zip(groups, group_tokens)
+        ])
+        results: List[str] = [""] * len(prompts)
+        for group, answers in zip(groups, grouped):
+            for i, answer in zip(group, answers):
+                results[i] = answer
+        return results
+    
     # Domain层接口实现
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """生成文本 - Domain层接口"""
@@ -87,13 +341,13 @@ class LLMProvider(LLMService):
             return False
         
         for msg in messages:
-            if not isinstance(msg, dict):
-                return False
-            if "role" not in msg or "content" not in msg:
+            if not isinstance(msg, dict) or "role" not in msg or "content" not in msg:
                 return False
-            if msg["role"] not in ["user", "assistant", "system"]:
+            role = msg["role"]
+            if not isinstance(role, str) or role not in _ALLOWED_ROLES:
                 return False
-            if not msg["content"] or not msg["content"].strip():
+            content = msg["content"]
+            if not content or content.isspace():
                 return False
         
         return True
@@ -1,9 +1,36 @@
+import json
 from typing import List, Dict, Any
-from openai import OpenAI
 
-from .base import LLMProvider
+from .base import LLMProvider, _ALLOWED_ROLES, _count_cjk, _merge_params, _params_key
 from ...infrastructure.config.config_manager import get_config
 
+# OpenAI模型的最大token数（按顺序取第一个子串匹配项）
+_MODEL_TOKEN_TABLE = (
+    ("gpt-3.5-turbo", 4096),
+    ("gpt-4-32k", 32768),
+    ("gpt-4", 8192),
+)
+_DEFAULT_MAX_TOKENS = 4096
+
+# 生成参数默认值及接口支持的参数
+_OPENAI_DEFAULTS = {"temperature": 0.7, "max_tokens": 1500, "top_p": 1.0}
+_OPENAI_SUPPORTED = frozenset(("temperature", "max_tokens", "top_p", "frequency_penalty", "presence_penalty"))
+
+def _canonicalize_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """规范化对话消息，使静态前缀在各请求间保持一致
+    
+    OpenAI 会自动缓存请求中相同的提示词前缀（命中部分不再重新计算且计费更低），
+    因此将开头连续的多条 system 消息合并为首条消息，避免拆分方式不同导致前缀不一致。
+    对话中间的 system 消息保持原位，不改变语义。
+    """
+    head = 0
+    while head < len(messages) and messages[head].get('role') == 'system':
+        head += 1
+    if head <= 1:
+        return messages
+    merged = {"role": "system", "content": "\n\n".join(msg['content'] for msg in messages[:head])}
+    return [merged] + list(messages[head:])
+
 class OpenAIChatGPTProvider(LLMProvider):
     """OpenAI ChatGPT实现"""
     
@@ -15,39 +42,77 @@ class OpenAIChatGPTProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("OpenAI API密钥未配置")
             
-        self.client = OpenAI(api_key=self.api_key)
+        # 首次实例化时才导入 openai SDK，未使用该提供者的部署不承担导入开销
+        from openai import AsyncOpenAI
+        
+        self.client = AsyncOpenAI(api_key=self.api_key)
+        # 最大token数只取决于模型名，构造时解析一次
+        self._max_tokens = next(
+            (tokens for name, tokens in _MODEL_TOKEN_TABLE if name in self.model),
+            _DEFAULT_MAX_TOKENS,
+        )
+        # 提示词 token 累计与其中命中服务端前缀缓存的部分
+        self._prompt_tokens = 0
+        self._cached_prompt_tokens = 0
+    
+    def _record_usage(self, response) -> None:
+        """累计响应中的提示词 token 与前缀缓存命中数"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        self._prompt_tokens += usage.prompt_tokens or 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        if details is not None:
+            self._cached_prompt_tokens += getattr(details, 'cached_tokens', None) or 0
     
     async def generate(self, prompt: str, **kwargs) -> str:
         """生成文本回复"""
-        try:
+        params = _merge_params(_OPENAI_DEFAULTS, _OPENAI_SUPPORTED, kwargs)
+        
+        async def _call() -> str:
             messages = [{"role": "user", "content": prompt}]
             
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                temperature=kwargs.get('temperature', 0.7),
-                max_tokens=kwargs.get('max_tokens', 1500),
-                top_p=kwargs.get('top_p', 1.0)
+                **params
             )
+            self._record_usage(response)
             
             return response.choices[0].message.content
-                
+        
+        try:
+            return await self._cached_call(
+                prompt,
+                f"openai:generate:{self.model}:{_params_key(params, _OPENAI_DEFAULTS)}",
+                _call,
+                use_cache=kwargs.get('use_cache', True),
+            )
         except Exception as e:
             raise Exception(f"OpenAI LLM服务错误: {str(e)}")
     
     async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
         """对话生成"""
-        try:
-            response = self.client.chat.completions.create(
+        params = _merge_params(_OPENAI_DEFAULTS, _OPENAI_SUPPORTED, kwargs)
+        messages = _canonicalize_messages(messages)
+        
+        async def _call() -> str:
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                temperature=kwargs.get('temperature', 0.7),
-                max_tokens=kwargs.get('max_tokens', 1500),
-                top_p=kwargs.get('top_p', 1.0)
+                **params
             )
+            self._record_usage(response)
             
             return response.choices[0].message.content
-                
+        
+        try:
+            return await self._cached_call(
+                json.dumps(messages, ensure_ascii=False),
+                f"openai:chat:{self.model}:{_params_key(params, _OPENAI_DEFAULTS)}",
+                _call,
+                use_cache=kwargs.get('use_cache', True),
+            )
         except Exception as e:
             raise Exception(f"OpenAI对话服务错误: {str(e)}")
     
@@ -57,18 +122,7 @@ class OpenAIChatGPTProvider(LLMProvider):
     
     def get_max_tokens(self) -> int:
         """获取最大token数"""
-        # OpenAI模型的最大token数
-        if "gpt-3.5-turbo" in self.model:
-            return 4096
-        elif "gpt-4" in self.model:
-            if "32k" in self.model:
-                return 32768
-            else:
-                return 8192
-        elif "gpt-4-turbo" in self.model:
-            return 128000
-        else:
-            return 4096  # 默认值
+        return self._max_tokens
     
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """生成文本"""
@@ -83,16 +137,14 @@ class OpenAIChatGPTProvider(LLMProvider):
         try:
             messages = [{"role": "user", "content": prompt}]
             
-            stream = self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
-                temperature=kwargs.get('temperature', 0.7),
-                max_tokens=kwargs.get('max_tokens', 1500),
-                top_p=kwargs.get('top_p', 1.0),
-                stream=True
+                stream=True,
+                **_merge_params(_OPENAI_DEFAULTS, _OPENAI_SUPPORTED, kwargs)
             )
             
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices[0].delta.content is not None:
                     yield chunk.choices[0].delta.content
                     
@@ -107,16 +159,14 @@ class OpenAIChatGPTProvider(LLMProvider):
     async def stream_chat(self, messages: List[Dict[str, str]], **kwargs):
         """流式对话生成 - Domain层接口"""
         try:
-            stream = self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=self.model,
-                messages=messages,
-                temperature=kwargs.get('temperature', 0.7),
-                max_tokens=kwargs.get('max_tokens', 1500),
-                top_p=kwargs.get('top_p', 1.0),
-                stream=True
+                messages=_canonicalize_messages(messages),
+                stream=True,
+                **_merge_params(_OPENAI_DEFAULTS, _OPENAI_SUPPORTED, kwargs)
             )
             
-            for chunk in stream:
+            async for chunk in stream:
                 if chunk.choices[0].delta.content is not None:
                     yield chunk.choices[0].delta.content
                     
@@ -134,20 +184,11 @@ class OpenAIChatGPTProvider(LLMProvider):
     
     def get_max_input_length(self) -> int:
         """获取最大输入长度"""
-        return self.get_max_tokens() - 1000  # 预留输出空间
+        return self._max_tokens - 1000  # 预留输出空间
     
     async def is_available(self) -> bool:
-        """检查服务可用性"""
-        try:
-            # 简单测试API连接
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=1
-            )
-            return True
-        except:
-            return False
+        """检查服务可用性（查询模型信息，不产生 token 计费；结果短时缓存）"""
+        return await self._cached_availability(lambda: self.client.models.retrieve(self.model))
     
     async def validate_messages(self, messages: List[Dict[str, str]]) -> bool:
         """验证消息格式"""
@@ -157,7 +198,8 @@ class OpenAIChatGPTProvider(LLMProvider):
         for msg in messages:
             if not isinstance(msg, dict) or 'role' not in msg or 'content' not in msg:
                 return False
-            if msg['role'] not in ['user', 'assistant', 'system']:
+            role = msg['role']
+            if not isinstance(role, str) or role not in _ALLOWED_ROLES:
                 return False
         
         return True
@@ -166,7 +208,7 @@ class OpenAIChatGPTProvider(LLMProvider):
         """估算token数量"""
         # 简单估算：英文按单词数的1.3倍，中文按字符数
         words = len(text.split())
-        chinese_chars = len([c for c in text if '\u4e00' <= c <= '\u9fff'])
+        chinese_chars = _count_cjk(text)
         return int(words * 1.3) + chinese_chars
     
     async def get_service_info(self) -> Dict[str, Any]:
@@ -177,7 +219,9 @@ class OpenAIChatGPTProvider(LLMProvider):
             "max_tokens": self.get_max_tokens(),
             "max_input_length": self.get_max_input_length(),
             "supports_streaming": True,
-            "api_key_configured": bool(self.api_key)
+            "api_key_configured": bool(self.api_key),
+            "prompt_tokens": self._prompt_tokens,
+            "cached_prompt_tokens": self._cached_prompt_tokens
         }
     
     async def get_supported_parameters(self) -> List[str]:
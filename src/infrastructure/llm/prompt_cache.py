@@ -0,0 +1,55 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class ExactPromptCache:
+    """进程内精确匹配响应缓存（LRU + TTL）
+
+    位于 SemanticLLMCache 之前：重试、评测循环、重复提问等场景会原样重放
+    同一 (llm_string, 提示词)，直接命中内存字典，无需访问 SQLite 或计算嵌入。
+    与 SemanticLLMCache 不同，提示词不做归一化，只有完全相同的请求才会命中。
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 86400):
+        if max_entries < 1:
+            raise ValueError(f"缓存容量必须为正整数: {max_entries}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # 键 -> (响应文本, 写入时间)，按访问顺序排列
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> bytes:
+        """以 llm_string 与提示词的 SHA-256 摘要作为键"""
+        hasher = hashlib.sha256()
+        hasher.update(llm_string.encode())
+        hasher.update(b"\0")
+        hasher.update(prompt.encode())
+        return hasher.digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """查找缓存的响应，未命中或已过期时返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > self.ttl_seconds:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: bytes, value: str) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,232 @@
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ...domain.interfaces import EmbeddingService
+
+# 提示词归一化：连续空白折叠为单个空格
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class SemanticLLMCache:
+    """LLM 响应语义缓存
+
+    查找顺序：
+    1. 精确匹配：以 (llm_string, 归一化提示词) 的 SHA-256 为键查询 SQLite；
+    2. 语义匹配：配置了嵌入服务时，将提示词向量化，与同一 llm_string 下
+       已缓存提示词的向量计算余弦相似度，不低于阈值即视为命中。
+
+    llm_string 由提供者、模型与采样参数组成，参数不同的调用互不命中。
+    条目超过 ttl_seconds 后失效。
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        embedding_service: Optional[EmbeddingService] = None,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: int = 86400,
+    ):
+        if not 0 < similarity_threshold <= 1:
+            raise ValueError(f"相似度阈值必须在 (0, 1] 范围内: {similarity_threshold}")
+        self.embedding_service = embedding_service
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+
+        path = Path(db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, llm_string TEXT NOT NULL, prompt TEXT NOT NULL, "
+            "embedding BLOB, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_llm_string ON llm_cache(llm_string)")
+        self._db.commit()
+        self._lock = threading.Lock()
+        # 语义检索用的内存矩阵：llm_string -> (键列表, 单位化向量矩阵, 写入时间)，三者按行一一对应
+        self._vectors: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]] = {}
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """归一化提示词（小写并折叠空白）"""
+        return _WHITESPACE_RE.sub(' ', prompt).strip().lower()
+
+    @staticmethod
+    def _make_key(prompt: str, llm_string: str) -> str:
+        hasher = hashlib.sha256()
+        hasher.update(llm_string.encode())
+        hasher.update(b"\0")
+        hasher.update(prompt.encode())
+        return hasher.hexdigest()
+
+    def _load_vectors(self, llm_string: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """从 SQLite 加载某个 llm_string 下全部带向量的条目（调用方持有锁）"""
+        entry = self._vectors.get(llm_string)
+        if entry is not None:
+            return entry
+        rows = self._db.execute(
+            "SELECT key, embedding, created_at FROM llm_cache "
+            "WHERE llm_string = ? AND embedding IS NOT NULL ORDER BY created_at",
+            (llm_string,),
+        ).fetchall()
+        if rows:
+            # 更换过嵌入模型时只保留与最新条目维度一致的向量
+            size = len(rows[-1][1])
+            rows = [row for row in rows if len(row[1]) == size]
+        keys = [row[0] for row in rows]
+        if rows:
+            matrix = np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        created = np.array([row[2] for row in rows], dtype=np.float64)
+        entry = (keys, matrix, created)
+        self._vectors[llm_string] = entry
+        return entry
+
+    def _compact_vectors(self, llm_string: str, expire_before: float) -> None:
+        """从内存矩阵中移除已过期的行（与 SQLite 中的过期清理保持一致，调用方持有锁）"""
+        entry = self._vectors.get(llm_string)
+        if entry is None:
+            return
+        keys, matrix, created = entry
+        alive = created >= expire_before
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        self._vectors[llm_string] = (
+            [keys[i] for i in keep],
+            matrix[keep] if matrix.size else matrix,
+            created[keep],
+        )
+
+    def _put_vector(self, llm_string: str, key: str, vector: np.ndarray, now: float) -> None:
+        """写入已加载的内存矩阵：键已存在时原地替换该行，否则追加（调用方持有锁）"""
+        entry = self._vectors.get(llm_string)
+        if entry is None:
+            # 尚未加载的 llm_string 在下次检索时从 SQLite 整体加载
+            return
+        keys, matrix, created = entry
+        if matrix.size and matrix.shape[1] != vector.shape[0]:
+            # 嵌入维度变化：丢弃内存矩阵，下次检索时按最新维度重新加载
+            self._vectors.pop(llm_string, None)
+            return
+        if key in keys:
+            row = keys.index(key)
+            matrix = matrix.copy()
+            matrix[row] = vector
+            created = created.copy()
+            created[row] = now
+            self._vectors[llm_string] = (keys, matrix, created)
+        else:
+            matrix = np.vstack([matrix, vector]) if matrix.size else vector[None, :]
+            self._vectors[llm_string] = (keys + [key], matrix, np.append(created, now))
+
+    async def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        if self.embedding_service is None:
+            return None
+        try:
+            vector = np.asarray(await self.embedding_service.embed_query(prompt), dtype=np.float32)
+        except Exception:
+            # 向量化失败时退化为仅精确匹配
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def _lookup_exact(self, key: str, expire_before: float) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None and row[1] >= expire_before:
+            return row[0]
+        return None
+
+    def _lookup_semantic(self, llm_string: str, query: np.ndarray, expire_before: float) -> Optional[str]:
+        with self._lock:
+            self._load_vectors(llm_string)
+            self._compact_vectors(llm_string, expire_before)
+            keys, matrix, _ = self._vectors[llm_string]
+            if not keys or matrix.shape[1] != query.shape[0]:
+                return None
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.similarity_threshold:
+                return None
+            row = self._db.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (keys[best],)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    async def lookup(self, prompt: str, llm_string: str) -> Optional[str]:
+        """查找缓存的响应
+
+        Args:
+            prompt: 提示词（对话时为序列化后的消息）
+            llm_string: 模型与采样参数标识
+
+        Returns:
+            命中时返回缓存的响应文本，否则返回 None
+        """
+        normalized = self.normalize_prompt(prompt)
+        expire_before = time.time() - self.ttl_seconds
+        # SQLite 读写与矩阵运算均在线程中执行，不阻塞事件循环
+        value = await asyncio.to_thread(
+            self._lookup_exact, self._make_key(normalized, llm_string), expire_before
+        )
+        if value is not None:
+            return value
+
+        query = await self._embed(normalized)
+        if query is None:
+            return None
+        return await asyncio.to_thread(self._lookup_semantic, llm_string, query, expire_before)
+
+    def _store(self, key: str, llm_string: str, normalized: str, vector: Optional[np.ndarray], value: str) -> None:
+        now = time.time()
+        expire_before = now - self.ttl_seconds
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, prompt, embedding, value, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, llm_string, normalized, vector.tobytes() if vector is not None else None, value, now),
+            )
+            self._db.execute("DELETE FROM llm_cache WHERE created_at < ?", (expire_before,))
+            self._db.commit()
+            if vector is not None:
+                self._put_vector(llm_string, key, vector, now)
+            elif llm_string in self._vectors and key in self._vectors[llm_string][0]:
+                # 覆盖为无向量的条目：旧向量已不在 SQLite 中，下次检索时重新加载
+                self._vectors.pop(llm_string, None)
+            # SQLite 已删除的过期条目同步移出各内存矩阵，矩阵大小不随运行时间无限增长
+            for cached in list(self._vectors):
+                self._compact_vectors(cached, expire_before)
+
+    async def update(self, prompt: str, llm_string: str, value: str) -> None:
+        """写入缓存
+
+        Args:
+            prompt: 提示词（对话时为序列化后的消息）
+            llm_string: 模型与采样参数标识
+            value: 响应文本
+        """
+        normalized = self.normalize_prompt(prompt)
+        key = self._make_key(normalized, llm_string)
+        vector = await self._embed(normalized)
+        await asyncio.to_thread(self._store, key, llm_string, normalized, vector, value)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._db.execute("DELETE FROM llm_cache")
+            self._db.commit()
+            self._vectors.clear()
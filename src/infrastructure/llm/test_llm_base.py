@@ -0,0 +1,174 @@
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from .base import LLMProvider
+from .prompt_cache import ExactPromptCache
+from .semantic_cache import SemanticLLMCache
+
+
+class FakeLLM(LLMProvider):
+    """记录调用的假模型：合并请求按编号返回 JSON，单独请求返回 answer:<提示词>"""
+
+    def __init__(self, max_tokens: int = 4000, max_input_length: int = 1000, batch_reply=None):
+        self.max_tokens = max_tokens
+        self.max_input_length = max_input_length
+        # 合并请求的回复函数，接收各任务提示词，返回模型输出文本
+        self.batch_reply = batch_reply
+        self.calls: List[Dict[str, Any]] = []
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        async def _call() -> str:
+            self.calls.append({'prompt': prompt, 'kwargs': kwargs})
+            tasks = [line.split('] ', 1)[1] for line in prompt.splitlines() if line.startswith('[')]
+            if tasks and self.batch_reply is not None:
+                return self.batch_reply(tasks)
+            return f"answer:{prompt}"
+        return await self._cached_call(prompt, f"fake:generate:{kwargs.get('temperature', 0)}", _call)
+
+    async def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        return await self.generate(json.dumps(messages, ensure_ascii=False), **kwargs)
+
+    def get_model_name(self) -> str:
+        return "fake"
+
+    def get_max_tokens(self) -> int:
+        return self.max_tokens
+
+    def get_max_input_length(self) -> int:
+        return self.max_input_length
+
+    async def generate_stream(self, prompt: str, **kwargs):
+        yield await self.generate(prompt, **kwargs)
+
+    async def stream_generate(self, prompt: str, **kwargs):
+        yield await self.generate(prompt, **kwargs)
+
+    async def stream_chat(self, messages: List[Dict[str, str]], **kwargs):
+        yield await self.chat(messages, **kwargs)
+
+    async def is_available(self) -> bool:
+        return True
+
+
+def _answer_all(tasks: List[str]) -> str:
+    return json.dumps({str(n): f"answer:{t}" for n, t in enumerate(tasks, 1)})
+
+
+class FakeEmbedding:
+    """按关键词构造向量的假嵌入服务：含 weather 的提示词彼此相似"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        return [1.0, 0.0] if 'weather' in text else [0.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_packs_prompts_into_groups():
+    llm = FakeLLM(batch_reply=_answer_all)
+    llm.batch_size = 3
+    prompts = [f"question {i}" for i in range(7)]
+    results = await llm.generate_batch(prompts)
+    print(f"[debug] batch calls={len(llm.calls)}")
+    assert results == [f"answer:{p}" for p in prompts], '结果应与输入顺序一致'
+    # 7 个提示词按 batch_size=3 分为 3/3/1 三组，最后一组单独调用
+    assert len(llm.calls) == 3, '应合并为 3 次请求'
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_respects_input_budget_and_output_cap():
+    llm = FakeLLM(max_tokens=60, max_input_length=40, batch_reply=_answer_all)
+    prompts = ["a b c d e f g h i j"] * 4
+    await llm.generate_batch(prompts, max_tokens=100)
+    merged = [c for c in llm.calls if c['prompt'].count('\n[') >= 1]
+    assert merged, '应存在合并请求'
+    for call in merged:
+        input_tokens = await llm.count_tokens(call['prompt'])
+        assert input_tokens <= llm.get_max_input_length(), '合并请求超出最大输入长度'
+        # 输出上限不超过上下文窗口中输入之外的部分
+        assert call['kwargs']['max_tokens'] <= llm.get_max_tokens() - input_tokens, '输出上限未扣除输入'
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_falls_back_for_missing_answers():
+    # 模型只回答第一个任务，其余任务应单独重试
+    llm = FakeLLM(batch_reply=lambda tasks: '```json\n{"1": "first"}\n```')
+    results = await llm.generate_batch(["p1", "p2", "p3"])
+    assert results == ["first", "answer:p2", "answer:p3"]
+    assert [c['prompt'] for c in llm.calls[1:]] == ["p2", "p3"], '缺失的任务应单独调用'
+
+    # 无法解析的回复全部回退
+    llm = FakeLLM(batch_reply=lambda tasks: 'not json')
+    assert await llm.generate_batch(["x", "y"]) == ["answer:x", "answer:y"]
+
+
+@pytest.mark.asyncio
+async def test_session_cache_memoizes_within_block():
+    llm = FakeLLM()
+    with llm.session_cache():
+        assert await llm.generate("hello") == "answer:hello"
+        assert await llm.generate("hello") == "answer:hello"
+        assert len(llm.calls) == 1, '会话内相同请求只应调用一次模型'
+        await llm.generate("hello", temperature=0.5)
+        assert len(llm.calls) == 2, '参数不同的请求不应命中'
+    await llm.generate("hello")
+    assert len(llm.calls) == 3, '离开会话后缓存应失效'
+
+
+@pytest.mark.asyncio
+async def test_exact_prompt_cache_hits_and_misses():
+    llm = FakeLLM()
+    llm.set_prompt_cache(ExactPromptCache(max_entries=2))
+    await llm.generate("one")
+    await llm.generate("one")
+    assert len(llm.calls) == 1, '相同提示词应命中进程内缓存'
+    await llm.generate("One")
+    assert len(llm.calls) == 2, '进程内缓存不做归一化，大小写不同应未命中'
+    await llm.generate("two")
+    await llm.generate("one")
+    assert len(llm.calls) == 4, '超出容量后最久未使用的条目应被淘汰'
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_exact_and_semantic_hits():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        embedding = FakeEmbedding()
+        cache = SemanticLLMCache(str(Path(tmpdir) / 'llm_cache.sqlite'), embedding, similarity_threshold=0.9)
+        llm = FakeLLM()
+        llm.set_cache(cache)
+
+        assert await llm.generate("What is the weather today?") == "answer:What is the weather today?"
+        # 归一化后完全相同：精确命中
+        assert await llm.generate("  what is the WEATHER today?") == "answer:What is the weather today?"
+        # 措辞不同但向量相似：语义命中
+        assert await llm.generate("weather forecast please") == "answer:What is the weather today?"
+        assert len(llm.calls) == 1, '精确与语义命中均不应调用模型'
+        # 向量不相似：未命中
+        assert await llm.generate("tell me a joke") == "answer:tell me a joke"
+        assert len(llm.calls) == 2
+
+        # 同一键重复写入时替换内存矩阵中的行而不是追加
+        await cache.update("tell me a joke", "fake:generate:0", "again")
+        keys, matrix, _ = cache._vectors["fake:generate:0"]
+        assert len(keys) == len(set(keys)) == matrix.shape[0] == 2, '内存矩阵出现重复行'
+
+
+@pytest.mark.asyncio
+async def test_layers_populate_l1_from_l2_hit():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = SemanticLLMCache(str(Path(tmpdir) / 'llm_cache.sqlite'))
+        await cache.update("hi", "fake:generate:0", "from-l2")
+        llm = FakeLLM()
+        llm.set_cache(cache)
+        llm.set_prompt_cache(ExactPromptCache())
+        assert await llm.generate("hi") == "from-l2"
+        assert len(llm.prompt_cache) == 1, 'L2 命中后应回填 L1'
+        cache.clear()
+        assert await llm.generate("hi") == "from-l2", 'L1 应直接命中'
+        assert llm.calls == []
@@ -1,11 +1,74 @@
+import importlib
+import os
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from collections import OrderedDict
+from dataclasses import replace
+from functools import lru_cache
+from typing import Callable, List, Optional
 
 from ...infrastructure.log.logger_service import LoggerService
 from ..splitters.types import InfraDocument  # 复用基础设施层的文档类型
 from .types import InfraLoaderConfig
 
 
+# 读取文件时的缓冲区大小（默认 8 KiB 对大文件会产生大量小块 read 调用）
+_READ_BUFFER_SIZE = 1 << 20
+
+# 一个或多个连续空行（仅含空白字符的行也算空行）
+_BLANK_LINES_RE = re.compile(r'\n(?:[^\S\n]*\n)+')
+
+
+def _normalize_text(content: str) -> str:
+    """去除首尾空白并将换行符统一为 \\n"""
+    content = content.strip()
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _collapse_blank_lines(content: str) -> str:
+    """将连续空行合并为一个空行（空行中的空白字符一并去除），单次正则扫描完成"""
+    return _BLANK_LINES_RE.sub('\n\n', content)
+
+
+# 解析结果缓存：(加载器类型, 加载参数, 绝对路径, 修改时间, 文件大小) -> 文档列表
+_DOC_CACHE_MAX_ENTRIES = 256
+_DOC_CACHE: "OrderedDict[tuple, List[InfraDocument]]" = OrderedDict()
+_DOC_CACHE_LOCK = threading.Lock()
+
+
+def clear_document_cache() -> None:
+    """清空文档解析结果缓存"""
+    with _DOC_CACHE_LOCK:
+        _DOC_CACHE.clear()
+
+
+def _copy_documents(documents: List[InfraDocument]) -> List[InfraDocument]:
+    """浅拷贝文档及其元数据，调用方修改返回结果不会影响缓存"""
+    return [replace(doc, metadata=dict(doc.metadata)) for doc in documents]
+
+
+def _ext(file_path: str) -> str:
+    """获取文件扩展名（小写、不带点），与 Path(file_path).suffix 的取法一致"""
+    return os.path.splitext(file_path)[1][1:].lower()
+
+
+@lru_cache(maxsize=None)
+def _get_langchain_loader(name: str):
+    """按需导入 langchain_community 中的文档加载器类
+
+    首次用到时才导入 langchain_community，未使用的加载器不增加启动耗时与内存；
+    未安装时返回 None（结果缓存，只尝试导入一次）。
+    """
+    try:
+        module = importlib.import_module("langchain_community.document_loaders")
+        return getattr(module, name)
+    except (ImportError, AttributeError):
+        return None
+
+
 class InfraDocumentLoader(ABC):
     """基础设施层的文档加载器抽象基类
 
@@ -17,9 +80,10 @@ class InfraDocumentLoader(ABC):
         self.logger = logger
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def get_file_extension(file_path: str) -> str:
-        """获取文件扩展名（不带点）"""
-        return file_path.lower().split('.')[-1]
+        """获取文件扩展名（不带点，结果按路径缓存）"""
+        return file_path.rsplit('.', 1)[-1].lower()
 
     @abstractmethod
     def supports_file_type(self, file_path: str) -> bool:
@@ -36,3 +100,43 @@ class InfraDocumentLoader(ABC):
         """加载指定路径的文档，返回基础设施层文档列表"""
         raise NotImplementedError
 
+    def _cache_params(self) -> tuple:
+        """影响解析结果的加载器参数，作为缓存键的一部分"""
+        return ()
+
+    def _load_cached(
+        self, file_path: str, load_fn: Callable[[str], List[InfraDocument]]
+    ) -> List[InfraDocument]:
+        """按 (路径, 修改时间, 大小) 缓存解析结果，文件未变化时跳过解析
+
+        Args:
+            file_path: 文件路径
+            load_fn: 实际执行解析的函数
+
+        Returns:
+            文档列表（每次返回新的副本）
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # 文件不存在等情况交给解析函数按原有方式报错
+            return load_fn(file_path)
+        key = (
+            type(self),
+            self._cache_params(),
+            os.path.abspath(file_path),
+            st.st_mtime_ns,
+            st.st_size,
+        )
+        with _DOC_CACHE_LOCK:
+            documents = _DOC_CACHE.get(key)
+            if documents is not None:
+                _DOC_CACHE.move_to_end(key)
+        if documents is None:
+            documents = load_fn(file_path)
+            with _DOC_CACHE_LOCK:
+                _DOC_CACHE[key] = documents
+                while len(_DOC_CACHE) > _DOC_CACHE_MAX_ENTRIES:
+                    _DOC_CACHE.popitem(last=False)
+        return _copy_documents(documents)
+
@@ -1,9 +1,13 @@
-from typing import List, Optional
-from pathlib import Path
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import List, Optional, Union
 
 from ..splitters.types import InfraDocument
 from ...infrastructure.log.logger_service import LoggerService
-from .factory import DocumentLoaderFactory
+from .base import _ext
+from .factory import DocumentLoaderFactory, get_default_factory
 
 
 class DocumentLoaderServiceImpl:
@@ -12,9 +16,10 @@ class DocumentLoaderServiceImpl:
     根据文件后缀调用不同的infrastructure/loaders具体实现类
     """
     
-    def __init__(self, logger: Optional[LoggerService] = None):
+    def __init__(self, logger: Optional[LoggerService] = None, loader_factory: Optional[DocumentLoaderFactory] = None):
         self.logger = logger
-        self.loader_factory = DocumentLoaderFactory(logger)
+        # 默认使用进程内共享的加载器工厂，避免每个服务实例重复创建加载器
+        self.loader_factory = loader_factory or get_default_factory(logger)
     
     def load_document(self, file_path: str) -> List[InfraDocument]:
         """加载单个文档
@@ -30,22 +35,72 @@ class DocumentLoaderServiceImpl:
             ValueError: 文件格式不支持或内容无效
         """
         # 验证文件存在
-        if not Path(file_path).exists():
+        if not os.path.exists(file_path):
             raise FileNotFoundError(f"文件不存在: {file_path}")
         
-        # 获取适合的加载器
-        loader = self.loader_factory.get_loader(file_path)
+        # 获取适合的加载器（扩展名只解析一次）
+        extension = _ext(file_path)
+        loader = self.loader_factory.get_loader_for_ext(extension)
         if not loader:
-            extension = Path(file_path).suffix.lower().lstrip('.')
             raise ValueError(f"不支持的文件类型: .{extension}")
         
         if self.logger:
-            self.logger.info(f"使用 {loader.__class__.__name__} 加载文档: {file_path}")
+            self.logger.info("使用 %s 加载文档: %s", loader.__class__.__name__, file_path)
         
         # 加载文档
         documents = loader.load(file_path)
         
         if self.logger:
-            self.logger.info(f"从 {file_path} 加载了 {len(documents)} 个文档")
+            self.logger.info("从 %s 加载了 %s 个文档", file_path, len(documents))
         
         return documents
+    
+    async def load_document_async(self, file_path: str, executor: Optional[Executor] = None) -> List[InfraDocument]:
+        """异步加载单个文档（在线程池或指定执行器中解析，不阻塞事件循环）
+        
+        Args:
+            file_path: 文件路径
+            executor: 执行器；PDF/DOCX 等 CPU 密集格式可传入 ProcessPoolExecutor 绕开 GIL。
+                线程池等执行器使用本实例的 loader_factory 与 logger；进程池只能执行可序列化的
+                模块级函数，子进程中使用其默认加载器工厂，注入的 loader_factory 与 logger 不生效
+            
+        Returns:
+            文档列表
+        """
+        if executor is None:
+            return await asyncio.to_thread(self.load_document, file_path)
+        loop = asyncio.get_running_loop()
+        if isinstance(executor, ProcessPoolExecutor):
+            if self.logger and self.loader_factory is not get_default_factory():
+                self.logger.warning("进程池中使用默认加载器工厂，注入的 loader_factory 不生效: %s", file_path)
+            return await loop.run_in_executor(executor, _load_file, file_path)
+        return await loop.run_in_executor(executor, partial(self.load_document, file_path))
+    
+    async def load_documents(
+        self,
+        file_paths: List[str],
+        concurrency: int = 8,
+        executor: Optional[Executor] = None,
+    ) -> List[Union[List[InfraDocument], Exception]]:
+        """并发加载多个文档
+        
+        Args:
+            file_paths: 文件路径列表
+            concurrency: 同时解析的最大文件数
+            executor: 执行器，默认使用 asyncio 的线程池
+            
+        Returns:
+            与 file_paths 一一对应的结果：加载成功为文档列表，失败为对应的异常
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def _load(file_path: str) -> List[InfraDocument]:
+            async with semaphore:
+                return await self.load_document_async(file_path, executor)
+        
+        return await asyncio.gather(*(_load(path) for path in file_paths), return_exceptions=True)
+
+
+def _load_file(file_path: str) -> List[InfraDocument]:
+    """在进程池中加载单个文件（模块级函数，可被序列化；使用子进程的默认加载器工厂）"""
+    return DocumentLoaderServiceImpl(loader_factory=get_default_factory()).load_document(file_path)
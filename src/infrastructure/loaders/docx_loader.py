@@ -1,13 +1,9 @@
+import io
 from typing import List, Dict, Any, Optional
 
-try:
-    from langchain_community.document_loaders import UnstructuredWordDocumentLoader
-except ImportError:
-    UnstructuredWordDocumentLoader = None
-
 from ...infrastructure.log.logger_service import LoggerService
 from ..splitters.types import InfraDocument
-from .base import InfraDocumentLoader
+from .base import InfraDocumentLoader, _get_langchain_loader, _normalize_text
 
 
 class DocxDocumentLoader(InfraDocumentLoader):
@@ -20,13 +16,13 @@ class DocxDocumentLoader(InfraDocumentLoader):
         self.logger = logger
 
     def supports_file_type(self, file_path: str) -> bool:
-        return file_path.lower().endswith(".docx")
+        return self.get_file_extension(file_path) == "docx"
 
     def get_supported_extensions(self) -> List[str]:
         return ["docx"]
 
     def load(self, file_path: str) -> List[InfraDocument]:
-        return self._load_documents(file_path)
+        return self._load_cached(file_path, self._load_documents)
 
     def _create_document(self, content: str, metadata: Dict[str, Any] = None) -> InfraDocument:
         if metadata is None:
@@ -36,37 +32,40 @@ class DocxDocumentLoader(InfraDocumentLoader):
     def _clean_content(self, content: str) -> str:
         if not content:
             return ""
-        content = content.strip()
-        content = content.replace("\r\n", "\n").replace("\r", "\n")
-        return content
+        return _normalize_text(content)
 
     def _load_documents(self, file_path: str) -> List[InfraDocument]:
-        if UnstructuredWordDocumentLoader is not None:
+        if _get_langchain_loader("UnstructuredWordDocumentLoader") is not None:
             return self._load_with_langchain(file_path)
         return self._load_with_builtin(file_path)
 
     def _load_with_langchain(self, file_path: str) -> List[InfraDocument]:
         try:
-            loader = UnstructuredWordDocumentLoader(file_path)
+            loader = _get_langchain_loader("UnstructuredWordDocumentLoader")(file_path)
             lc_docs = loader.load()
             documents: List[Document] = []
             for lc in lc_docs:
-                metadata = dict(lc.metadata) if lc.metadata else {}
+                metadata = lc.metadata or {}
                 doc = self._create_document(content=self._clean_content(lc.page_content), metadata=metadata)
                 documents.append(doc)
             return documents
         except Exception as e:
             if self.logger:
-                self.logger.warning(f"使用 UnstructuredWordDocumentLoader 加载失败，回退到内置实现: {e}")
+                self.logger.warning("使用 UnstructuredWordDocumentLoader 加载失败，回退到内置实现: %s", e)
             return self._load_with_builtin(file_path)
 
     def _load_with_builtin(self, file_path: str) -> List[InfraDocument]:
         try:
             import docx  # python-docx
             d = docx.Document(str(file_path))
-            paragraphs = [p.text for p in d.paragraphs if p.text]
-            content = "\n".join(paragraphs)
-            content = self._clean_content(content)
+            # 逐段写入缓冲区，不再构建段落文本列表；p.text 每次访问都会重新拼接 run，只取一次
+            buf = io.StringIO()
+            for p in d.paragraphs:
+                text = p.text
+                if text:
+                    buf.write(text)
+                    buf.write("\n")
+            content = self._clean_content(buf.getvalue())
             if not content:
                 return []
             meta = {
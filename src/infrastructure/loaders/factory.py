@@ -1,7 +1,7 @@
-from typing import Dict, List, Optional, Type
-from pathlib import Path
+import threading
+from typing import Callable, Dict, List, Optional, Type
 
-from .base import InfraDocumentLoader
+from .base import InfraDocumentLoader, _ext
 from ...infrastructure.log.logger_service import LoggerService
 from .json_loader import JsonDocumentLoader
 from .markdown_loader import MarkdownDocumentLoader
@@ -18,34 +18,35 @@ class DocumentLoaderFactory:
     
     def __init__(self, logger: Optional[LoggerService] = None):
         self.logger = logger
-        self._loaders: Dict[str, InfraDocumentLoader] = {}
+        # 扩展名 -> 加载器构造函数；同一构造函数对应的扩展名共用一个实例
+        self._loader_ctors: Dict[str, Callable[[], InfraDocumentLoader]] = {}
+        # 已创建的加载器实例，首次用到对应扩展名时才构造
+        self._loaders: Dict[Callable[[], InfraDocumentLoader], InfraDocumentLoader] = {}
+        self._lock = threading.Lock()
         
         # 注册默认加载器
         self._register_default_loaders()
     
     def _register_default_loaders(self):
-        """注册默认的文档加载器"""
+        """注册默认的文档加载器（仅登记构造函数，不创建实例）"""
         # 注册JSON加载器
-        json_loader = JsonDocumentLoader()
-        self._loaders['json'] = json_loader
+        self._loader_ctors['json'] = JsonDocumentLoader
 
         # 注册Markdown加载器
-        markdown_loader = MarkdownDocumentLoader()
-        self._loaders['md'] = markdown_loader
-        self._loaders['markdown'] = markdown_loader
+        self._loader_ctors['md'] = MarkdownDocumentLoader
+        self._loader_ctors['markdown'] = MarkdownDocumentLoader
 
         # 注册PDF加载器
-        pdf_loader = PdfDocumentLoader(self.logger)
-        self._loaders['pdf'] = pdf_loader
+        pdf_loader = lambda: PdfDocumentLoader(self.logger)
+        self._loader_ctors['pdf'] = pdf_loader
 
         # 注册Text加载器
-        text_loader = TextDocumentLoader(self.logger)
-        self._loaders['txt'] = text_loader
-        self._loaders['text'] = text_loader
+        text_loader = lambda: TextDocumentLoader(self.logger)
+        self._loader_ctors['txt'] = text_loader
+        self._loader_ctors['text'] = text_loader
 
         # 注册DOCX加载器
-        docx_loader = DocxDocumentLoader(self.logger)
-        self._loaders['docx'] = docx_loader
+        self._loader_ctors['docx'] = lambda: DocxDocumentLoader(self.logger)
         
         if self.logger:
             self.logger.info("已注册默认文档加载器")
@@ -60,13 +61,43 @@ class DocumentLoaderFactory:
         Returns:
             适合的加载器实例，如果没有找到则返回None
         """
-        file_path_obj = Path(file_path)
-        extension = file_path_obj.suffix.lower().lstrip('.')
+        return self.get_loader_for_ext(_ext(file_path))
+    
+    def get_loader_for_ext(self, extension: str) -> Optional[InfraDocumentLoader]:
+        """按扩展名获取加载器（调用方已解析出扩展名时使用，避免重复解析路径）
         
+        Args:
+            extension: 小写、不带点的文件扩展名
+            
+        Returns:
+            适合的加载器实例，如果没有找到则返回None
+        """
         # 检查加载器
-        if extension in self._loaders:
-            return self._loaders[extension]
+        ctor = self._loader_ctors.get(extension)
+        if ctor is not None:
+            loader = self._loaders.get(ctor)
+            if loader is None:
+                with self._lock:
+                    loader = self._loaders.get(ctor)
+                    if loader is None:
+                        loader = ctor()
+                        self._loaders[ctor] = loader
+            return loader
         
         if self.logger:
-            self.logger.warning(f"未找到适合文件类型 .{extension} 的加载器")
+            self.logger.warning("未找到适合文件类型 .%s 的加载器", extension)
         return None
+
+
+_default_factory: Optional[DocumentLoaderFactory] = None
+_default_factory_lock = threading.Lock()
+
+
+def get_default_factory(logger: Optional[LoggerService] = None) -> DocumentLoaderFactory:
+    """获取进程内共享的文档加载器工厂（首次调用时创建，logger 以首次传入的为准）"""
+    global _default_factory
+    if _default_factory is None:
+        with _default_factory_lock:
+            if _default_factory is None:
+                _default_factory = DocumentLoaderFactory(logger)
+    return _default_factory
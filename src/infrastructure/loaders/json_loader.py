@@ -1,17 +1,45 @@
 import json
-from typing import List, Dict, Any, Union
+import os
+from typing import List, Dict, Any, Iterator, Union
 
 try:
-    from langchain_community.document_loaders import JSONLoader
+    import orjson as _orjson
 except ImportError:
-    # 如果langchain未安装，提供备用实现
-    JSONLoader = None
-    LangchainDocument = None
+    _orjson = None
+
+try:
+    import ijson as _ijson
+except ImportError:
+    _ijson = None
 
 from ..splitters.types import InfraDocument
-from .base import InfraDocumentLoader
+from .base import InfraDocumentLoader, _collapse_blank_lines, _get_langchain_loader, _normalize_text
 from pathlib import Path
 
+# 未指定 content_key 时依次尝试的内容字段，这些字段均不计入元数据
+_CONTENT_FIELDS = ('content', 'text', 'description', 'body', 'message')
+
+# 超过该大小的顶层数组使用 ijson 流式解析，避免整棵对象树同时驻留内存
+_STREAM_MIN_SIZE = 50 * 1024 * 1024
+
+
+def _loads(raw: bytes) -> Any:
+    """解析 JSON 字节串，优先使用 orjson"""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            # orjson 不接受 NaN/Infinity 等标准库允许的扩展写法，交给标准库再试一次
+            pass
+    return json.loads(raw)
+
+
+def _starts_with_array(f) -> bool:
+    """判断文件内容是否以 JSON 数组开头（读取后恢复文件位置）"""
+    head = f.read(4096).lstrip()
+    f.seek(0)
+    return head[:1] == b'['
+
 
 class JsonDocumentLoader(InfraDocumentLoader):
     """JSON文档加载器
@@ -53,10 +81,14 @@ class JsonDocumentLoader(InfraDocumentLoader):
             FileNotFoundError: 文件不存在
             ValueError: 文件格式不支持或内容无效
         """
-        return self._load_documents(file_path)
+        return self._load_cached(file_path, self._load_documents)
     
 
     
+    def _cache_params(self) -> tuple:
+        """缓存键参数：JQ 查询模式、内容字段名"""
+        return (self.jq_schema, self.content_key)
+
     def _create_document(self, content: str, metadata: Dict[str, Any] = None) -> InfraDocument:
         """创建文档对象"""
         if metadata is None:
@@ -67,22 +99,10 @@ class JsonDocumentLoader(InfraDocumentLoader):
         """清理文档内容"""
         if not content:
             return ""
-        # 移除多余的空白字符
-        content = content.strip()
-        # 规范化换行符
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
+        # 移除多余的空白字符并规范化换行符
+        content = _normalize_text(content)
         # 移除多余的空行
-        lines = content.split('\n')
-        cleaned_lines = []
-        prev_empty = False
-        for line in lines:
-            if line.strip():
-                cleaned_lines.append(line)
-                prev_empty = False
-            elif not prev_empty:
-                cleaned_lines.append('')
-                prev_empty = True
-        return '\n'.join(cleaned_lines)
+        return _collapse_blank_lines(content)
     
     def _load_documents(self, file_path: str) -> List[InfraDocument]:
         """加载JSON文档
@@ -93,7 +113,7 @@ class JsonDocumentLoader(InfraDocumentLoader):
         Returns:
             文档列表
         """
-        if JSONLoader is not None:
+        if _get_langchain_loader("JSONLoader") is not None:
             return self._load_with_langchain(file_path)
         else:
             return self._load_with_builtin(file_path)
@@ -109,7 +129,7 @@ class JsonDocumentLoader(InfraDocumentLoader):
                 loader_kwargs['content_key'] = self.content_key
             
             # 创建langchain加载器
-            loader = JSONLoader(file_path, **loader_kwargs)
+            loader = _get_langchain_loader("JSONLoader")(file_path, **loader_kwargs)
             
             # 加载文档
             langchain_docs = loader.load()
@@ -118,7 +138,7 @@ class JsonDocumentLoader(InfraDocumentLoader):
             documents = []
             for i, lc_doc in enumerate(langchain_docs):
                 # 提取元数据
-                metadata = dict(lc_doc.metadata) if lc_doc.metadata else {}
+                metadata = lc_doc.metadata or {}
                 
                 # 创建我们的Document对象
                 doc = self._create_document(
@@ -132,44 +152,52 @@ class JsonDocumentLoader(InfraDocumentLoader):
             
         except Exception as e:
             if self.logger:
-                self.logger.error(f"使用langchain加载JSON失败: {e}")
+                self.logger.error("使用langchain加载JSON失败: %s", e)
             # 回退到内置实现
             return self._load_with_builtin(file_path)
     
     def _load_with_builtin(self, file_path: str) -> List[InfraDocument]:
         """使用内置方法加载JSON文档"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            documents = []
-            
-            if isinstance(data, list):
-                # 如果是数组，为每个元素创建一个文档
-                for i, item in enumerate(data):
-                    content, metadata = self._extract_content_and_metadata(item, i)
-                    doc = self._create_document(content=content, metadata=metadata)
-                    documents.append(doc)
-            
-            elif isinstance(data, dict):
-                # 如果是单个对象，创建一个文档
-                content, metadata = self._extract_content_and_metadata(data, 0)
-                doc = self._create_document(content=content, metadata=metadata)
-                documents.append(doc)
-            
-            else:
-                # 如果是基本类型，直接作为内容
-                content = str(data)
-                doc = self._create_document(content=content)
-                documents.append(doc)
-            
-            return documents
-            
+            return list(self._iter_builtin_documents(file_path))
         except json.JSONDecodeError as e:
             raise ValueError(f"JSON格式错误: {e}")
         except Exception as e:
             raise ValueError(f"加载JSON文件失败: {e}")
     
+    def _iter_builtin_documents(self, file_path: str) -> Iterator[InfraDocument]:
+        """逐个生成JSON文档
+        
+        大文件且顶层为数组时用 ijson 流式解析，逐个元素生成文档；
+        其余情况读取整个文件后用 orjson（未安装时为标准库 json）解析。
+        """
+        with open(file_path, 'rb') as f:
+            if (_ijson is not None
+                    and os.fstat(f.fileno()).st_size >= _STREAM_MIN_SIZE
+                    and _starts_with_array(f)):
+                # 如果是数组，为每个元素创建一个文档
+                for i, item in enumerate(_ijson.items(f, 'item', use_float=True)):
+                    content, metadata = self._extract_content_and_metadata(item, i)
+                    yield self._create_document(content=content, metadata=metadata)
+                return
+            data = _loads(f.read())
+        
+        if isinstance(data, list):
+            # 如果是数组，为每个元素创建一个文档
+            for i, item in enumerate(data):
+                content, metadata = self._extract_content_and_metadata(item, i)
+                yield self._create_document(content=content, metadata=metadata)
+        
+        elif isinstance(data, dict):
+            # 如果是单个对象，创建一个文档
+            content, metadata = self._extract_content_and_metadata(data, 0)
+            yield self._create_document(content=content, metadata=metadata)
+        
+        else:
+            # 如果是基本类型，直接作为内容
+            content = str(data)
+            yield self._create_document(content=content)
+    
     def _extract_content_and_metadata(self, item: Union[Dict, Any], index: int) -> tuple[str, Dict[str, Any]]:
         """从JSON项目中提取内容和元数据
         
@@ -182,15 +210,16 @@ class JsonDocumentLoader(InfraDocumentLoader):
         """
         if isinstance(item, dict):
             # 如果指定了内容字段，使用该字段作为内容
-            if self.content_key and self.content_key in item:
-                content = str(item[self.content_key])
-                metadata = {k: v for k, v in item.items() if k != self.content_key}
+            content_key = self.content_key
+            if content_key and content_key in item:
+                # 复制后删除内容字段，由 C 层完成，不逐键执行推导式
+                metadata = dict(item)
+                content = str(metadata.pop(content_key))
             else:
                 # 否则，尝试找到可能的内容字段
-                content_fields = ['content', 'text', 'description', 'body', 'message']
                 content = None
                 
-                for field in content_fields:
+                for field in _CONTENT_FIELDS:
                     if field in item:
                         content = str(item[field])
                         break
@@ -201,7 +230,9 @@ class JsonDocumentLoader(InfraDocumentLoader):
                     metadata = {'json_type': 'object'}
                 else:
                     # 其他字段作为元数据
-                    metadata = {k: v for k, v in item.items() if k not in content_fields}
+                    metadata = dict(item)
+                    for field in _CONTENT_FIELDS:
+                        metadata.pop(field, None)
             
             # 添加索引信息
             metadata['item_index'] = index
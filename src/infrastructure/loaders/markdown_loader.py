@@ -2,17 +2,15 @@ import re
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-try:
-    from langchain_community.document_loaders import UnstructuredMarkdownLoader
-    from langchain.schema import Document as LangchainDocument
-except ImportError:
-    # 如果langchain未安装，提供备用实现
-    UnstructuredMarkdownLoader = None
-    LangchainDocument = None
-
 from ...infrastructure.log.logger_service import LoggerService
 from ..splitters.types import InfraDocument
-from .base import InfraDocumentLoader
+from .base import InfraDocumentLoader, _collapse_blank_lines, _get_langchain_loader, _normalize_text
+
+# Markdown 标题（在整段文本上查找，空白不跨行）。以字面量 # 开头便于正则引擎
+# 快速跳过正文；不使用 ^ 锚定，是否位于行首由调用方检查
+_HEADER_RE = re.compile(r'#(#{0,5})[^\S\n]+(.+)$', re.MULTILINE)
+# 仅含空白字符的行（连同其前面的换行符）
+_BLANK_LINE_RE = re.compile(r'\n[^\S\n]*(?=\n|\Z)')
 
 
 class MarkdownDocumentLoader(InfraDocumentLoader):
@@ -56,10 +54,14 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
             FileNotFoundError: 文件不存在
             ValueError: 文件格式不支持或内容无效
         """
-        return self._load_documents(file_path)
+        return self._load_cached(file_path, self._load_documents)
     
 
     
+    def _cache_params(self) -> tuple:
+        """缓存键参数：是否按标题分割、块大小"""
+        return (self.split_by_headers, self.chunk_size)
+
     def _create_document(self, content: str, metadata: Dict[str, Any] = None) -> InfraDocument:
         """创建文档对象"""
         if metadata is None:
@@ -70,22 +72,10 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         """清理文档内容"""
         if not content:
             return ""
-        # 移除多余的空白字符
-        content = content.strip()
-        # 规范化换行符
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
+        # 移除多余的空白字符并规范化换行符
+        content = _normalize_text(content)
         # 移除多余的空行
-        lines = content.split('\n')
-        cleaned_lines = []
-        prev_empty = False
-        for line in lines:
-            if line.strip():
-                cleaned_lines.append(line)
-                prev_empty = False
-            elif not prev_empty:
-                cleaned_lines.append('')
-                prev_empty = True
-        return '\n'.join(cleaned_lines)
+        return _collapse_blank_lines(content)
     
     def _load_documents(self, file_path: str) -> List[InfraDocument]:
         """加载Markdown文档
@@ -96,7 +86,7 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         Returns:
             文档列表
         """
-        if UnstructuredMarkdownLoader is not None:
+        if _get_langchain_loader("UnstructuredMarkdownLoader") is not None:
             return self._load_with_langchain(file_path)
         else:
             return self._load_with_builtin(file_path)
@@ -105,7 +95,7 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         """使用langchain加载Markdown文档"""
         try:
             # 创建langchain加载器
-            loader = UnstructuredMarkdownLoader(file_path)
+            loader = _get_langchain_loader("UnstructuredMarkdownLoader")(file_path)
             
             # 加载文档
             langchain_docs = loader.load()
@@ -114,7 +104,7 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
             documents = []
             for i, lc_doc in enumerate(langchain_docs):
                 # 提取元数据
-                metadata = dict(lc_doc.metadata) if lc_doc.metadata else {}
+                metadata = lc_doc.metadata or {}
                 
                 # 如果需要按标题分割，进行进一步处理
                 if self.split_by_headers:
@@ -132,7 +122,7 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
             
         except Exception as e:
             if self.logger:
-                self.logger.error(f"使用langchain加载Markdown失败: {e}")
+                self.logger.error("使用langchain加载Markdown失败: %s", e)
             # 回退到内置实现
             return self._load_with_builtin(file_path)
     
@@ -183,44 +173,45 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         
         documents = []
         
-        # 使用正则表达式匹配标题
-        header_pattern = r'^(#{1,6})\s+(.+)$'
-        lines = content.split('\n')
-        
+        # 章节正文只记录在原文中的起始位置，遇到下一个标题时直接切片，无需逐行拆分再拼接
         current_section = {
             'title': '',
             'level': 0,
-            'content': [],
+            'body_start': 0,
             'line_start': 0
         }
+        line_no = 0
+        pos = 0
         
-        for i, line in enumerate(lines):
-            header_match = re.match(header_pattern, line, re.MULTILINE)
+        for header_match in _HEADER_RE.finditer(content):
+            header_start = header_match.start()
+            if header_start and content[header_start - 1] != '\n':
+                continue
+            line_no += content.count('\n', pos, header_start)
+            pos = header_start
             
-            if header_match:
-                # 保存当前section
-                if current_section['content'] or current_section['title']:
-                    doc = self._create_section_document(current_section, base_metadata, i)
-                    if doc:
-                        documents.append(doc)
-                
-                # 开始新section
-                level = len(header_match.group(1))
-                title = header_match.group(2).strip()
-                
-                current_section = {
-                    'title': title,
-                    'level': level,
-                    'content': [],
-                    'line_start': i
-                }
-            else:
-                # 添加到当前section
-                current_section['content'].append(line)
+            # 保存当前section（正文不含标题前的换行符）
+            body_start = current_section['body_start']
+            if header_start > body_start or current_section['title']:
+                body = content[body_start:header_start - 1]
+                doc = self._create_section_document(current_section, body, base_metadata, line_no)
+                if doc:
+                    documents.append(doc)
+            
+            # 开始新section
+            extra_hashes, title = header_match.groups()
+            current_section = {
+                'title': title.strip(),
+                'level': len(extra_hashes) + 1,
+                'body_start': header_match.end() + 1,
+                'line_start': line_no
+            }
         
         # 保存最后一个section
-        if current_section['content'] or current_section['title']:
-            doc = self._create_section_document(current_section, base_metadata, len(lines))
+        body_start = current_section['body_start']
+        if body_start <= len(content) or current_section['title']:
+            line_count = line_no + content.count('\n', pos) + 1
+            doc = self._create_section_document(current_section, content[body_start:], base_metadata, line_count)
             if doc:
                 documents.append(doc)
         
@@ -231,20 +222,22 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         
         return documents
     
-    def _create_section_document(self, section: Dict[str, Any], base_metadata: Dict[str, Any], line_end: int) -> Optional[InfraDocument]:
+    def _create_section_document(self, section: Dict[str, Any], body: str, base_metadata: Dict[str, Any], line_end: int) -> Optional[InfraDocument]:
         """创建章节文档
         
         Args:
             section: 章节信息
+            body: 章节正文（标题之后的原始文本）
             base_metadata: 基础元数据
             line_end: 结束行号
             
         Returns:
             文档对象（可能为空）
         """
-        content_lines = [line for line in section['content'] if line.strip()]
+        # 去掉全部空白行（补一个前导换行，使首行也能被匹配）
+        body = _BLANK_LINE_RE.sub('', '\n' + body)[1:]
         
-        if not content_lines and not section['title']:
+        if not body and not section['title']:
             return None
         
         # 构建内容
@@ -252,20 +245,20 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         if section['title']:
             content_parts.append(f"{'#' * section['level']} {section['title']}")
         
-        if content_lines:
-            content_parts.extend(content_lines)
+        if body:
+            content_parts.append(body)
         
         content = '\n'.join(content_parts)
         
         # 构建元数据
-        metadata = dict(base_metadata)
-        metadata.update({
+        metadata = {
+            **base_metadata,
             'section_title': section['title'],
             'section_level': section['level'],
             'line_start': section['line_start'],
             'line_end': line_end,
             'section_type': 'header_section'
-        })
+        }
         
         return self._create_document(content=content, metadata=metadata)
     
@@ -284,19 +277,23 @@ class MarkdownDocumentLoader(InfraDocumentLoader):
         
         chunks = []
         start = 0
+        # 块大小至少为 1，保证每轮都向前推进
+        chunk_size = max(1, chunk_size)
         
         while start < len(content):
             end = start + chunk_size
             
             # 如果不是最后一块，尝试在单词边界分割
             if end < len(content):
-                # 向后查找空白字符
-                while end > start and content[end] not in ' \n\t':
-                    end -= 1
-                
-                # 如果没找到合适的分割点，使用原始位置
-                if end == start:
-                    end = start + chunk_size
+                # 向后查找 (start, end] 内最后一个空白字符
+                cut = max(
+                    content.rfind(' ', start + 1, end + 1),
+                    content.rfind('\n', start + 1, end + 1),
+                    content.rfind('\t', start + 1, end + 1),
+                )
+                # 没找到合适的分割点时使用原始位置
+                if cut > start:
+                    end = cut
             
             chunk = content[start:end].strip()
             if chunk:
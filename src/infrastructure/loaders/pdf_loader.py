@@ -1,14 +1,8 @@
 from typing import List, Dict, Any, Optional
-from pathlib import Path
-
-try:
-    from langchain_community.document_loaders import PyPDFLoader
-except ImportError:
-    PyPDFLoader = None
 
 from ...infrastructure.log.logger_service import LoggerService
 from ..splitters.types import InfraDocument
-from .base import InfraDocumentLoader
+from .base import InfraDocumentLoader, _READ_BUFFER_SIZE, _get_langchain_loader, _normalize_text
 
 
 class PdfDocumentLoader(InfraDocumentLoader):
@@ -21,13 +15,13 @@ class PdfDocumentLoader(InfraDocumentLoader):
         self.logger = logger
 
     def supports_file_type(self, file_path: str) -> bool:
-        return Path(file_path).suffix.lower() == ".pdf"
+        return self.get_file_extension(file_path) == "pdf"
 
     def get_supported_extensions(self) -> List[str]:
         return ["pdf"]
 
     def load(self, file_path: str) -> List[InfraDocument]:
-        return self._load_documents(file_path)
+        return self._load_cached(file_path, self._load_documents)
 
     def _create_document(self, content: str, metadata: Dict[str, Any] = None) -> InfraDocument:
         if metadata is None:
@@ -37,28 +31,26 @@ class PdfDocumentLoader(InfraDocumentLoader):
     def _clean_content(self, content: str) -> str:
         if not content:
             return ""
-        content = content.strip()
-        content = content.replace("\r\n", "\n").replace("\r", "\n")
-        return content
+        return _normalize_text(content)
 
     def _load_documents(self, file_path: str) -> List[InfraDocument]:
-        if PyPDFLoader is not None:
+        if _get_langchain_loader("PyPDFLoader") is not None:
             return self._load_with_langchain(file_path)
         return self._load_with_builtin(file_path)
 
     def _load_with_langchain(self, file_path: str) -> List[InfraDocument]:
         try:
-            loader = PyPDFLoader(file_path)
+            loader = _get_langchain_loader("PyPDFLoader")(file_path)
             lc_docs = loader.load()
             documents: List[Document] = []
             for lc in lc_docs:
-                metadata = dict(lc.metadata) if lc.metadata else {}
+                metadata = lc.metadata or {}
                 doc = self._create_document(content=self._clean_content(lc.page_content), metadata=metadata)
                 documents.append(doc)
             return documents
         except Exception as e:
             if self.logger:
-                self.logger.warning(f"使用 PyPDFLoader 加载失败，回退到内置实现: {e}")
+                self.logger.warning("使用 PyPDFLoader 加载失败，回退到内置实现: %s", e)
             return self._load_with_builtin(file_path)
 
     def _load_with_builtin(self, file_path: str) -> List[InfraDocument]:
@@ -69,10 +61,15 @@ class PdfDocumentLoader(InfraDocumentLoader):
                 content = extract_text(str(file_path))
             except Exception:
                 import PyPDF2
-                with open(file_path, "rb") as f:
+                with open(file_path, "rb", buffering=_READ_BUFFER_SIZE) as f:
                     reader = PyPDF2.PdfReader(f)
+                    # 先收集各页文本再一次性拼接，避免逐页 += 反复复制累积字符串
+                    parts = []
                     for page in reader.pages:
-                        content += page.extract_text() or ""
+                        text = page.extract_text()
+                        if text:
+                            parts.append(text)
+                    content = "".join(parts)
 
             content = self._clean_content(content)
             if not content:
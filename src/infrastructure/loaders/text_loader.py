@@ -1,31 +1,39 @@
+import mmap
+import os
 from typing import List, Dict, Any, Optional
 
-try:
-    from langchain_community.document_loaders import TextLoader as LangchainTextLoader
-except ImportError:
-    LangchainTextLoader = None
-
 from ...infrastructure.log.logger_service import LoggerService
 from ..splitters.types import InfraDocument
-from .base import InfraDocumentLoader
+from .base import InfraDocumentLoader, _READ_BUFFER_SIZE, _get_langchain_loader, _normalize_text
+
+# 超过该大小的文件通过 mmap 读取，直接从页缓存解码，省去一份整文件的字节缓冲
+_MMAP_MIN_SIZE = 4 * 1024 * 1024
 
 
 class TextDocumentLoader(InfraDocumentLoader):
     """纯文本文件加载器，支持 `.txt` 和 `.text`。"""
 
-    def __init__(self, logger: Optional[LoggerService] = None, encoding: str = "utf-8"):
+    def __init__(
+        self,
+        logger: Optional[LoggerService] = None,
+        encoding: str = "utf-8",
+        read_buffer_bytes: int = _READ_BUFFER_SIZE,
+    ):
         self.logger = logger
         self.encoding = encoding
+        self.read_buffer_bytes = read_buffer_bytes
 
     def supports_file_type(self, file_path: str) -> bool:
-        ext = file_path.lower().split('.')[-1]
-        return ext in ["txt", "text"]
+        return self.get_file_extension(file_path) in ("txt", "text")
 
     def get_supported_extensions(self) -> List[str]:
         return ["txt", "text"]
 
     def load(self, file_path: str) -> List[InfraDocument]:
-        return self._load_documents(file_path)
+        return self._load_cached(file_path, self._load_documents)
+
+    def _cache_params(self) -> tuple:
+        return (self.encoding,)
 
     def _create_document(self, content: str, metadata: Dict[str, Any] = None) -> InfraDocument:
         if metadata is None:
@@ -35,34 +43,40 @@ class TextDocumentLoader(InfraDocumentLoader):
     def _clean_content(self, content: str) -> str:
         if not content:
             return ""
-        content = content.strip()
-        content = content.replace("\r\n", "\n").replace("\r", "\n")
-        return content
+        return _normalize_text(content)
 
     def _load_documents(self, file_path: str) -> List[InfraDocument]:
-        if LangchainTextLoader is not None:
+        if _get_langchain_loader("TextLoader") is not None:
             return self._load_with_langchain(file_path)
         return self._load_with_builtin(file_path)
 
     def _load_with_langchain(self, file_path: str) -> List[InfraDocument]:
         try:
-            loader = LangchainTextLoader(file_path, encoding=self.encoding)
+            loader = _get_langchain_loader("TextLoader")(file_path, encoding=self.encoding)
             lc_docs = loader.load()
             documents: List[Document] = []
             for lc in lc_docs:
-                metadata = dict(lc.metadata) if lc.metadata else {}
+                metadata = lc.metadata or {}
                 doc = self._create_document(content=self._clean_content(lc.page_content), metadata=metadata)
                 documents.append(doc)
             return documents
         except Exception as e:
             if self.logger:
-                self.logger.warning(f"使用 TextLoader 加载失败，回退到内置实现: {e}")
+                self.logger.warning("使用 TextLoader 加载失败，回退到内置实现: %s", e)
             return self._load_with_builtin(file_path)
 
+    def _read_text(self, file_path: str) -> str:
+        """读取整个文件；大文件使用 mmap，小文件直接读取以免映射开销"""
+        if os.path.getsize(file_path) > _MMAP_MIN_SIZE:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # 换行符由 _clean_content 统一处理
+                return str(mm, self.encoding)
+        with open(file_path, 'r', encoding=self.encoding, buffering=self.read_buffer_bytes) as f:
+            return f.read()
+
     def _load_with_builtin(self, file_path: str) -> List[InfraDocument]:
         try:
-            with open(file_path, 'r', encoding=self.encoding) as f:
-                content = f.read()
+            content = self._read_text(file_path)
             content = self._clean_content(content)
             if not content:
                 return []
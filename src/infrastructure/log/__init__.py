@@ -1,6 +1,6 @@
 """日志服务模块"""
 
 from .logger_service import LoggerService
-from .logger_service_impl import LoggerServiceImpl
+from .logger_service_impl import LoggerServiceImpl, get_logger
 
-__all__ = ['LoggerService', 'LoggerServiceImpl']
\ No newline at end of file
+__all__ = ['LoggerService', 'LoggerServiceImpl', 'get_logger']
\ No newline at end of file
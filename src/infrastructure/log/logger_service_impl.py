@@ -1,5 +1,6 @@
 import logging
 import os
+from functools import lru_cache
 from logging.handlers import RotatingFileHandler
 from typing import Any, Optional
 from .logger_service import LoggerService
@@ -111,4 +112,14 @@ class LoggerServiceImpl(LoggerService):
     
     def get_logger_name(self) -> str:
         """获取日志器名称"""
-        return self._name
\ No newline at end of file
+        return self._name
+
+
+@lru_cache(maxsize=128)
+def get_logger(name: str, level: str = "INFO") -> LoggerServiceImpl:
+    """获取指定名称的日志服务（进程内按名称复用）
+
+    底层 logging.Logger 本就按名称共享，复用实例可避免重复读取配置、
+    创建日志目录以及检查文件处理器。
+    """
+    return LoggerServiceImpl(name, level)
@@ -1,3 +1,4 @@
+import re
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 
@@ -9,6 +10,15 @@ from .types import (
 )
 from ...infrastructure.log.logger_service import LoggerService
 
+# 连续空白行：保留第一行（含其中的空白字符），其余删除
+_BLANK_RUN_RE = re.compile(r'(\n[^\S\n]*)(?:\n[^\S\n]*)+(?=\n|$)')
+# 同上，额外处理以空白行开头的文本
+_LEADING_BLANK_RUN_RE = re.compile(r'((?:^|\n)[^\S\n]*)(?:\n[^\S\n]*)+(?=\n|$)')
+
+
+def _first_group(match: "re.Match[str]") -> str:
+    return match[1]
+
 
 class InfraDocumentSplitter(ABC):
     """基础设施层的文档切分器抽象基类
@@ -19,6 +29,13 @@ class InfraDocumentSplitter(ABC):
     def __init__(self, config: Optional[InfraSplitterConfig] = None, logger: Optional[LoggerService] = None):
         self.config = config or InfraSplitterConfig()
         self.logger = logger
+        # 配置在构造后很少变化：构造时校验一次并缓存结果，无效配置直接失败
+        self._valid = self._check_config(self.config)
+        if not self._valid:
+            raise ValueError(
+                f"无效的切分器配置: chunk_size={self.config.chunk_size}, "
+                f"chunk_overlap={self.config.chunk_overlap}"
+            )
 
     @abstractmethod
     def split_document(self, document: InfraDocument) -> List[InfraDocumentChunk]:
@@ -39,14 +56,12 @@ class InfraDocumentSplitter(ABC):
             all_chunks.extend(chunks)
         return all_chunks
 
+    @staticmethod
+    def _check_config(config: InfraSplitterConfig) -> bool:
+        return 0 <= config.chunk_overlap < config.chunk_size
+
     def validate_config(self) -> bool:
-        if self.config.chunk_size <= 0:
-            return False
-        if self.config.chunk_overlap < 0:
-            return False
-        if self.config.chunk_overlap >= self.config.chunk_size:
-            return False
-        return True
+        return self._valid
 
     def get_config(self) -> InfraSplitterConfig:
         return self.config
@@ -55,6 +70,7 @@ class InfraDocumentSplitter(ABC):
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+        self._valid = self._check_config(self.config)
 
     def _create_chunk(
         self,
@@ -85,15 +101,9 @@ class InfraDocumentSplitter(ABC):
     def _clean_content(self, content: str) -> str:
         if self.config.strip_whitespace:
             content = content.strip()
-        lines = content.split('\n')
-        cleaned_lines = []
-        prev_empty = False
-        for line in lines:
-            is_empty = not line.strip()
-            if not (is_empty and prev_empty):
-                cleaned_lines.append(line)
-            prev_empty = is_empty
-        return '\n'.join(cleaned_lines)
+        if not content or content[0].isspace():
+            return _LEADING_BLANK_RUN_RE.sub(_first_group, content)
+        return _BLANK_RUN_RE.sub(_first_group, content)
 
     def get_chunk_count_estimate(self, text: str) -> int:
         if not text:
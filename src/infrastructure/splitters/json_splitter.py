@@ -28,8 +28,7 @@ class JsonSplitter(InfraDocumentSplitter):
             config: 切分器配置
             logger: 日志服务
         """
-        self.logger = logger
-        self.config = config
+        super().__init__(config, logger)
         # JSON切分特定配置
         self.max_chunk_size = getattr(config, 'max_chunk_size', 4000) if config else 4000
         self.convert_lists = getattr(config, 'convert_lists', False) if config else False
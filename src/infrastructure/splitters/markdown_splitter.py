@@ -13,6 +13,10 @@ from ...infrastructure.log.logger_service import LoggerService
 from .types import InfraDocument, InfraDocumentChunk, InfraSplitterType, InfraSplitterConfig
 from .base import InfraDocumentSplitter
 
+# Markdown 标题（在整段文本上查找，空白不跨行）。以字面量 # 开头便于正则引擎
+# 快速跳过正文；标题前只能有空白，由调用方检查。第 2 组为去除首尾空白的标题文本
+_HEADER_RE = re.compile(r'#(#{0,5})[^\S\n]+(\S(?:[^\n]*\S)?)[^\S\n]*$', re.MULTILINE)
+
 
 class MarkdownSplitter(InfraDocumentSplitter):
     """Markdown文件切分器
@@ -28,8 +32,7 @@ class MarkdownSplitter(InfraDocumentSplitter):
             config: 切分器配置
             logger: 日志服务
         """
-        self.logger = logger
-        self.config = config
+        super().__init__(config, logger)
         # Markdown切分特定配置
         self.headers_to_split_on = getattr(config, 'headers_to_split_on', None) if config else None
         if not self.headers_to_split_on:
@@ -261,39 +264,36 @@ class MarkdownSplitter(InfraDocumentSplitter):
         Returns:
             (标题信息, 内容) 的列表
         """
-        lines = text.split('\n')
         sections = []
-        current_content = []
         current_header = None
+        # 当前部分在原文中的起始位置（包含标题行与否取决于 strip_headers）
+        content_start = 0
         
-        for line in lines:
-            # 检查是否是标题
-            header_match = re.match(r'^(#{1,6})\s+(.+)$', line.strip())
+        for header_match in _HEADER_RE.finditer(text):
+            header_start = header_match.start()
+            line_start = text.rfind('\n', 0, header_start) + 1
+            # 标题前只允许有空白
+            if line_start < header_start and not text[line_start:header_start].isspace():
+                continue
             
-            if header_match:
-                # 保存之前的内容
-                if current_content:
-                    content = '\n'.join(current_content).strip()
-                    if content:
-                        sections.append((current_header, content))
-                
-                # 开始新的部分
-                level = len(header_match.group(1))
-                text_content = header_match.group(2)
-                current_header = {
-                    'level': level,
-                    'text': text_content,
-                    'raw': line.strip()
-                }
-                current_content = [line] if not self.strip_headers else []
-            else:
-                current_content.append(line)
-        
-        # 添加最后一个部分
-        if current_content:
-            content = '\n'.join(current_content).strip()
+            # 保存之前的内容
+            content = text[content_start:line_start].strip()
             if content:
                 sections.append((current_header, content))
+            
+            # 开始新的部分
+            extra_hashes, header_text = header_match.groups()
+            current_header = {
+                'level': len(extra_hashes) + 1,
+                'text': header_text,
+                'raw': text[header_start:header_match.end()].rstrip()
+            }
+            content_start = header_match.end() if self.strip_headers else line_start
+        
+        # 添加最后一个部分
+        content = text[content_start:].strip()
+        if content:
+            sections.append((current_header, content))
         
         return sections
     
@@ -18,8 +18,7 @@ class TextSplitter(InfraDocumentSplitter):
     """
 
     def __init__(self, config: Optional[InfraSplitterConfig] = None, logger: Optional[LoggerService] = None):
-        self.logger = logger
-        self.config = config or InfraSplitterConfig()
+        super().__init__(config, logger)
         self.text_splitter = None
         self._init_langchain_splitter()
 
@@ -129,7 +129,7 @@ class InfraDocumentChunk:
         self.metadata.update(metadata)
 
     def is_empty(self) -> bool:
-        return not self.content or not self.content.strip()
+        return not self.content or self.content.isspace()
 
     def get_text_length(self) -> int:
         return len(self.content) if self.content else 0
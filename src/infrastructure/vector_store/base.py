@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from ...domain.interfaces import VectorStoreService
+from ...domain.interfaces.vector_store_service import EmbeddingVector, EmbeddingMatrix
 from ...domain.entities.search_result import SearchResult as DomainSearchResult
 from ...domain.entities.document import Document as DomainDocument
 
@@ -11,7 +12,7 @@ class VectorDocument:
     id: str
     content: str
     metadata: Dict[str, Any] = None
-    embedding: Optional[List[float]] = None
+    embedding: Optional[EmbeddingVector] = None
 
 @dataclass
 class SearchResult:
@@ -33,7 +34,7 @@ class VectorStore(VectorStoreService):
         pass
     
     @abstractmethod
-    async def search(self, query_embedding: List[float], top_k: int = 5, **kwargs) -> List[SearchResult]:
+    async def search(self, query_embedding: EmbeddingVector, top_k: int = 5, **kwargs) -> List[SearchResult]:
         """向量相似度搜索
         
         Args:
@@ -105,7 +106,7 @@ class VectorStore(VectorStoreService):
             doc_id=vector_doc.id
         )
     
-    def _domain_to_vector_document(self, domain_doc: DomainDocument, embedding: List[float]) -> VectorDocument:
+    def _domain_to_vector_document(self, domain_doc: DomainDocument, embedding: EmbeddingVector) -> VectorDocument:
         """将Domain层Document转换为VectorDocument"""
         return VectorDocument(
             id=domain_doc.doc_id,
@@ -123,17 +124,18 @@ class VectorStore(VectorStoreService):
         )
     
     async def add_documents_with_vectors(self, documents: List[DomainDocument], 
-                                       vectors: List[List[float]]) -> None:
+                                       vectors: EmbeddingMatrix) -> None:
         """添加文档和向量 - Domain层接口"""
+        matrix = self._as_f32_matrix(vectors, self.get_dimension())
         vector_docs = []
-        for doc, vector in zip(documents, vectors):
+        for doc, vector in zip(documents, matrix):
             vector_docs.append(self._domain_to_vector_document(doc, vector))
         await self.add_documents(vector_docs)
     
-    async def search_similar(self, query_embedding: List[float], top_k: int = 5, 
+    async def search_similar(self, query_embedding: EmbeddingVector, top_k: int = 5, 
                            filters: Optional[Dict[str, Any]] = None) -> List[DomainSearchResult]:
         """相似度搜索 - Domain层接口"""
-        results = await self.search(query_embedding, top_k, **(filters or {}))
+        results = await self.search(self._as_f32_vector(query_embedding), top_k, **(filters or {}))
         return [self._search_result_to_domain(result) for result in results]
     
     async def delete_documents(self, document_ids: List[str]) -> int:
@@ -145,9 +147,9 @@ class VectorStore(VectorStoreService):
         return deleted_count
     
     async def update_document_with_vector(self, document: DomainDocument, 
-                                        vector: List[float]) -> bool:
+                                        vector: EmbeddingVector) -> bool:
         """更新文档和向量 - Domain层接口"""
-        vector_doc = self._domain_to_vector_document(document, vector)
+        vector_doc = self._domain_to_vector_document(document, self._as_f32_vector(vector))
         return await self.update_document(vector_doc)
     
     async def get_document_by_id(self, document_id: str) -> Optional[DomainDocument]:
@@ -1,21 +1,45 @@
+import asyncio
+import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
+
+import numpy as np
 from langchain_community.vectorstores import FAISS as LangChainFAISS
 from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_core.documents import Document as LangChainDocument
 
 from .base import VectorStore, VectorDocument, SearchResult
+from ...domain.interfaces.vector_store_service import (
+    EmbeddingVector,
+    EmbeddingMatrix,
+    EmbeddingDType,
+    SEARCH_BATCH_CHUNK_SIZE,
+)
 from ...infrastructure.config.config_manager import get_config
 
+logger = logging.getLogger(__name__)
+
 
 class FAISSVectorStore(VectorStore):
     """基于LangChain的FAISS向量数据库实现"""
 
-    def __init__(self, dimension: int = None, index_path: str = None, embedding_service=None):
+    def __init__(
+        self,
+        dimension: int = None,
+        index_path: str = None,
+        embedding_service=None,
+        dtype: Optional[EmbeddingDType] = None,
+        quantization: Optional[str] = None,
+    ):
         # 使用配置中的缺省值，确保在未传参时也可正常工作
         cfg = get_config()
         self.dimension = int(dimension) if dimension is not None else int(cfg.storage.vector_store.dimension)
         self.index_path = os.path.normpath(index_path) if index_path is not None else os.path.normpath(cfg.storage.vector_store.index_path)
+        self.dtype = dtype or cfg.storage.vector_store.dtype
+        self.quantization = quantization if quantization is not None else cfg.storage.vector_store.quantization
+        self._check_dtype(self.dtype)
+        if self.quantization not in (None, "sq", "pq4", "pq8"):
+            raise ValueError(f"不支持的向量量化方式: {self.quantization}")
         self.embedding_service = embedding_service
         # 延后到 _initialize_langchain_faiss 中按需构造
         self.langchain_faiss = None
@@ -33,10 +57,9 @@ class FAISSVectorStore(VectorStore):
 
     def _initialize_langchain_faiss(self):
         """初始化LangChain FAISS向量存储"""
-        import faiss
         if not self.embedding_service:
             # 如果没有提供嵌入提供者，创建一个空的FAISS索引
-            index = faiss.IndexFlatL2(self.dimension)
+            index = self._create_index(self.dimension)
             self.langchain_faiss = LangChainFAISS(
                 embedding_function=None,
                 index=index,
@@ -45,7 +68,7 @@ class FAISSVectorStore(VectorStore):
             )
         else:
             # 使用提供的嵌入提供者创建FAISS索引
-            index = faiss.IndexFlatL2(self.dimension)
+            index = self._create_index(self.dimension)
             self.langchain_faiss = LangChainFAISS(
                 embedding_function=self.embedding_service,
                 index=index,
@@ -53,6 +76,68 @@ class FAISSVectorStore(VectorStore):
                 index_to_docstore_id={}
             )
 
+    def _is_quantized(self) -> bool:
+        """是否使用低精度/量化索引"""
+        return self.dtype != "float32" or self.quantization is not None
+
+    def _create_index(self, dimension: int):
+        """按存储精度与量化方式创建FAISS索引
+        
+        float16 / int8 映射为标量量化（SQ fp16 / SQ 8bit），pq4 / pq8 映射为
+        PQFastScan / PQ；需要训练的索引在首批向量写入时训练。
+        """
+        import faiss
+        if not self._is_quantized():
+            return faiss.IndexFlatL2(dimension)
+        if self.quantization in ("pq4", "pq8"):
+            # 每个子空间 8 维，维度无法整除时退化为每维一个子空间
+            m = dimension // 8 if dimension % 8 == 0 else dimension
+            if self.quantization == "pq4":
+                return faiss.IndexPQFastScan(dimension, m, 4)
+            return faiss.IndexPQ(dimension, m, 8)
+        qtype = faiss.ScalarQuantizer.QT_fp16 if self.dtype == "float16" else faiss.ScalarQuantizer.QT_8bit
+        return faiss.IndexScalarQuantizer(dimension, qtype, faiss.METRIC_L2)
+
+    def _min_training_points(self) -> int:
+        """量化索引训练所需的最少样本数（乘积量化每个子空间需要至少 2^nbits 个样本）"""
+        return 256 if self.quantization == "pq8" else 16 if self.quantization == "pq4" else 1
+
+    def _prepare_quantized_index(self, matrix: np.ndarray) -> None:
+        """写入前确保量化索引已训练
+
+        空索引按实际维度重建并用首批向量训练。训练样本不足时暂用 IndexFlatL2 保存向量，
+        之后累计向量数（已有 + 本批）达到训练下限时，用全部向量训练配置的量化索引，
+        并按原顺序转存已有向量，位置与 index_to_docstore_id 保持一致。
+        """
+        import faiss
+        index = self.langchain_faiss.index
+        min_points = self._min_training_points()
+        if index.ntotal == 0:
+            index = self._create_index(matrix.shape[1])
+            self.dimension = matrix.shape[1]
+        elif isinstance(index, faiss.IndexFlat):
+            # 此前因样本不足退化的平坦索引（含从磁盘加载的）：样本足够后转换为配置的量化索引
+            if index.ntotal + matrix.shape[0] < min_points:
+                return
+            existing = index.reconstruct_n(0, index.ntotal)
+            quantized = self._create_index(index.d)
+            if not quantized.is_trained:
+                quantized.train(np.vstack([existing, matrix]))
+            quantized.add(existing)
+            logger.info("累计向量数达到 %d，IndexFlatL2 已转换为 %s", min_points, type(quantized).__name__)
+            self.langchain_faiss.index = quantized
+            return
+        if not index.is_trained:
+            if matrix.shape[0] < min_points:
+                logger.warning(
+                    "训练样本不足 %d 条（本批 %d 条），暂用 IndexFlatL2 存储，累计达到后转换为量化索引",
+                    min_points, matrix.shape[0],
+                )
+                index = faiss.IndexFlatL2(matrix.shape[1])
+            else:
+                index.train(matrix)
+        self.langchain_faiss.index = index
+
     def _get_expected_index_files(self) -> List[str]:
         """返回期望存在的索引文件列表（由 LangChain 保存）"""
         return [
@@ -169,7 +254,11 @@ class FAISSVectorStore(VectorStore):
                 text_embedding_pairs = list(zip([doc.content for doc in documents], embeddings))
                 
                 # 使用from_embeddings创建或合并到现有索引
-                if hasattr(self.langchain_faiss, 'index') and self.langchain_faiss.index.ntotal == 0:
+                if self._is_quantized():
+                    # 低精度索引：训练（如需）后直接写入，向量在FAISS内部一次性编码
+                    self._prepare_quantized_index(self._as_f32_matrix(embeddings))
+                    self.langchain_faiss.add_embeddings(text_embedding_pairs, ids=doc_ids)
+                elif hasattr(self.langchain_faiss, 'index') and self.langchain_faiss.index.ntotal == 0:
                     # 如果是空索引，重新创建
                     self.langchain_faiss = LangChainFAISS.from_embeddings(
                         text_embedding_pairs,
@@ -206,7 +295,7 @@ class FAISSVectorStore(VectorStore):
         return DummyEmbeddings()
 
     async def search(
-        self, query_embedding: List[float], top_k: int = 5, **kwargs
+        self, query_embedding: EmbeddingVector, top_k: int = 5, **kwargs
     ) -> List[SearchResult]:
         """向量相似度搜索"""
         try:
@@ -220,41 +309,79 @@ class FAISSVectorStore(VectorStore):
             
             # 使用LangChain FAISS的similarity_search_by_vector功能
             langchain_docs_with_scores = self.langchain_faiss.similarity_search_with_score_by_vector(
-                query_embedding, k=top_k
+                self._as_f32_vector(query_embedding), k=top_k
             )
             
             results = []
             for langchain_doc, score in langchain_docs_with_scores:
-                # 从metadata中获取文档ID
-                doc_id = langchain_doc.metadata.get('id')
-                if doc_id and doc_id in self.documents:
-                    document = self.documents[doc_id]
-                    results.append(
-                        SearchResult(
-                            document=document,
-                            score=float(score),
-                            distance=1.0 - float(score),  # 相似度转距离
-                        )
-                    )
-                else:
-                    # 如果本地映射中没有，从LangChain文档创建
-                    vector_doc = self._langchain_document_to_vector_document(
-                        langchain_doc, 
-                        doc_id or f"doc_{len(results)}"
-                    )
-                    results.append(
-                        SearchResult(
-                            document=vector_doc,
-                            score=float(score),
-                            distance=1.0 - float(score),
-                        )
-                    )
+                results.append(self._to_search_result(langchain_doc, float(score), len(results)))
             
             return results
             
         except Exception as e:
             raise Exception(f"搜索失败: {str(e)}")
 
+    def _to_search_result(self, langchain_doc: LangChainDocument, score: float, position: int) -> SearchResult:
+        """将检索命中的LangChain文档转换为SearchResult（优先使用本地映射中的文档）"""
+        # 从metadata中获取文档ID
+        doc_id = langchain_doc.metadata.get('id')
+        if doc_id and doc_id in self.documents:
+            document = self.documents[doc_id]
+        else:
+            # 如果本地映射中没有，从LangChain文档创建
+            document = self._langchain_document_to_vector_document(
+                langchain_doc,
+                doc_id or f"doc_{position}"
+            )
+        return SearchResult(
+            document=document,
+            score=score,
+            distance=1.0 - score,  # 相似度转距离
+        )
+
+    async def search_batch(
+        self,
+        query_embeddings: EmbeddingMatrix,
+        top_k: int = 5,
+        filter_criteria: Optional[Dict[str, Any]] = None,
+    ):
+        """批量相似度搜索：每个分片只调用一次 index.search，分片在线程池中并行执行"""
+        try:
+            queries = self._as_f32_matrix(query_embeddings, self.dimension)
+            index = getattr(self.langchain_faiss, 'index', None) if self.langchain_faiss else None
+            if index is None or index.ntotal == 0:
+                return [[] for _ in range(len(queries))]
+            k = min(int(top_k), index.ntotal)
+            if k <= 0 or len(queries) == 0:
+                return [[] for _ in range(len(queries))]
+
+            # FAISS 检索时释放 GIL，分片可在线程池中真正并行
+            parts = await asyncio.gather(*(
+                asyncio.to_thread(index.search, queries[start:start + SEARCH_BATCH_CHUNK_SIZE], k)
+                for start in range(0, len(queries), SEARCH_BATCH_CHUNK_SIZE)
+            ))
+
+            index_to_docstore_id = self.langchain_faiss.index_to_docstore_id
+            docstore = self.langchain_faiss.docstore
+            batch_results = []
+            for distances, indices in parts:
+                for row_distances, row_indices in zip(distances, indices):
+                    row = []
+                    for distance, idx in zip(row_distances, row_indices):
+                        if idx == -1:
+                            continue
+                        langchain_doc = docstore.search(index_to_docstore_id[int(idx)])
+                        if not isinstance(langchain_doc, LangChainDocument):
+                            continue
+                        row.append(self._search_result_to_domain(
+                            self._to_search_result(langchain_doc, float(distance), len(row))
+                        ))
+                    batch_results.append(row)
+            return batch_results
+
+        except Exception as e:
+            raise Exception(f"批量搜索失败: {str(e)}")
+
     async def delete_document(self, document_id: str) -> bool:
         """删除文档"""
         try:
@@ -355,7 +482,7 @@ class FAISSVectorStore(VectorStore):
             source_path=vector_doc.metadata.get("source_path", ""),
         )
 
-    def _domain_document_to_vector_document(self, domain_doc, embedding: List[float]):
+    def _domain_document_to_vector_document(self, domain_doc, embedding: EmbeddingVector):
         """将Domain层Document实体转换为VectorDocument"""
         return VectorDocument(
             id=domain_doc.doc_id,
@@ -373,13 +500,13 @@ class FAISSVectorStore(VectorStore):
         return deleted_count
 
     async def update_document_with_vector(
-        self, document, embedding: List[float]
+        self, document, embedding: EmbeddingVector
     ) -> bool:
         """更新带向量的文档"""
         from ...domain.entities.document import Document
 
         if isinstance(document, Document):
-            vector_doc = self._domain_document_to_vector_document(document, embedding)
+            vector_doc = self._domain_document_to_vector_document(document, self._as_f32_vector(embedding))
             return await self.update_document(vector_doc)
         return await self.update_document(document)
 
@@ -425,42 +552,80 @@ class FAISSVectorStore(VectorStore):
         }
 
     # Domain层接口实现
-    async def add_document(self, document, embedding: List[float]) -> bool:
+    async def add_document(self, document, embedding: EmbeddingVector) -> bool:
         """添加单个文档和向量 - Domain层接口"""
         try:
-            vector_doc = self._domain_document_to_vector_document(document, embedding)
+            vector_doc = self._domain_document_to_vector_document(document, self._as_f32_vector(embedding))
             await self.add_documents([vector_doc])
             return True
         except Exception:
             return False
 
-    async def add_documents_with_vectors(
-        self, documents: List, embeddings: List[List[float]]
+    async def add_matrix(
+        self,
+        documents: Sequence,
+        embeddings: EmbeddingMatrix,
+        dtype: Optional[EmbeddingDType] = None,
     ) -> bool:
-        """添加文档和向量 - Domain层接口"""
+        """以 (n, d) 向量矩阵添加文档 - Domain层接口"""
         try:
-            vector_docs = []
-            for doc, embedding in zip(documents, embeddings):
-                vector_doc = self._domain_document_to_vector_document(doc, embedding)
-                vector_docs.append(vector_doc)
+            self._check_dtype(dtype)
+            if dtype is not None and dtype != self.dtype:
+                # 存储精度只能在索引为空时切换
+                if self.langchain_faiss.index.ntotal > 0:
+                    raise ValueError(f"索引已按 {self.dtype} 存储，无法写入 {dtype} 向量")
+                self.dtype = dtype
+            # 一次性转换为连续 float32 矩阵，逐行视图不再复制
+            matrix = self._as_f32_matrix(embeddings, self.dimension)
+            if matrix.shape[0] != len(documents):
+                raise ValueError(f"向量矩阵行数 {matrix.shape[0]} 与文档数量 {len(documents)} 不一致")
+            vector_docs = [
+                self._domain_document_to_vector_document(doc, embedding)
+                for doc, embedding in zip(documents, matrix)
+            ]
             await self.add_documents(vector_docs)
             return True
         except Exception as e:
             print(f"存储向量失败: {str(e)}")
             return False
 
+    async def add_documents_with_vectors(
+        self, documents: List, embeddings: EmbeddingMatrix
+    ) -> bool:
+        """添加文档和向量 - Domain层接口"""
+        return await self.add_matrix(documents, embeddings)
+
+    def get_vectors_view(self) -> Optional[np.ndarray]:
+        """返回索引内全部向量的只读 (n, d) 矩阵
+        
+        行顺序与 langchain_faiss.index_to_docstore_id 的位置一致。IndexFlat 直接映射
+        底层存储（零拷贝，索引再次写入后视图失效，需重新获取）；其他索引类型回退为重建副本。
+        """
+        index = getattr(self.langchain_faiss, 'index', None) if self.langchain_faiss else None
+        if index is None:
+            return None
+        import faiss
+        if index.ntotal == 0:
+            view = np.empty((0, index.d), dtype=np.float32)
+        elif isinstance(index, faiss.IndexFlat):
+            view = faiss.rev_swig_ptr(index.get_xb(), index.ntotal * index.d).reshape(index.ntotal, index.d)
+        else:
+            view = index.reconstruct_n(0, index.ntotal)
+        view.flags.writeable = False
+        return view
+
     async def search_similar(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingVector,
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
     ):
         """相似度搜索（委托基类进行领域类型转换）"""
         return await super().search_similar(query_embedding, top_k, filters)
 
-    async def update_document_with_vector(self, document, vector: List[float]) -> bool:
+    async def update_document_with_vector(self, document, vector: EmbeddingVector) -> bool:
         """更新文档和向量 - Domain层接口"""
-        vector_doc = self._domain_document_to_vector_document(document, vector)
+        vector_doc = self._domain_document_to_vector_document(document, self._as_f32_vector(vector))
         return await self.update_document(vector_doc)
 
     async def get_document_by_id(self, document_id: str):
@@ -472,7 +637,7 @@ class FAISSVectorStore(VectorStore):
 
     async def similarity_search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingVector,
         threshold: float = 0.7,
         filter_criteria: Optional[Dict[str, Any]] = None,
     ) -> List:
@@ -0,0 +1,74 @@
+import logging
+import tempfile
+
+import numpy as np
+import pytest
+
+from .base import VectorDocument
+from .faiss_store import FAISSVectorStore
+
+DIM = 16
+
+
+def _make_documents(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+    docs = [
+        VectorDocument(id=f"doc_{i}", content=f"content {i}", metadata={"n": i}, embedding=vectors[i].tolist())
+        for i in range(count)
+    ]
+    return docs, vectors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("dtype, quantization", [
+    ("float16", None),
+    ("int8", None),
+    ("float32", "pq4"),
+])
+async def test_quantized_index_add_and_search_round_trip(dtype, quantization):
+    """低精度/量化索引写入后按自身向量检索，最近邻应为该文档本身"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = FAISSVectorStore(dimension=DIM, index_path=tmpdir, dtype=dtype, quantization=quantization)
+        docs, vectors = _make_documents(64)
+        await store.add_documents(docs)
+        index = store.langchain_faiss.index
+        print(f"[debug] {dtype}/{quantization} index={type(index).__name__} ntotal={index.ntotal}")
+        assert index.ntotal == 64
+        assert type(index).__name__ != "IndexFlatL2", '训练样本充足时应使用量化索引'
+
+        for i in (0, 17, 63):
+            results = await store.search(vectors[i].tolist(), top_k=3)
+            assert results, '检索结果为空'
+            assert results[0].document.content == f"content {i}", f"{dtype}/{quantization} 最近邻不是文档本身"
+
+        # 重新打开后从磁盘加载的索引同样可检索
+        reopened = FAISSVectorStore(dimension=DIM, index_path=tmpdir, dtype=dtype, quantization=quantization)
+        results = await reopened.search(vectors[5].tolist(), top_k=1)
+        assert results and results[0].document.content == "content 5", '重新加载后检索结果不一致'
+
+
+@pytest.mark.asyncio
+async def test_pq_index_falls_back_to_flat_then_converts(caplog):
+    """乘积量化训练样本不足时暂用 IndexFlatL2 并记录警告，累计足够后转换为量化索引"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = FAISSVectorStore(dimension=DIM, index_path=tmpdir, quantization="pq4")
+        docs, vectors = _make_documents(64)
+        with caplog.at_level(logging.WARNING):
+            await store.add_documents(docs[:8])
+        assert type(store.langchain_faiss.index).__name__ == "IndexFlatL2"
+        assert any("IndexFlatL2" in r.getMessage() for r in caplog.records if r.levelno == logging.WARNING), \
+            '退化为平坦索引时应记录警告'
+        results = await store.search(vectors[3].tolist(), top_k=1)
+        assert results and results[0].document.content == "content 3"
+
+        # 重新加载后继续写入，累计达到训练下限时转换为配置的量化索引
+        reopened = FAISSVectorStore(dimension=DIM, index_path=tmpdir, quantization="pq4")
+        await reopened.add_documents(docs[8:])
+        index = reopened.langchain_faiss.index
+        print(f"[debug] converted index={type(index).__name__} ntotal={index.ntotal}")
+        assert type(index).__name__ == "IndexPQFastScan", '样本足够后应转换为量化索引'
+        assert index.ntotal == 64
+        for i in (3, 40):
+            results = await reopened.search(vectors[i].tolist(), top_k=1)
+            assert results and results[0].document.content == f"content {i}", '转换后向量位置应保持不变'
@@ -18,6 +18,7 @@ class ApplicationContainer:
     _rag_pipeline_service: Optional[RAGPipelineService] = None
     _document_storage_management_service: Optional[DocumentStorageManagementService] = None
     _indexing_service: Optional[IndexingService] = None
+    _service_factory: Optional[DDDServiceFactory] = None
 
     def __init__(self, config: Optional[Config] = None, logger: Optional[LoggerService] = None):
         # 迁移自 run.py 的配置加载与日志初始化
@@ -36,6 +37,7 @@ class ApplicationContainer:
         self.logger = logger
         try:
             service_factory = DDDServiceFactory(config)
+            self._service_factory = service_factory
             self._rag_pipeline_service  = service_factory.create_application_rag_pipeline_service()
             self._indexing_service = service_factory.create_application_indexing_service()
             self._document_storage_management_service = service_factory.create_application_document_storage_management_service()
@@ -160,6 +162,10 @@ class ApplicationContainer:
             if self.logger:
                 self.logger.info("开始清理应用容器资源...")
             
+            # 释放服务持有的连接池等资源
+            if self._service_factory:
+                await self._service_factory.aclose()
+            
             # 保存向量存储索引
             if self._vector_store_service:
                 await self._vector_store_service.save_index()
@@ -9,10 +9,10 @@ from fastapi.responses import JSONResponse
 from .container import ApplicationContainer,init_container
 from .api import routes
 from ..infrastructure.config.config_manager import get_config
-from ..infrastructure.log.logger_service_impl import LoggerServiceImpl
+from ..infrastructure.log.logger_service_impl import get_logger
 
 # 创建日志服务
-logger = LoggerServiceImpl("MainApplication")
+logger = get_logger("MainApplication")
 
 # 全局容器
 container: ApplicationContainer | None = None
@@ -34,13 +34,16 @@ from ..infrastructure.embedding.openai_provider import OpenAIEmbeddingProvider
 from ..infrastructure.embedding.aliyun_provider import AliyunEmbeddingProvider
 from ..infrastructure.llm.openai_provider import OpenAIChatGPTProvider
 from ..infrastructure.llm.aliyun_provider import AliyunQwenProvider
+from ..infrastructure.llm.base import LLMProvider
+from ..infrastructure.llm.semantic_cache import SemanticLLMCache
+from ..infrastructure.llm.prompt_cache import ExactPromptCache
 from ..infrastructure.vector_store.faiss_store import FAISSVectorStore
 from ..domain.services.prompt_service_impl import PromptServiceImpl as DomainPromptServiceImpl
 from ..infrastructure.document_storage.local_provider import LocalDocumentStorageProvider
 from ..infrastructure.splitters.document_splitter_service_impl import DocumentSplitterServiceImpl
 from ..infrastructure.loaders.document_loader_service_impl import DocumentLoaderServiceImpl
 from ..infrastructure.log.logger_service import LoggerService
-from ..infrastructure.log.logger_service_impl import LoggerServiceImpl
+from ..infrastructure.log.logger_service_impl import get_logger
 from ..infrastructure.document_storage.s3_provider import S3DocumentStorageProvider
 
 
@@ -67,7 +70,7 @@ class DDDServiceFactory:
         self._document_storage_providers: Dict[str, type] = {}
         
         # 创建日志服务实例
-        self._logger_service = LoggerServiceImpl("DDDServiceFactory")
+        self._logger_service = get_logger("DDDServiceFactory")
         
         # 注册Infrastructure层默认提供器
         self._register_infrastructure_providers()
@@ -81,6 +84,7 @@ class DDDServiceFactory:
         # 通过缓存避免重复创建，供应用层直接引用
         self._GLOBAL_EMBEDDING_SERVICE = self.create_domain_embedding_service()
         self._GLOBAL_LLM_SERVICE = self.create_domain_llm_service()
+        self._attach_llm_cache(self._GLOBAL_LLM_SERVICE, self._GLOBAL_EMBEDDING_SERVICE)
         # 先保证嵌入服务已就绪，再创建向量存储
         self._GLOBAL_VECTOR_STORE_SERVICE = self.create_domain_vector_store_service(self._GLOBAL_EMBEDDING_SERVICE)
         self._GLOBAL_DOCUMENT_SPLITTER_SERVICE = self.create_domain_document_splitter_service()
@@ -88,6 +92,16 @@ class DDDServiceFactory:
         self._GLOBAL_DOCUMENT_STORAGE_SERVICE = self.create_domain_document_storage_service()
         self._GLOBAL_PROMPT_SERVICE = self.create_domain_prompt_service()
    
+    async def aclose(self) -> None:
+        """释放工厂创建的服务持有的资源（如 LLM 提供者的 HTTP 连接池），应用关闭时调用"""
+        llm_service = getattr(self, '_GLOBAL_LLM_SERVICE', None)
+        aclose = getattr(llm_service, 'aclose', None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                self._logger_service.warning(f"关闭LLM服务失败: {str(e)}")
+   
     def _register_infrastructure_providers(self):
         """注册Infrastructure层服务提供器"""
         # 注册嵌入服务提供器
@@ -141,17 +155,37 @@ class DDDServiceFactory:
         
         # 根据提供器类型传递不同的配置参数
         if provider_name == 'openai':
-            return provider_class(
+            instance = provider_class(
                 api_key=self.config.ai_providers.llm.openai.api_key,
                 model=self.config.ai_providers.llm.openai.model
             )
         elif provider_name == 'aliyun':
-            return provider_class(
+            instance = provider_class(
                 api_key=self.config.ai_providers.llm.aliyun.api_key,
                 model=self.config.ai_providers.llm.aliyun.model
             )
         else:
-            return provider_class()
+            instance = provider_class()
+        if isinstance(instance, LLMProvider):
+            instance.batch_size = self.config.ai_providers.llm.batch_size
+        return instance
+    
+    def _attach_llm_cache(self, llm_service: LLMService, embedding_service: Optional[EmbeddingService]) -> None:
+        """按配置为LLM服务挂载响应缓存"""
+        cache_config = self.config.ai_providers.llm.cache
+        if not cache_config.enabled or not isinstance(llm_service, LLMProvider):
+            return
+        if cache_config.memory_max_entries > 0:
+            llm_service.set_prompt_cache(ExactPromptCache(
+                max_entries=cache_config.memory_max_entries,
+                ttl_seconds=cache_config.ttl_seconds,
+            ))
+        llm_service.set_cache(SemanticLLMCache(
+            db_path=cache_config.path,
+            embedding_service=embedding_service,
+            similarity_threshold=cache_config.similarity_threshold,
+            ttl_seconds=cache_config.ttl_seconds,
+        ))
     
     def create_infrastructure_vector_store_service(self, embedding_service: Optional[EmbeddingService] = None) -> VectorStoreService:
         """创建Infrastructure层向量存储服务"""
@@ -167,7 +201,9 @@ class DDDServiceFactory:
             return provider_class(
                 dimension=self.config.storage.vector_store.dimension,
                 index_path=self.config.storage.vector_store.index_path,
-                embedding_service=embedding_service
+                embedding_service=embedding_service,
+                dtype=self.config.storage.vector_store.dtype,
+                quantization=self.config.storage.vector_store.quantization,
             )
         else:
             return provider_class()
@@ -215,7 +251,7 @@ class DDDServiceFactory:
     
     def create_logger_service(self, name: str) -> LoggerService:
         """创建日志服务"""
-        return LoggerServiceImpl(name)
+        return get_logger(name)
 
     def create_infrastructure_prompt_service(self) -> PromptService:
         """创建Infrastructure层提示词服务（保留占位，当前不直接使用）"""